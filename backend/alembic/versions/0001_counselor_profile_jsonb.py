@@ -0,0 +1,37 @@
+"""store counselor profile json columns as jsonb
+
+First revision: upgrades a database created from the models as they were
+before the migration history started.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-15 23:27:53.729305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSON_COLUMNS = ("specialties", "working_hours", "languages", "session_types")
+
+
+def upgrade() -> None:
+    for column in JSON_COLUMNS:
+        op.execute(
+            f"ALTER TABLE counselor_profiles ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb"
+        )
+
+
+def downgrade() -> None:
+    for column in JSON_COLUMNS:
+        op.execute(
+            f"ALTER TABLE counselor_profiles ALTER COLUMN {column} TYPE json USING {column}::json"
+        )
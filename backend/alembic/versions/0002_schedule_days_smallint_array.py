@@ -0,0 +1,37 @@
+"""store counselor_schedules.days_of_week as smallint[]
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 23:31:04.118220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # "0,1,2,3,4" -> {0,1,2,3,4}
+    op.execute(
+        "ALTER TABLE counselor_schedules ALTER COLUMN days_of_week TYPE smallint[] "
+        "USING string_to_array(days_of_week, ',')::smallint[]"
+    )
+    op.create_index(
+        'ix_schedules_days_gin', 'counselor_schedules', ['days_of_week'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_schedules_days_gin', table_name='counselor_schedules')
+    op.execute(
+        "ALTER TABLE counselor_schedules ALTER COLUMN days_of_week TYPE varchar(20) "
+        "USING array_to_string(days_of_week, ',')"
+    )
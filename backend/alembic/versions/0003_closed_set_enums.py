@@ -0,0 +1,44 @@
+"""store closed-set string columns as native enums
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 23:33:47.502913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, enum type, values, column type before this revision)
+ENUM_COLUMNS = (
+    ('messages', 'sender_type', 'sender_type_enum', ('user', 'counselor'), 'varchar'),
+    ('staff', 'role', 'staff_role_enum', ('counselor', 'admin', 'moderator', 'support'), 'varchar'),
+    ('reports', 'status', 'report_status_enum', ('pending', 'resolved', 'dismissed'), 'varchar(20)'),
+    ('users', 'gender', 'gender_enum', ('male', 'female', 'other'), 'varchar'),
+)
+
+
+def upgrade() -> None:
+    for table, column, type_name, values, _ in ENUM_COLUMNS:
+        labels = ", ".join(f"'{value}'" for value in values)
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({labels})")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} "
+            f"USING {column}::{type_name}"
+        )
+
+
+def downgrade() -> None:
+    for table, column, type_name, _, old_type in ENUM_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {old_type} "
+            f"USING {column}::text"
+        )
+        op.execute(f"DROP TYPE {type_name}")
@@ -0,0 +1,113 @@
+"""range-partition messages and notifications by month
+
+Rebuilds each table as a partitioned table: the old table is renamed aside,
+the partitioned one is created LIKE it with a (id, created_at) primary key,
+monthly partitions are created from the oldest row's month through next
+month (plus a DEFAULT partition), and the rows are copied over.
+SchedulerService.ensure_monthly_partitions keeps creating partitions after this.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 23:38:12.640071
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (foreign keys as (column, referenced table), index DDL)
+PARTITIONED_TABLES = {
+    'messages': (
+        (('session_id', 'chat_sessions'),),
+        ("CREATE INDEX ix_messages_session_created ON messages (session_id, created_at)",),
+    ),
+    'notifications': (
+        (('user_id', 'users'),),
+        ("CREATE INDEX ix_notifications_user_unread ON notifications (user_id, created_at) "
+         "WHERE is_read = false",),
+    ),
+}
+
+
+def _index_names(index_ddl):
+    return [ddl.split()[2] for ddl in index_ddl]
+
+
+def upgrade() -> None:
+    for table, (foreign_keys, index_ddl) in PARTITIONED_TABLES.items():
+        old = f"{table}_unpartitioned"
+
+        op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+        for index in _index_names(index_ddl):
+            op.execute(f"DROP INDEX IF EXISTS {index}")
+
+        # created_at joins the primary key, so it can no longer be NULL
+        op.execute(f"UPDATE {old} SET created_at = now() WHERE created_at IS NULL")
+
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)")
+        for column, referenced in foreign_keys:
+            op.execute(
+                f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) REFERENCES {referenced} (id)"
+            )
+        for ddl in index_ddl:
+            op.execute(ddl)
+
+        # One partition per month that has rows, through next month
+        op.execute(f"""
+            DO $$
+            DECLARE
+                month_start date;
+                last_month date := (date_trunc('month', now()) + interval '1 month')::date;
+            BEGIN
+                SELECT date_trunc('month', coalesce(min(created_at), now()))::date
+                  INTO month_start FROM {old};
+                WHILE month_start <= last_month LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+                        month_start,
+                        (month_start + interval '1 month')::date
+                    );
+                    month_start := (month_start + interval '1 month')::date;
+                END LOOP;
+            END $$
+        """)
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+        op.execute(f"DROP TABLE {old}")
+
+
+def downgrade() -> None:
+    for table, (foreign_keys, index_ddl) in PARTITIONED_TABLES.items():
+        old = f"{table}_partitioned"
+
+        op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+        for index in _index_names(index_ddl):
+            op.execute(f"DROP INDEX IF EXISTS {index}")
+
+        op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+        for column, referenced in foreign_keys:
+            op.execute(
+                f"ALTER TABLE {table} ADD FOREIGN KEY ({column}) REFERENCES {referenced} (id)"
+            )
+        for ddl in index_ddl:
+            op.execute(ddl)
+
+        op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+        # Drops the monthly and default partitions with it
+        op.execute(f"DROP TABLE {old}")
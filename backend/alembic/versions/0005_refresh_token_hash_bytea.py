@@ -0,0 +1,41 @@
+"""store refresh token hashes as raw 32-byte bytea
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15 23:41:36.217448
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # unique=True plus index=True was a single unique index; it becomes a
+    # plain unique constraint on the bytea column
+    op.execute("DROP INDEX IF EXISTS ix_refresh_tokens_token_hash")
+    op.execute(
+        "ALTER TABLE refresh_tokens ALTER COLUMN token_hash TYPE bytea "
+        "USING decode(token_hash, 'hex')"
+    )
+    op.create_unique_constraint(
+        'refresh_tokens_token_hash_key', 'refresh_tokens', ['token_hash']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('refresh_tokens_token_hash_key', 'refresh_tokens', type_='unique')
+    op.execute(
+        "ALTER TABLE refresh_tokens ALTER COLUMN token_hash TYPE varchar "
+        "USING encode(token_hash, 'hex')"
+    )
+    op.create_index(
+        'ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=True
+    )
@@ -0,0 +1,90 @@
+"""maintain counselor rating and review_count with a review trigger
+
+Adds counselor_profiles.review_count, backfills rating/review_count from
+approved reviews, then installs the trigger that keeps both current.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15 23:45:20.884301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'counselor_profiles',
+        sa.Column('review_count', sa.Integer(), nullable=False, server_default='0')
+    )
+
+    # Backfill from approved reviews; profiles without any go to 0 / 0
+    op.execute("""
+        UPDATE counselor_profiles p
+        SET rating = s.avg_rating,
+            review_count = s.n
+        FROM (
+            SELECT cp.id,
+                   count(r.id) AS n,
+                   coalesce(avg(r.rating), 0) AS avg_rating
+            FROM counselor_profiles cp
+            LEFT JOIN counselor_reviews r
+              ON r.counselor_profile_id = cp.id AND r.is_approved
+            GROUP BY cp.id
+        ) s
+        WHERE p.id = s.id
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION counselor_reviews_update_rating() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND
+               (OLD.rating, OLD.is_approved, OLD.counselor_profile_id)
+               IS NOT DISTINCT FROM (NEW.rating, NEW.is_approved, NEW.counselor_profile_id) THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.is_approved THEN
+                    UPDATE counselor_profiles
+                    SET rating = CASE WHEN review_count <= 1 THEN 0
+                                      ELSE (rating * review_count - OLD.rating) / (review_count - 1) END,
+                        review_count = GREATEST(review_count - 1, 0)
+                    WHERE id = OLD.counselor_profile_id;
+                END IF;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.is_approved THEN
+                    UPDATE counselor_profiles
+                    SET rating = (rating * review_count + NEW.rating) / (review_count + 1),
+                        review_count = review_count + 1
+                    WHERE id = NEW.counselor_profile_id;
+                END IF;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER counselor_reviews_rating_trg
+        AFTER INSERT OR DELETE OR UPDATE OF rating, is_approved, counselor_profile_id
+        ON counselor_reviews
+        FOR EACH ROW EXECUTE FUNCTION counselor_reviews_update_rating()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS counselor_reviews_rating_trg ON counselor_reviews")
+    op.execute("DROP FUNCTION IF EXISTS counselor_reviews_update_rating()")
+    op.drop_column('counselor_profiles', 'review_count')
@@ -0,0 +1,58 @@
+"""enforce non-overlapping time slots with an exclusion constraint
+
+Overlapping slots already in the table would make the constraint fail, so
+overlapping slots that are neither booked nor referenced by a chat session
+are removed first, keeping the booked/referenced slot or else the oldest one.
+Overlaps between two booked slots are left alone and make the upgrade fail
+for manual cleanup.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-15 23:49:02.371556
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.execute("""
+        WITH slots AS (
+            SELECT t.id, t.counselor_id, t.created_at,
+                   tsrange(t.date + t.start_time, t.date + t.end_time) AS span,
+                   t.is_booked OR EXISTS (
+                       SELECT 1 FROM chat_sessions s WHERE s.time_slot_id = t.id
+                   ) AS in_use
+            FROM time_slots t
+        )
+        DELETE FROM time_slots
+        WHERE id IN (
+            SELECT t.id
+            FROM slots t
+            JOIN slots o
+              ON o.counselor_id = t.counselor_id
+             AND o.id <> t.id
+             AND o.span && t.span
+            WHERE NOT t.in_use
+              AND (o.in_use OR (o.created_at, o.id) < (t.created_at, t.id))
+        )
+    """)
+
+    op.execute("""
+        ALTER TABLE time_slots ADD CONSTRAINT ex_time_slots_no_overlap
+        EXCLUDE USING gist (counselor_id WITH =, tsrange(date + start_time, date + end_time) WITH &&)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE time_slots DROP CONSTRAINT ex_time_slots_no_overlap")
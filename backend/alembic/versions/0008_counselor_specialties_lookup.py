@@ -0,0 +1,68 @@
+"""add the counselor_specialties lookup table
+
+Creates the table mirroring counselor_profiles.specialties, backfills it,
+and installs the trigger that keeps it in sync.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-15 23:52:41.905117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'counselor_specialties',
+        sa.Column(
+            'counselor_id', postgresql.UUID(as_uuid=True),
+            sa.ForeignKey('staff.id', ondelete='CASCADE'), primary_key=True
+        ),
+        sa.Column('specialty', sa.String(100), primary_key=True),
+    )
+    op.create_index(
+        'ix_counselor_specialties_specialty', 'counselor_specialties',
+        ['specialty', 'counselor_id']
+    )
+
+    op.execute("""
+        INSERT INTO counselor_specialties (counselor_id, specialty)
+        SELECT DISTINCT staff_id, jsonb_array_elements_text(specialties)
+        FROM counselor_profiles
+        WHERE jsonb_typeof(specialties) = 'array'
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION counselor_profiles_sync_specialties() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM counselor_specialties WHERE counselor_id = NEW.staff_id;
+            INSERT INTO counselor_specialties (counselor_id, specialty)
+            SELECT DISTINCT NEW.staff_id, value
+            FROM jsonb_array_elements_text(NEW.specialties);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER counselor_profiles_specialties_trg
+        AFTER INSERT OR UPDATE OF specialties ON counselor_profiles
+        FOR EACH ROW EXECUTE FUNCTION counselor_profiles_sync_specialties()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS counselor_profiles_specialties_trg ON counselor_profiles")
+    op.execute("DROP FUNCTION IF EXISTS counselor_profiles_sync_specialties()")
+    op.drop_index('ix_counselor_specialties_specialty', table_name='counselor_specialties')
+    op.drop_table('counselor_specialties')
@@ -0,0 +1,52 @@
+"""store counselor_schedules.days_of_week as a weekday bitmask
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-15 23:55:18.420736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _replace_days_column(new_type: str, conversion: str) -> None:
+    # ALTER COLUMN ... TYPE ... USING cannot take a subquery, so convert
+    # through a new column and swap it in
+    op.execute(f"ALTER TABLE counselor_schedules ADD COLUMN days_new {new_type}")
+    op.execute(f"UPDATE counselor_schedules SET days_new = {conversion}")
+    op.execute("ALTER TABLE counselor_schedules DROP COLUMN days_of_week")
+    op.execute("ALTER TABLE counselor_schedules RENAME COLUMN days_new TO days_of_week")
+    op.execute("ALTER TABLE counselor_schedules ALTER COLUMN days_of_week SET NOT NULL")
+
+
+def upgrade() -> None:
+    # Dropping the array column drops ix_schedules_days_gin with it
+    # {0,2,4} -> 0b0010101 (bit i set for weekday i)
+    _replace_days_column(
+        "smallint",
+        "(SELECT coalesce(sum(1 << d), 0) FROM unnest(days_of_week) AS d)"
+    )
+    op.execute(
+        "CREATE INDEX ix_schedules_active_days ON counselor_schedules "
+        "(counselor_id, days_of_week) WHERE is_active"
+    )
+
+
+def downgrade() -> None:
+    # Dropping the mask column drops ix_schedules_active_days with it
+    _replace_days_column(
+        "smallint[]",
+        "ARRAY(SELECT d FROM generate_series(0, 6) AS d WHERE days_of_week >> d & 1 = 1)"
+    )
+    op.create_index(
+        'ix_schedules_days_gin', 'counselor_schedules', ['days_of_week'],
+        postgresql_using='gin'
+    )
@@ -0,0 +1,48 @@
+"""maintain posts.empathy_count with a trigger on empathies
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-15 23:58:33.062419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION empathies_update_post_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE posts SET empathy_count = empathy_count + 1 WHERE id = NEW.post_id;
+            ELSE
+                UPDATE posts SET empathy_count = GREATEST(empathy_count - 1, 0) WHERE id = OLD.post_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER empathies_count_trg
+        AFTER INSERT OR DELETE ON empathies
+        FOR EACH ROW EXECUTE FUNCTION empathies_update_post_count()
+    """)
+
+    # Resync once; the trigger keeps the counter current from here on
+    op.execute("""
+        UPDATE posts p
+        SET empathy_count = (SELECT count(*) FROM empathies e WHERE e.post_id = p.id)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS empathies_count_trg ON empathies")
+    op.execute("DROP FUNCTION IF EXISTS empathies_update_post_count()")
@@ -0,0 +1,64 @@
+"""keep per-post emoji counts in a trigger-maintained table
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16 00:01:27.553890
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'post_emoji_counts',
+        sa.Column(
+            'post_id', postgresql.UUID(as_uuid=True),
+            sa.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True
+        ),
+        sa.Column('emoji', sa.String(), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+
+    op.execute("""
+        INSERT INTO post_emoji_counts (post_id, emoji, count)
+        SELECT post_id, emoji, count(*) FROM emoji_reactions GROUP BY post_id, emoji
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION emoji_reactions_update_counts() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO post_emoji_counts (post_id, emoji, count)
+                VALUES (NEW.post_id, NEW.emoji, 1)
+                ON CONFLICT (post_id, emoji) DO UPDATE SET count = post_emoji_counts.count + 1;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE post_emoji_counts SET count = count - 1
+                WHERE post_id = OLD.post_id AND emoji = OLD.emoji;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER emoji_reactions_counts_trg
+        AFTER INSERT OR DELETE OR UPDATE OF emoji ON emoji_reactions
+        FOR EACH ROW EXECUTE FUNCTION emoji_reactions_update_counts()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS emoji_reactions_counts_trg ON emoji_reactions")
+    op.execute("DROP FUNCTION IF EXISTS emoji_reactions_update_counts()")
+    op.drop_table('post_emoji_counts')
@@ -3,7 +3,8 @@ Admin API endpoints - Platform administration (Admins Only)
 """
 
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_, desc
 from datetime import datetime, timedelta
@@ -21,7 +22,8 @@ from app.models.report import Report
 from app.models.audit_log import AuditLog, AuditAction, AuditSeverity
 from app.schemas.staff import (
     StaffCreate, StaffUpdate, StaffRoleUpdate, AuditLogResponse,
-    DashboardStats, UserStatsResponse, SessionStatsResponse, PostStatsResponse
+    DashboardStats, UserStatsResponse, SessionStatsResponse, PostStatsResponse,
+    audit_log_list_adapter
 )
 from app.services.staff_service import StaffService, AuditLogService, DashboardService
 
@@ -536,7 +538,9 @@ async def create_staff_member(
     Create new staff member (Admin permission required)
     """
     try:
-        new_staff = StaffService.create_staff(db, staff_data, current_staff)
+        new_staff = await run_in_threadpool(
+            StaffService.create_staff, db, staff_data, current_staff
+        )
         return {
             "success": True,
             "message": "Staff member created successfully",
@@ -668,4 +672,8 @@ async def get_audit_logs(
         target_type=target_type
     )
     
-    return [AuditLogResponse.model_validate(log) for log in logs]
\ No newline at end of file
+    items = audit_log_list_adapter.validate_python(logs, from_attributes=True)
+    return Response(
+        content=audit_log_list_adapter.dump_json(items),
+        media_type="application/json"
+    )
\ No newline at end of file
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import Any
 from datetime import datetime, timedelta
 
@@ -11,6 +12,7 @@ from app.schemas.auth import (
     SNSLoginRequest, 
     OnboardingRequest, 
     LoginResponse, 
+    UserSummary,
     AuthTokens,
     RefreshTokenRequest,
     AccountDeletionRequest,
@@ -58,23 +60,15 @@ async def naver_login(
     
     if existing_user:
         # Existing user - update last login and return tokens
-        existing_user.last_login = datetime.utcnow()
+        existing_user.last_login = func.now()
         db.commit()
         
         # Create tokens
         tokens = TokenService.create_tokens_for_user(existing_user, db, request)
         
-        return LoginResponse(
+        login_response = LoginResponse(
             is_new_user=False,
-            user={
-                "id": str(existing_user.id),
-                "email": existing_user.email,
-                "nickname": existing_user.nickname,
-                "profile_image": existing_user.profile_image,
-                "is_active": existing_user.is_active,
-                "created_at": existing_user.created_at.isoformat() + "Z",
-                "last_login": existing_user.last_login.isoformat() + "Z" if existing_user.last_login else None
-            },
+            user=UserSummary.model_validate(existing_user),
             tokens={
                 "access_token": tokens.access_token,
                 "refresh_token": tokens.refresh_token,
@@ -85,12 +79,14 @@ async def naver_login(
         )
     else:
         # New user - return SNS profile for onboarding
-        return LoginResponse(
+        login_response = LoginResponse(
             is_new_user=True,
             user=None,
             tokens=None,
             sns_profile=sns_profile_data
         )
+    
+    return Response(content=login_response.to_json(), media_type="application/json")
 
 
 @router.post("/complete-onboarding", response_model=dict)
@@ -134,7 +130,7 @@ async def complete_onboarding(
         sns_provider=request_data.sns_provider,
         sns_id=request_data.sns_id,
         is_active=True,
-        last_login=datetime.utcnow()
+        last_login=func.now()
     )
     
     db.add(new_user)
@@ -298,7 +294,7 @@ async def delete_account(
     
     deleted_at = datetime.utcnow()
     
-    return AccountDeletionResponse(
+    deletion_response = AccountDeletionResponse(
         message="Account has been successfully deleted. Thank you for using our service.",
         deleted_at=deleted_at.isoformat() + "Z",
         data_retention_info={
@@ -306,6 +302,8 @@ async def delete_account(
             "deletion_period": "Personal information will be deleted immediately, and some records may be retained for up to 3 years in accordance with related laws."
         }
     )
+    
+    return Response(content=deletion_response.to_json(), media_type="application/json")
 
 
 @router.post("/me/consent", response_model=UserConsentResponse)
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import Any, List, Optional
 from uuid import UUID
+from datetime import date, time
+import orjson
 
 from app.db.session import get_db
 from app.core.security import get_current_active_user
+from app.core.pagination import encode_cursor, decode_cursor
 from app.schemas.chat import (
     ChatSession, ChatSessionCreate, ChatSessionBookingResponse, 
-    ChatSessionsList, Message, MessageCreate, MessageResponse
+    ChatSessionsList, Message, MessageCreate, MessageResponse,
+    chat_session_list_adapter
 )
 from app.models.user import User
 from app.services.chat_service import ChatService
@@ -17,7 +21,7 @@ router = APIRouter()
 
 @router.get("/sessions/me", response_model=ChatSessionsList)
 def get_my_chat_sessions(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     status: Optional[str] = Query(None, regex="^(pending|active|completed|cancelled)$"),
     db: Session = Depends(get_db),
@@ -25,22 +29,61 @@ def get_my_chat_sessions(
 ) -> Any:
     """
     Get chat sessions for the current user.
+    Pass next_cursor from the previous response to fetch the following page.
     """
     chat_service = ChatService(db)
     
-    sessions, total = chat_service.get_user_chat_sessions(
+    session_cursor = None
+    if cursor:
+        try:
+            cur_date, cur_time, cur_id = decode_cursor(cursor)
+            session_cursor = (
+                date.fromisoformat(cur_date),
+                time.fromisoformat(cur_time),
+                UUID(cur_id)
+            )
+        except (ValueError, TypeError):
+            # `status` is shadowed by the query parameter here
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    sessions, next_key = chat_service.get_user_chat_sessions(
         user_id=str(current_user.id),
-        skip=skip,
+        cursor=session_cursor,
         limit=limit,
         status=status
     )
     
-    return ChatSessionsList(
-        items=[ChatSession.from_orm(session) for session in sessions],
-        total=total,
-        skip=skip,
-        limit=limit
+    items = chat_session_list_adapter.validate_python(sessions, from_attributes=True)
+    
+    # Items are serialized by pydantic-core; only the envelope goes through orjson
+    return Response(
+        content=orjson.dumps({
+            "items": orjson.Fragment(chat_session_list_adapter.dump_json(items)),
+            "next_cursor": encode_cursor(next_key) if next_key else None,
+            "limit": limit
+        }),
+        media_type="application/json"
+    )
+
+
+@router.get("/sessions/me/count", response_model=dict)
+def get_my_chat_sessions_count(
+    status: Optional[str] = Query(None, regex="^(pending|active|completed|cancelled)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Any:
+    """
+    Get the total number of chat sessions for the current user.
+    Separate from the list endpoint so pages are served without a COUNT(*).
+    """
+    chat_service = ChatService(db)
+    
+    total = chat_service.count_user_chat_sessions(
+        user_id=str(current_user.id),
+        status=status
     )
+    
+    return {"total": total}
 
 
 @router.post("/sessions/book", response_model=ChatSessionBookingResponse)
@@ -61,7 +104,7 @@ def book_chat_session(
         )
         
         return ChatSessionBookingResponse(
-            session_id=str(session.id),
+            session_id=session.id,
             status=session.status,
             message="Session has been successfully booked."
         )
@@ -108,7 +151,7 @@ def get_chat_session_details(
             detail="Session not found or access denied"
         )
     
-    return ChatSession.from_orm(session)
+    return Response(content=ChatSession.from_orm(session).to_json(), media_type="application/json")
 
 
 @router.post("/sessions/{session_id}/cancel")
@@ -155,13 +198,15 @@ def cancel_chat_session(
 @router.get("/sessions/{session_id}/messages", response_model=List[Message])
 def get_chat_messages(
     session_id: str,
-    skip: int = Query(0, ge=0),
+    after_id: Optional[UUID] = Query(None),
+    before_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """
     Get messages for a specific chat session.
+    Pass after_id (last id seen) for newer messages or before_id for older history.
     """
     chat_service = ChatService(db)
     
@@ -177,7 +222,8 @@ def get_chat_messages(
         messages = chat_service.get_session_messages(
             session_id=str(session_uuid),
             user_id=str(current_user.id),
-            skip=skip,
+            after_id=after_id,
+            before_id=before_id,
             limit=limit
         )
         
@@ -224,9 +270,9 @@ def send_chat_message(
         )
         
         return MessageResponse(
-            id=str(message.id),
-            session_id=str(message.session_id),
-            sender_id=str(message.sender_id),
+            id=message.id,
+            session_id=message.session_id,
+            sender_id=message.sender_id,
             sender_type=message.sender_type,
             content=message.content,
             created_at=message.created_at
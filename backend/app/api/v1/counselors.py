@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import Any, List, Optional
 from uuid import UUID
 from datetime import date, time
 import time as time_module
+import orjson
 
 from app.db.session import get_db
 from app.core.security import get_current_active_user
 from app.schemas.counselor import (
     Counselor, CounselorsList, TimeSlot, TimeSlotCreate, 
-    TimeSlotBulkCreate, CounselorAvailableSlots
+    TimeSlotBulkCreate, CounselorAvailableSlots, counselor_list_adapter, counselor_td
 )
 from app.models.user import User
 from app.services.counselor_service import CounselorService
@@ -31,18 +32,24 @@ def get_available_counselors(
     """
     counselor_service = CounselorService(db)
     
-    counselors, total = counselor_service.get_available_counselors(
+    counselors, has_more = counselor_service.get_available_counselors(
         skip=skip,
         limit=limit,
         specialties=specialties,
         min_rating=min_rating
     )
     
-    return CounselorsList(
-        items=[Counselor.from_orm(counselor) for counselor in counselors],
-        total=total,
-        skip=skip,
-        limit=limit
+    items = [counselor_td(counselor) for counselor in counselors]
+    
+    # Items are serialized by pydantic-core; only the envelope goes through orjson
+    return Response(
+        content=orjson.dumps({
+            "items": orjson.Fragment(counselor_list_adapter.dump_json(items)),
+            "has_more": has_more,
+            "skip": skip,
+            "limit": limit
+        }),
+        media_type="application/json"
     )
 
 
@@ -73,7 +80,7 @@ def get_counselor_details(
             detail="Counselor not found"
         )
     
-    return Counselor.from_orm(counselor)
+    return Response(content=Counselor.from_orm(counselor).to_json(), media_type="application/json")
 
 
 @router.get("/{counselor_id}/slots", response_model=CounselorAvailableSlots)
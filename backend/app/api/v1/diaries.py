@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import Any, List, Optional
 from uuid import UUID
@@ -6,30 +6,42 @@ from datetime import datetime
 
 from app.db.session import get_db
 from app.core.security import get_current_active_user
+from app.core.pagination import encode_cursor, decode_cursor
 from app.schemas.diary import Diary, DiaryCreate, DiaryUpdate, DiaryStatistics
 from app.models.user import User
-from app.services.diary_service import DiaryService
+from app.services.diary_service import DiaryService, DiaryCursor
 
 router = APIRouter()
 
 
+def _diary_cursor(cursor: Optional[str]) -> Optional[DiaryCursor]:
+    if not cursor:
+        return None
+    try:
+        cur_created_at, cur_id = decode_cursor(cursor)
+        return datetime.fromisoformat(cur_created_at), UUID(cur_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
 @router.get("/", response_model=dict)
 def get_diaries(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     mood: Optional[str] = Query(None),
     year: Optional[int] = Query(None),
-    month: Optional[int] = Query(None),
+    month: Optional[int] = Query(None, ge=1, le=12),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """
-    Get user's diary entries with pagination and filtering
+    Get user's diary entries with pagination and filtering.
+    Pass next_cursor from the previous response to fetch the following page.
     """
-    diary_service = DiaryService(db)
-    diaries, total = diary_service.get_user_diaries(
+    diaries, next_key = DiaryService.get_user_diaries(
+        db,
         user_id=current_user.id,
-        skip=skip,
+        cursor=_diary_cursor(cursor),
         limit=limit,
         mood=mood,
         year=year,
@@ -38,8 +50,7 @@ def get_diaries(
     
     return {
         "items": [Diary.from_orm(diary) for diary in diaries],
-        "total": total,
-        "skip": skip,
+        "next_cursor": encode_cursor(next_key) if next_key else None,
         "limit": limit
     }
 
@@ -53,12 +64,11 @@ def create_diary(
     """
     Create a new diary entry
     """
-    diary_service = DiaryService(db)
-    
     try:
-        diary = diary_service.create_diary(
-            user_id=current_user.id,
-            diary_data=diary_data
+        diary = DiaryService.create_diary(
+            db,
+            diary_data=diary_data,
+            user=current_user
         )
         return Diary.from_orm(diary)
     except ValueError as e:
@@ -83,21 +93,20 @@ def get_diary_statistics(
     """
     Get comprehensive diary statistics including mood distribution and writing streaks
     """
-    diary_service = DiaryService(db)
-    
     # Use current date if year/month not provided
     current_date = datetime.now()
     target_year = year or current_date.year
     target_month = month or current_date.month
     
     try:
-        statistics = diary_service.get_diary_statistics(
+        statistics = DiaryService.get_diary_statistics(
+            db,
             user_id=current_user.id,
             year=target_year,
             month=target_month
         )
         
-        return DiaryStatistics(**statistics)
+        return Response(content=DiaryStatistics(**statistics).to_json(), media_type="application/json")
     
     except Exception as e:
         raise HTTPException(
@@ -115,8 +124,6 @@ def get_diary(
     """
     Get diary details by ID
     """
-    diary_service = DiaryService(db)
-    
     try:
         diary_uuid = UUID(diary_id)
     except ValueError:
@@ -125,7 +132,8 @@ def get_diary(
             detail="Invalid diary ID format"
         )
     
-    diary = diary_service.get_diary_by_id(
+    diary = DiaryService.get_diary_by_id(
+        db,
         diary_id=diary_uuid,
         user_id=current_user.id
     )
@@ -149,8 +157,6 @@ def update_diary(
     """
     Update a diary entry
     """
-    diary_service = DiaryService(db)
-    
     try:
         diary_uuid = UUID(diary_id)
     except ValueError:
@@ -159,19 +165,24 @@ def update_diary(
             detail="Invalid diary ID format"
         )
     
+    diary = DiaryService.get_diary_by_id(
+        db,
+        diary_id=diary_uuid,
+        user_id=current_user.id
+    )
+    
+    if not diary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Diary entry not found or access denied"
+        )
+    
     try:
-        diary = diary_service.update_diary(
-            diary_id=diary_uuid,
-            user_id=current_user.id,
+        diary = DiaryService.update_diary(
+            db,
+            diary=diary,
             diary_data=diary_data
         )
-        
-        if not diary:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Diary entry not found or access denied"
-            )
-        
         return Diary.from_orm(diary)
     
     except ValueError as e:
@@ -195,8 +206,6 @@ def delete_diary(
     """
     Delete a diary entry
     """
-    diary_service = DiaryService(db)
-    
     try:
         diary_uuid = UUID(diary_id)
     except ValueError:
@@ -205,21 +214,24 @@ def delete_diary(
             detail="Invalid diary ID format"
         )
     
-    success = diary_service.delete_diary(
+    diary = DiaryService.get_diary_by_id(
+        db,
         diary_id=diary_uuid,
         user_id=current_user.id
     )
     
-    if not success:
+    if not diary:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Diary entry not found or access denied"
         )
     
+    DiaryService.delete_diary(db, diary)
+    
     return {"message": "Diary entry has been deleted successfully."}
 
 
-@router.get("/{diary_id}/similar", response_model=List[Diary])
+@router.get("/{diary_id}/similar", response_model=List[dict])
 def get_similar_mood_diaries(
     diary_id: str,
     limit: int = Query(5, ge=1, le=10),
@@ -229,8 +241,6 @@ def get_similar_mood_diaries(
     """
     Get diaries with similar mood for emotional pattern analysis
     """
-    diary_service = DiaryService(db)
-    
     try:
         diary_uuid = UUID(diary_id)
     except ValueError:
@@ -240,19 +250,14 @@ def get_similar_mood_diaries(
         )
     
     try:
-        similar_diaries = diary_service.get_similar_mood_diaries(
-            diary_id=diary_uuid,
+        # Summaries (id, title, created_at, mood), not full Diary entries
+        return DiaryService.get_similar_mood_diaries(
+            db,
             user_id=current_user.id,
+            diary_id=diary_uuid,
             limit=limit
         )
-        
-        return [Diary.from_orm(diary) for diary in similar_diaries]
     
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
-        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,41 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import Any, List, Optional
 from uuid import UUID
+from datetime import datetime
 import time
 
 from app.db.session import get_db
 from app.core.security import get_current_active_user
+from app.core.pagination import encode_cursor, decode_cursor
 from app.schemas.post import Post, PostCreate, PostUpdate, PostEmpathyResponse
 from app.models.user import User
-from app.services.post_service import PostService
+from app.services.post_service import PostService, PostCursor
 
 router = APIRouter()
 
 
+def _post_cursor(cursor: Optional[str]) -> Optional[PostCursor]:
+    if not cursor:
+        return None
+    try:
+        cur_created_at, cur_id = decode_cursor(cursor)
+        return datetime.fromisoformat(cur_created_at), UUID(cur_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _post_items(db: Session, posts, user_id) -> List[Post]:
+    """
+    Build list items with the viewer's empathy state and reaction counts,
+    loaded for the whole page in two queries instead of two per post.
+    """
+    post_ids = [post.id for post in posts]
+    empathized = PostService.check_user_empathy_bulk(db, post_ids, user_id)
+    reactions = PostService.get_post_emoji_reactions_bulk(db, post_ids)
+    
+    return [
+        Post.from_orm(post).model_copy(update={
+            "is_empathized": post.id in empathized,
+            "emoji_reactions": reactions.get(post.id, [])
+        })
+        for post in posts
+    ]
+
+
 @router.get("/", response_model=dict)
 def get_posts(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     category: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """
-    Get posts list (public posts and user's private posts)
+    Get posts list (public posts and user's private posts).
+    Pass next_cursor from the previous response to fetch the following page.
     """
-    post_service = PostService(db)
-    posts, total = post_service.get_posts(
-        user_id=current_user.id,
-        skip=skip,
+    posts, next_key = PostService.get_posts_with_pagination(
+        db,
+        cursor=_post_cursor(cursor),
         limit=limit,
-        category=category
+        category=category,
+        user_id=current_user.id,
+        include_private=True
     )
     
     return {
-        "items": [Post.from_orm(post) for post in posts],
-        "total": total,
-        "skip": skip,
+        "items": _post_items(db, posts, current_user.id),
+        "next_cursor": encode_cursor(next_key) if next_key else None,
         "limit": limit
     }
 
@@ -81,23 +112,24 @@ def search_posts(
     """
     Search posts by keyword using Full-Text Search functionality
     """
-    post_service = PostService(db)
-    
     start_time = time.time()
     
     try:
-        posts, total = post_service.search_posts(
+        posts, total = PostService.search_posts(
+            db,
             search_query=q.strip(),
-            user_id=current_user.id,
             skip=skip,
             limit=limit,
-            sort_by=sort_by
+            # The service calls date ordering "latest"
+            sort_by="latest" if sort_by == "created_at" else sort_by,
+            user_id=current_user.id,
+            include_private=True
         )
         
         search_time = time.time() - start_time
         
         return {
-            "items": [Post.from_orm(post) for post in posts],
+            "items": _post_items(db, posts, current_user.id),
             "total": total,
             "query": q,
             "search_time": round(search_time, 3),
@@ -115,25 +147,27 @@ def search_posts(
 
 @router.get("/my", response_model=dict)
 def get_my_posts(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Any:
     """
-    Get user's posts (including private ones)
+    Get user's posts (including private ones).
+    Pass next_cursor from the previous response to fetch the following page.
     """
-    post_service = PostService(db)
-    posts, total = post_service.get_user_posts(
+    posts, next_key = PostService.get_posts_with_pagination(
+        db,
+        cursor=_post_cursor(cursor),
+        limit=limit,
         user_id=current_user.id,
-        skip=skip,
-        limit=limit
+        include_private=True,
+        author_id=current_user.id
     )
     
     return {
-        "items": [Post.from_orm(post) for post in posts],
-        "total": total,
-        "skip": skip,
+        "items": _post_items(db, posts, current_user.id),
+        "next_cursor": encode_cursor(next_key) if next_key else None,
         "limit": limit
     }
 
@@ -168,7 +202,7 @@ def get_post(
             detail="Post not found or access denied"
         )
     
-    return Post.from_orm(post)
+    return Response(content=Post.from_orm(post).to_json(), media_type="application/json")
 
 
 @router.put("/{post_id}", response_model=Post)
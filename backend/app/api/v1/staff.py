@@ -4,7 +4,9 @@ Staff API endpoints - Authentication and management for counselors and staff
 
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from datetime import datetime
 
 from app.db.session import get_db
@@ -38,7 +40,10 @@ async def staff_login(
     """
     Staff login endpoint
     """
-    staff = StaffService.authenticate_staff(db, login_data.email, login_data.password)
+    # bcrypt verify takes ~100ms of CPU; keep it off the event loop
+    staff = await run_in_threadpool(
+        StaffService.authenticate_staff, db, login_data.email, login_data.password
+    )
     if not staff:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -52,7 +57,7 @@ async def staff_login(
         )
     
     # Update last login
-    staff.last_login = datetime.utcnow()
+    staff.last_login = func.now()
     db.commit()
     
     # Create tokens
@@ -99,7 +104,8 @@ async def change_password(
     """
     Change staff password
     """
-    success = StaffService.change_password(
+    success = await run_in_threadpool(
+        StaffService.change_password,
         db, 
         current_staff.id, 
         password_data.current_password, 
@@ -163,7 +169,7 @@ async def get_counselor_dashboard(
     today_sessions = db.query(ChatSession).filter(
         and_(
             ChatSession.counselor_id == str(current_staff.id),
-            func.date(ChatSession.scheduled_date) == today
+            ChatSession.scheduled_date == today
         )
     ).all()
     
@@ -398,8 +404,9 @@ async def create_recurring_schedule(
     """
     Create recurring counselor schedule (Counselor permission required)
     """
-    schedule = CounselorService.create_counselor_schedule(
-        db, current_staff.id, schedule_data
+    schedule = CounselorService(db).create_counselor_schedule(
+        counselor_id=current_staff.id,
+        schedule_data=schedule_data
     )
     return {"message": "Recurring schedule created successfully", "schedule_id": str(schedule.id)}
 
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status, Query
-from fastapi.security import HTTPBearer
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional
-import jwt
+from jose import jwt
 import logging
+import uuid
 
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
 from app.core.security import get_user_from_token
 from app.websocket.chat_manager import chat_websocket_manager
 from app.models.user import User
@@ -14,13 +15,35 @@ from app.models.staff import Staff
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-security = HTTPBearer()
+
+# JWT decode arguments are fixed for the process lifetime; build them once
+_JWT_ALGORITHMS = (settings.ALGORITHM,)
+_JWT_OPTIONS = {"verify_aud": False, "require_exp": True, "require_sub": True}
+
+
+def _lookup_principal(principal_id: uuid.UUID) -> Optional[tuple[str, str]]:
+    """
+    Resolve an active user or counselor by id.
+    The DB session is closed before returning, so the socket holds no
+    pooled connection once authenticated.
+    """
+    with SessionLocal() as db:
+        # Check if it's a regular user
+        user = db.get(User, principal_id)
+        if user and user.is_active:
+            return str(user.id), "user"
+
+        # Check if it's a staff member (counselor)
+        staff = db.get(Staff, principal_id)
+        if staff and staff.is_active and staff.role == "counselor":
+            return str(staff.id), "counselor"
+
+    return None
 
 
 async def get_websocket_user(
     websocket: WebSocket,
-    token: str = Query(...),
-    db: Session = Depends(get_db)
+    token: str = Query(...)
 ) -> tuple[str, str]:  # Returns (user_id, user_type)
     """
     Authenticate WebSocket connection using token from query parameter.
@@ -29,9 +52,10 @@ async def get_websocket_user(
     try:
         # Decode JWT token
         payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
+            token,
+            settings.SECRET_KEY,
+            algorithms=_JWT_ALGORITHMS,
+            options=_JWT_OPTIONS
         )
         
         user_id = payload.get("sub")
@@ -39,15 +63,11 @@ async def get_websocket_user(
             await websocket.close(code=4001, reason="Invalid token: no user ID")
             raise WebSocketDisconnect()
         
-        # Check if it's a regular user
-        user = db.query(User).filter(User.id == user_id).first()
-        if user and user.is_active:
-            return str(user.id), "user"
+        principal_id = uuid.UUID(user_id)
         
-        # Check if it's a staff member (counselor)
-        staff = db.query(Staff).filter(Staff.id == user_id).first()
-        if staff and staff.is_active and staff.role == "counselor":
-            return str(staff.id), "counselor"
+        principal = await run_in_threadpool(_lookup_principal, principal_id)
+        if principal:
+            return principal
         
         # No valid user found
         await websocket.close(code=4002, reason="User not found or inactive")
@@ -69,8 +89,7 @@ async def get_websocket_user(
 async def websocket_chat_endpoint(
     websocket: WebSocket,
     session_id: str,
-    token: str = Query(...),
-    db: Session = Depends(get_db)
+    token: str = Query(...)
 ):
     """
     WebSocket endpoint for real-time chat in counseling sessions.
@@ -99,7 +118,7 @@ async def websocket_chat_endpoint(
     
     try:
         # Authenticate the WebSocket connection
-        user_id, user_type = await get_websocket_user(websocket, token, db)
+        user_id, user_type = await get_websocket_user(websocket, token)
         
         # Handle the WebSocket connection
         await chat_websocket_manager.handle_websocket(
@@ -134,21 +153,12 @@ async def get_websocket_session_info(
     from app.services.chat_service import ChatService
     chat_service = ChatService(db)
     
-    # Try to get session as user first
-    session = chat_service.get_chat_session_details(
+    # Caller may be either the session's user or its counselor
+    session = chat_service.get_session_for_principal(
         session_id=session_id,
-        user_id=str(current_user.id)
+        principal_id=str(current_user.id)
     )
-    
-    # If not found, try as counselor (if user is staff)
-    if not session:
-        staff = db.query(Staff).filter(Staff.id == current_user.id).first()
-        if staff and staff.role == "counselor":
-            session = chat_service.get_chat_session_details(
-                session_id=session_id,
-                counselor_id=str(staff.id)
-            )
-    
+
     if not session:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -7,6 +7,7 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "OnMaum API"
     VERSION: str = "1.0.0"
     DESCRIPTION: str = "OnMaum - Anonymous counseling platform for teenagers"
+    ENV: str = "dev"  # 'dev' or 'production'
     
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
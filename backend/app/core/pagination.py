@@ -0,0 +1,58 @@
+"""
+Keyset (cursor) pagination helpers
+"""
+
+import base64
+from typing import Any, List, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import tuple_
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+    date/time/UUID values are serialized by orjson as ISO strings.
+    """
+    return base64.urlsafe_b64encode(orjson.dumps(list(key))).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor back into its raw values.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(padded))
+    except ValueError as e:  # covers binascii.Error and orjson.JSONDecodeError
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+
+    return values
+
+
+def keyset_page(
+    query,
+    key_columns: Sequence[Any],
+    cursor: Optional[Sequence[Any]],
+    limit: int
+) -> Tuple[List[Any], Optional[Tuple[Any, ...]]]:
+    """
+    Fetch one page of query ordered by key_columns descending, starting after cursor.
+    Fetches one extra row to tell whether another page exists; returns the
+    key of the last row as the next cursor, or None on the last page.
+    """
+    if cursor:
+        query = query.filter(tuple_(*key_columns) < tuple_(*cursor))
+
+    rows = query.order_by(*(column.desc() for column in key_columns)).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, tuple(getattr(last, column.key) for column in key_columns)
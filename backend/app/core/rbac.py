@@ -3,18 +3,24 @@ Role-Based Access Control (RBAC) system for OnMaum platform
 Provides decorators and dependencies for managing staff and admin permissions
 """
 
-from functools import wraps
-from typing import List, Optional, Callable, Any
+from functools import wraps, partial
+from typing import List, Optional, Callable, Any, Tuple
 from fastapi import Depends, HTTPException, status, Request
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
+import asyncio
 import enum
+import inspect
+import uuid
 
 from app.core.config import settings
+from app.core.security import security
 from app.db.session import get_db
 from app.models.staff import Staff
-from app.models.audit_log import AuditLog, AuditAction, AuditSeverity
+from app.models.audit_log import AuditAction, AuditSeverity
+from app.services.audit_queue import audit_log_row, submit_audit_logs
 
 
 class StaffRole(enum.Enum):
@@ -25,6 +31,10 @@ class StaffRole(enum.Enum):
     SUPPORT = "support"
 
 
+# Role value -> StaffRole, resolved once instead of calling StaffRole(...) per request
+_ROLE_CACHE = {role.value: role for role in StaffRole}
+
+
 class Permission(enum.Enum):
     """Permission enumeration for RBAC"""
     # User management
@@ -103,8 +113,6 @@ ROLE_PERMISSIONS = {
 }
 
 
-security = HTTPBearer()
-
 
 class RBACError(Exception):
     """Custom exception for RBAC errors"""
@@ -131,12 +139,15 @@ def get_staff_from_token(
         
         if staff_id is None or token_type != "staff_access":
             raise credentials_exception
+        
+        staff_uuid = uuid.UUID(staff_id)
             
-    except JWTError:
+    except (JWTError, ValueError):
         raise credentials_exception
     
-    staff = db.query(Staff).filter(Staff.id == staff_id, Staff.is_active == True).first()
-    if staff is None:
+    # Primary-key lookup goes through the identity map first
+    staff = db.get(Staff, staff_uuid)
+    if staff is None or not staff.is_active:
         raise credentials_exception
     
     return staff
@@ -148,7 +159,7 @@ def require_role(*allowed_roles: StaffRole):
     Usage: @router.get("/admin-only", dependencies=[Depends(require_role(StaffRole.ADMIN))])
     """
     def role_checker(staff: Staff = Depends(get_staff_from_token)) -> Staff:
-        if StaffRole(staff.role) not in allowed_roles:
+        if _ROLE_CACHE.get(staff.role) not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required roles: {[role.value for role in allowed_roles]}"
@@ -164,7 +175,7 @@ def require_permission(*required_permissions: Permission):
     Usage: @router.get("/users", dependencies=[Depends(require_permission(Permission.USER_READ))])
     """
     def permission_checker(staff: Staff = Depends(get_staff_from_token)) -> Staff:
-        staff_role = StaffRole(staff.role)
+        staff_role = _ROLE_CACHE.get(staff.role)
         staff_permissions = ROLE_PERMISSIONS.get(staff_role, [])
         
         for permission in required_permissions:
@@ -179,6 +190,26 @@ def require_permission(*required_permissions: Permission):
     return permission_checker
 
 
+def _find_dependency_params(func: Callable) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Find the names of the Request, Staff and Session parameters of an endpoint
+    """
+    request_param = staff_param = db_param = None
+    
+    for name, param in inspect.signature(func).parameters.items():
+        annotation = param.annotation
+        if not inspect.isclass(annotation):
+            continue
+        if issubclass(annotation, Request):
+            request_param = name
+        elif issubclass(annotation, Staff):
+            staff_param = name
+        elif issubclass(annotation, Session):
+            db_param = name
+    
+    return request_param, staff_param, db_param
+
+
 def audit_log(
     action: AuditAction,
     target_type: Optional[str] = None,
@@ -190,21 +221,16 @@ def audit_log(
     Usage: @audit_log(AuditAction.USER_DELETE, target_type="user", severity=AuditSeverity.HIGH)
     """
     def decorator(func: Callable) -> Callable:
+        # Resolve call style and dependency parameter names once, at decoration time
+        call = func if asyncio.iscoroutinefunction(func) else partial(run_in_threadpool, func)
+        request_param, staff_param, db_param = _find_dependency_params(func)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Extract common dependencies
-            request: Request = None
-            staff: Staff = None
-            db: Session = None
-            
-            # Find dependencies in kwargs (FastAPI dependency injection)
-            for key, value in kwargs.items():
-                if isinstance(value, Request):
-                    request = value
-                elif isinstance(value, Staff):
-                    staff = value
-                elif hasattr(value, 'query'):  # Session-like object
-                    db = value
+            # Extract common dependencies (FastAPI dependency injection)
+            request: Request = kwargs.get(request_param) if request_param else None
+            staff: Staff = kwargs.get(staff_param) if staff_param else None
+            db: Session = kwargs.get(db_param) if db_param else None
             
             # If no staff found in kwargs, try to get from request state
             if not staff and request:
@@ -217,7 +243,7 @@ def audit_log(
             
             try:
                 # Execute the original function
-                result = await func(*args, **kwargs) if asyncio.iscoroutinefunction(func) else func(*args, **kwargs)
+                result = await call(*args, **kwargs)
                 
                 # Try to extract target information from result or kwargs
                 if hasattr(result, 'id'):
@@ -235,9 +261,10 @@ def audit_log(
                 raise
             
             finally:
-                # Log the action if we have the required information
+                # Log the action if we have the required information;
+                # the audit worker writes it, the response doesn't wait on it
                 if staff and db:
-                    log_entry = AuditLog.create_log(
+                    submit_audit_logs([audit_log_row(
                         staff_id=staff.id,
                         staff_name=staff.name,
                         staff_role=staff.role,
@@ -251,14 +278,7 @@ def audit_log(
                         user_agent=request.headers.get("User-Agent") if request else None,
                         success=success,
                         error_message=error_message,
-                    )
-                    
-                    try:
-                        db.add(log_entry)
-                        db.commit()
-                    except Exception as log_error:
-                        # Don't fail the original operation due to logging errors
-                        print(f"Failed to write audit log: {log_error}")
+                    )])
         
         return wrapper
     return decorator
@@ -268,7 +288,7 @@ def get_staff_permissions(staff: Staff) -> List[Permission]:
     """
     Get all permissions for a staff member based on their role
     """
-    staff_role = StaffRole(staff.role)
+    staff_role = _ROLE_CACHE.get(staff.role)
     return ROLE_PERMISSIONS.get(staff_role, [])
 
 
@@ -278,7 +298,3 @@ def check_permission(staff: Staff, permission: Permission) -> bool:
     """
     staff_permissions = get_staff_permissions(staff)
     return permission in staff_permissions
-
-
-# Import asyncio at the end to avoid circular imports
-import asyncio
\ No newline at end of file
@@ -66,7 +66,7 @@ def get_current_user(
     if token_data is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = db.get(User, token_data.user_id)
     if user is None:
         raise credentials_exception
     
@@ -0,0 +1,76 @@
+# backend/app/db/after_commit.py
+
+"""
+Background writes dispatched when a DB transaction commits
+
+Rows queued on a session are handed to a worker pool once that session's
+transaction commits (and dropped if it rolls back), then written in one
+INSERT with their own session, so they add no statement to the request's
+critical path.
+"""
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_writers: List["AfterCommitWriter"] = []
+
+
+class AfterCommitWriter:
+    """Rows for one table, queued per session and written after commit"""
+
+    def __init__(self, model, name: str, max_workers: int = 1):
+        self.model = model
+        self.name = name
+        self._pending_key = f"pending_{name}"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        _writers.append(self)
+
+    def queue(self, db: Session, row: Dict[str, Any]) -> None:
+        """Queue a row; it is written in the background once db's transaction commits"""
+        db.info.setdefault(self._pending_key, []).append(row)
+
+    def submit(self, rows: List[Dict[str, Any]]) -> None:
+        """Write rows in the background regardless of any transaction outcome"""
+        self._executor.submit(self._write, rows)
+
+    def shutdown(self) -> None:
+        """Wait for submitted rows to be written"""
+        self._executor.shutdown(wait=True)
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(insert(self.model), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception(f"Failed to write {len(rows)} queued {self.name} rows")
+        finally:
+            db.close()
+
+
+def shutdown_all() -> None:
+    """Wait for every writer's submitted rows to be written"""
+    for writer in _writers:
+        writer.shutdown()
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _dispatch_pending_rows(session: Session) -> None:
+    for writer in _writers:
+        rows = session.info.pop(writer._pending_key, None)
+        if rows:
+            writer.submit(rows)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_pending_rows(session: Session) -> None:
+    for writer in _writers:
+        session.info.pop(writer._pending_key, None)
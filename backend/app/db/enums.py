@@ -0,0 +1,14 @@
+# backend/app/db/enums.py
+
+from sqlalchemy.dialects.postgresql import ENUM
+
+# Native PostgreSQL enum types for closed value sets.
+# Values are plain strings, so existing comparisons like `role == "counselor"` keep working.
+
+SENDER_TYPE = ENUM('user', 'counselor', name='sender_type_enum')
+
+STAFF_ROLE = ENUM('counselor', 'admin', 'moderator', 'support', name='staff_role_enum')
+
+REPORT_STATUS = ENUM('pending', 'resolved', 'dismissed', name='report_status_enum')
+
+GENDER = ENUM('male', 'female', 'other', name='gender_enum')
@@ -5,7 +5,18 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(str(settings.DATABASE_URL)) # str()로 감싸주면 더 안전합니다.
+engine = create_engine(
+    str(settings.DATABASE_URL),  # str()로 감싸주면 더 안전합니다.
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_pre_ping=True,  # 끊어진 커넥션을 체크아웃 시점에 걸러냅니다.
+    pool_recycle=1800,
+    # 대량 INSERT를 1000행 단위의 multi-VALUES 문으로 묶어서 보냅니다.
+    use_insertmanyvalues=True,
+    insertmanyvalues_page_size=1000,
+    executemany_mode="values_plus_batch",
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Base 객체를 여기서 만듭니다.
@@ -13,7 +24,9 @@ Base = declarative_base()
 
 def get_db():
     """Dependency to get database session"""
-    db = SessionLocal()
+    # 요청 단위 세션은 커밋 후에도 객체를 만료시키지 않습니다.
+    # INSERT ... RETURNING으로 이미 채워진 값을 다시 SELECT(refresh)하지 않기 위함입니다.
+    db = SessionLocal(expire_on_commit=False)
     try:
         yield db
     finally:
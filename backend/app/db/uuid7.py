@@ -0,0 +1,26 @@
+# backend/app/db/uuid7.py
+
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (version 7).
+
+    Layout: 48-bit unix timestamp in milliseconds, 4-bit version,
+    74 random bits split around the 2-bit variant.
+    Consecutive ids sort by creation time, so inserts land on the
+    rightmost B-tree leaf instead of a random page.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")  # 80 bits, 74 used
+
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76                          # version
+    value |= ((rand >> 62) & 0xFFF) << 64       # rand_a
+    value |= 0b10 << 62                         # RFC 4122 variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF       # rand_b
+
+    return uuid.UUID(int=value)
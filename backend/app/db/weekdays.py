@@ -0,0 +1,19 @@
+# backend/app/db/weekdays.py
+
+from typing import Iterable, List
+
+# Weekday sets are stored as a SMALLINT bitmask: bit i is set for weekday i
+# (0=Monday, 6=Sunday). Membership is a single shift-and-mask.
+
+
+def days_to_mask(days: Iterable[int]) -> int:
+    """[0, 2, 4] -> 0b0010101"""
+    mask = 0
+    for day in days:
+        mask |= 1 << day
+    return mask
+
+
+def mask_to_days(mask: int) -> List[int]:
+    """0b0010101 -> [0, 2, 4]"""
+    return [day for day in range(7) if mask >> day & 1]
@@ -1,13 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-import os
+from pathlib import Path
 
 from app.core.config import settings
 from app.api.v1 import api_router
-
-# Create uploads directory if it doesn't exist
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+from app.db import after_commit
+from app.services import naver_oauth
+from app.services.scheduler_service import scheduler_service
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -16,6 +17,7 @@ app = FastAPI(
     openapi_url="/api/openapi.json",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Set up CORS middleware
@@ -23,17 +25,53 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # Let browsers cache preflight responses for 24 hours
 )
 
-# Mount static files
-app.mount("/api/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
+# Mount static files (dev only; in production the reverse proxy serves /api/uploads)
+if settings.ENV == "dev":
+    app.mount(
+        "/api/uploads",
+        StaticFiles(directory=settings.UPLOAD_DIR, check_dir=False),
+        name="uploads",
+    )
 
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.on_event("startup")
+def ensure_upload_dir():
+    """Create uploads directory if it doesn't exist"""
+    Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    """Start background jobs (slot generation, status updates, session reminders)"""
+    scheduler_service.start()
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Close pooled outbound HTTP connections"""
+    await naver_oauth.close_client()
+
+
+@app.on_event("shutdown")
+def stop_scheduler():
+    """Stop background jobs"""
+    scheduler_service.stop()
+
+
+@app.on_event("shutdown")
+def flush_queued_writes():
+    """Write audit log and notification rows still queued"""
+    after_commit.shutdown_all()
+
+
 @app.get("/")
 def root():
     """Root endpoint"""
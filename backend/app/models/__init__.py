@@ -10,9 +10,11 @@ from .user_consent import UserConsent
 from .refresh_token import RefreshToken
 from .empathy import Empathy
 from .emoji_reaction import EmojiReaction
+from .post_emoji_count import PostEmojiCount
 from .counselor_reply import CounselorReply
 from .report import Report
 from .time_slot import TimeSlot, CounselorSchedule, CounselorUnavailability
 from .counselor_profile import CounselorProfile
+from .counselor_specialty import CounselorSpecialty
 from .counselor_review import CounselorReview
 from .audit_log import AuditLog
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, Enum, JSON, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Enum, JSON, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.session import Base
@@ -74,9 +74,14 @@ class AuditLog(Base):
     staff_role = Column(String(50), nullable=False)   # Role at time of action
     
     # What action was performed
-    action = Column(Enum(AuditAction), nullable=False)
+    action = Column(Enum(AuditAction, native_enum=False, length=32), nullable=False)
     action_description = Column(Text, nullable=False)
-    severity = Column(Enum(AuditSeverity), nullable=False, default=AuditSeverity.MEDIUM)
+    severity = Column(
+        Enum(AuditSeverity, native_enum=False, length=32),
+        nullable=False,
+        default=AuditSeverity.MEDIUM,
+        index=True,
+    )
     
     # Target of the action (what was affected)
     target_type = Column(String(50), nullable=True)  # e.g., 'user', 'post', 'session'
@@ -101,6 +106,10 @@ class AuditLog(Base):
     # Relationships
     staff = relationship("Staff", back_populates="audit_logs")
 
+    __table_args__ = (
+        Index("ix_audit_action_severity_created", "action", "severity", "created_at"),
+    )
+
     def __repr__(self):
         return f"<AuditLog(id={self.id}, action={self.action}, staff={self.staff_name}, target={self.target_type}:{self.target_id})>"
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Date, Time
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Date, Time, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,7 +10,7 @@ from app.db.session import Base
 class ChatSession(Base):
     __tablename__ = "chat_sessions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     counselor_id = Column(UUID(as_uuid=True), ForeignKey("staff.id"), nullable=False)
     time_slot_id = Column(UUID(as_uuid=True), ForeignKey("time_slots.id"), nullable=True)
@@ -31,9 +31,42 @@ class ChatSession(Base):
     rating = Column(Integer, nullable=True)  # 1-5 stars
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Keyset pagination indexes for the per-user / per-counselor session lists;
+    # INCLUDE lets status filters and the listed columns be read from the index
+    __table_args__ = (
+        Index(
+            'ix_chat_sessions_user_schedule',
+            user_id, scheduled_date.desc(), scheduled_start_time.desc(), id.desc(),
+            postgresql_include=['status', 'counselor_id', 'time_slot_id', 'category']
+        ),
+        Index(
+            'ix_chat_sessions_counselor_schedule',
+            counselor_id, scheduled_date.desc(), scheduled_start_time.desc(), id.desc(),
+            postgresql_include=['status', 'user_id', 'time_slot_id', 'category']
+        ),
+        # Partial indexes for the hot "upcoming/in progress" filter: much smaller
+        # than the full indexes above, picked whenever status='pending'/'active'
+        Index(
+            'ix_chat_sessions_user_open',
+            user_id, scheduled_date.desc(), scheduled_start_time.desc(), id.desc(),
+            postgresql_where=status.in_(['pending', 'active'])
+        ),
+        Index(
+            'ix_chat_sessions_counselor_open',
+            counselor_id, scheduled_date.desc(), scheduled_start_time.desc(), id.desc(),
+            postgresql_where=status.in_(['pending', 'active'])
+        ),
+        # Scheduler sweeps over open sessions by scheduled time
+        Index(
+            'ix_chat_sessions_open_schedule',
+            status, scheduled_date, scheduled_start_time,
+            postgresql_where=status.in_(['pending', 'active'])
+        ),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="chat_sessions")
     counselor = relationship("Staff", back_populates="counselor_sessions")
@@ -1,8 +1,7 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, String, Integer, SmallInteger, Float, Boolean, DateTime, ForeignKey, Text, Index, text
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
 
@@ -14,13 +13,13 @@ class CounselorProfile(Base):
     """
     __tablename__ = "counselor_profiles"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     staff_id = Column(UUID(as_uuid=True), ForeignKey("staff.id"), unique=True, nullable=False)
     
     # Professional credentials
-    specialties = Column(JSON, nullable=False)  # Array of specialty strings
+    specialties = Column(JSONB, nullable=False)  # Array of specialty strings
     license_number = Column(String(50), nullable=False)
-    experience_years = Column(Integer, default=0, nullable=False)
+    experience_years = Column(SmallInteger, default=0, nullable=False)
     education = Column(Text, nullable=False)
     
     # Profile information
@@ -28,23 +27,45 @@ class CounselorProfile(Base):
     profile_image = Column(String(500), nullable=True)  # URL to image
     
     # Service metrics
-    rating = Column(Float, default=0.0, nullable=False)  # Average rating 0.0-5.0
+    rating = Column(Float, default=0.0, nullable=False)  # Average rating 0.0-5.0, maintained by trigger
+    review_count = Column(Integer, default=0, nullable=False)  # Maintained by trigger
     total_sessions = Column(Integer, default=0, nullable=False)
     
     # Availability
     is_available = Column(Boolean, default=True, nullable=False)
-    working_hours = Column(JSON, nullable=True)  # Flexible working hours JSON
+    working_hours = Column(JSONB, nullable=True)  # Flexible working hours JSON
     
     # Languages spoken
-    languages = Column(JSON, nullable=True)  # Array of language codes
+    languages = Column(JSONB, nullable=True)  # Array of language codes
     
     # Session preferences
-    session_types = Column(JSON, nullable=True)  # Array of session types (individual, group, etc.)
+    session_types = Column(JSONB, nullable=True)  # Array of session types (individual, group, etc.)
     
     # details
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # GIN indexes for @> containment filters on the JSONB arrays
+    __table_args__ = (
+        Index(
+            'ix_counselor_profiles_specialties_gin', 'specialties',
+            postgresql_using='gin', postgresql_ops={'specialties': 'jsonb_path_ops'}
+        ),
+        Index(
+            'ix_counselor_profiles_languages_gin', 'languages',
+            postgresql_using='gin', postgresql_ops={'languages': 'jsonb_path_ops'}
+        ),
+        Index(
+            'ix_counselor_profiles_session_types_gin', 'session_types',
+            postgresql_using='gin', postgresql_ops={'session_types': 'jsonb_path_ops'}
+        ),
+        # Available-counselor listing, ordered by rating then total sessions
+        Index(
+            'ix_counselor_profiles_available', 'rating', 'total_sessions',
+            postgresql_where=text('is_available')
+        ),
+    )
+    
     # Relationships
     staff = relationship("Staff", back_populates="counselor_profile")
     reviews = relationship("CounselorReview", back_populates="counselor_profile")
\ No newline at end of file
@@ -1,8 +1,7 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
 
@@ -10,7 +9,7 @@ from app.db.session import Base
 class CounselorReply(Base):
     __tablename__ = "counselor_replies"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id"), nullable=False)
     staff_id = Column(UUID(as_uuid=True), ForeignKey("staff.id"), nullable=False)
     content = Column(Text, nullable=False)
@@ -20,6 +19,10 @@ class CounselorReply(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index('ix_counselor_replies_post_approved', 'post_id', postgresql_where=text('is_approved')),
+    )
+    
     # Relationships
     # post = relationship("Post", back_populates="counselor_replies")
     # staff = relationship("Staff", back_populates="counselor_replies")
\ No newline at end of file
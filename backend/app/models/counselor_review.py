@@ -1,10 +1,10 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, String, SmallInteger, DateTime, ForeignKey, Text, Boolean, Index, CheckConstraint, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
+from app.db.uuid7 import uuid7
 
 
 class CounselorReview(Base):
@@ -14,19 +14,19 @@ class CounselorReview(Base):
     """
     __tablename__ = "counselor_reviews"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     counselor_profile_id = Column(UUID(as_uuid=True), ForeignKey("counselor_profiles.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     session_id = Column(UUID(as_uuid=True), ForeignKey("chat_sessions.id"), nullable=False)
     
     # Review content
-    rating = Column(Integer, nullable=False)  # 1-5 stars
+    rating = Column(SmallInteger, nullable=False)  # 1-5 stars
     review_text = Column(Text, nullable=True)
     
     # Review categories (optional detailed ratings)
-    communication_rating = Column(Integer, nullable=True)  # 1-5
-    helpfulness_rating = Column(Integer, nullable=True)    # 1-5
-    professionalism_rating = Column(Integer, nullable=True) # 1-5
+    communication_rating = Column(SmallInteger, nullable=True)  # 1-5
+    helpfulness_rating = Column(SmallInteger, nullable=True)    # 1-5
+    professionalism_rating = Column(SmallInteger, nullable=True) # 1-5
     
     # Moderation
     is_approved = Column(Boolean, default=True, nullable=False)
@@ -36,7 +36,61 @@ class CounselorReview(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        Index('ix_reviews_profile_created', 'counselor_profile_id', 'created_at'),
+        CheckConstraint('rating BETWEEN 1 AND 5', name='ck_review_rating_range'),
+        CheckConstraint('communication_rating BETWEEN 1 AND 5', name='ck_review_communication_rating_range'),
+        CheckConstraint('helpfulness_rating BETWEEN 1 AND 5', name='ck_review_helpfulness_rating_range'),
+        CheckConstraint('professionalism_rating BETWEEN 1 AND 5', name='ck_review_professionalism_rating_range'),
+    )
+    
     # Relationships
     counselor_profile = relationship("CounselorProfile", back_populates="reviews")
     user = relationship("User", back_populates="counselor_reviews")
-    session = relationship("ChatSession", back_populates="review", uselist=False)
\ No newline at end of file
+    session = relationship("ChatSession", back_populates="review", uselist=False)
+
+
+# Keep CounselorProfile.rating / review_count current incrementally over
+# approved reviews, instead of re-aggregating counselor_reviews after every write.
+# An UPDATE removes the old row's contribution and adds the new one.
+event.listen(
+    CounselorReview.__table__,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION counselor_reviews_update_rating() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' AND
+               (OLD.rating, OLD.is_approved, OLD.counselor_profile_id)
+               IS NOT DISTINCT FROM (NEW.rating, NEW.is_approved, NEW.counselor_profile_id) THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.is_approved THEN
+                    UPDATE counselor_profiles
+                    SET rating = CASE WHEN review_count <= 1 THEN 0
+                                      ELSE (rating * review_count - OLD.rating) / (review_count - 1) END,
+                        review_count = GREATEST(review_count - 1, 0)
+                    WHERE id = OLD.counselor_profile_id;
+                END IF;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.is_approved THEN
+                    UPDATE counselor_profiles
+                    SET rating = (rating * review_count + NEW.rating) / (review_count + 1),
+                        review_count = review_count + 1
+                    WHERE id = NEW.counselor_profile_id;
+                END IF;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER counselor_reviews_rating_trg
+        AFTER INSERT OR DELETE OR UPDATE OF rating, is_approved, counselor_profile_id
+        ON counselor_reviews
+        FOR EACH ROW EXECUTE FUNCTION counselor_reviews_update_rating();
+    """)
+)
\ No newline at end of file
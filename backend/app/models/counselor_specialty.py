@@ -0,0 +1,44 @@
+from sqlalchemy import Column, String, ForeignKey, Index, DDL, event
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+from app.models.counselor_profile import CounselorProfile
+
+
+class CounselorSpecialty(Base):
+    """
+    One row per (counselor, specialty): a lookup table mirroring
+    CounselorProfile.specialties for index-friendly faceted filtering.
+    Maintained by a trigger on counselor_profiles; never written by the app.
+    """
+    __tablename__ = "counselor_specialties"
+
+    counselor_id = Column(UUID(as_uuid=True), ForeignKey("staff.id", ondelete="CASCADE"), primary_key=True)
+    specialty = Column(String(100), primary_key=True)
+
+    # Reverse lookup: specialty -> counselors
+    __table_args__ = (
+        Index('ix_counselor_specialties_specialty', 'specialty', 'counselor_id'),
+    )
+
+
+# Rebuild a counselor's rows whenever their profile's specialties array is written
+event.listen(
+    CounselorProfile.__table__,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION counselor_profiles_sync_specialties() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM counselor_specialties WHERE counselor_id = NEW.staff_id;
+            INSERT INTO counselor_specialties (counselor_id, specialty)
+            SELECT DISTINCT NEW.staff_id, value
+            FROM jsonb_array_elements_text(NEW.specialties);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER counselor_profiles_specialties_trg
+        AFTER INSERT OR UPDATE OF specialties ON counselor_profiles
+        FOR EACH ROW EXECUTE FUNCTION counselor_profiles_sync_specialties();
+    """)
+)
@@ -1,16 +1,16 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
+from app.db.uuid7 import uuid7
 
 
 class Diary(Base):
     __tablename__ = "diaries"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
@@ -19,6 +19,15 @@ class Diary(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Per-user date range scans (monthly statistics, entry by date) and the
+    # newest-first list; INCLUDE covers the list's title/mood columns
+    __table_args__ = (
+        Index(
+            'ix_diaries_user_created_at', user_id, created_at.desc(), id.desc(),
+            postgresql_include=['title', 'mood']
+        ),
+    )
     
     # Relationships
     # user = relationship("User", back_populates="diaries")
\ No newline at end of file
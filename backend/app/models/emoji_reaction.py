@@ -1,16 +1,16 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
+from app.db.uuid7 import uuid7
 
 
 class EmojiReaction(Base):
     __tablename__ = "emoji_reactions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id"), nullable=False)
     emoji = Column(String, nullable=False)  # The emoji character
@@ -21,6 +21,8 @@ class EmojiReaction(Base):
     # Ensure one emoji reaction per user per post (they can change their emoji)
     __table_args__ = (
         UniqueConstraint('user_id', 'post_id', name='unique_user_post_emoji'),
+        # Per-emoji counts for a post come straight from the index
+        Index('ix_emoji_reactions_post_emoji', 'post_id', 'emoji'),
     )
     
     # Relationships
@@ -1,16 +1,16 @@
-from sqlalchemy import Column, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, UniqueConstraint, Index, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
+from app.db.uuid7 import uuid7
 
 
 class Empathy(Base):
     __tablename__ = "empathies"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id"), nullable=False)
     
@@ -20,8 +20,33 @@ class Empathy(Base):
     # Ensure one empathy per user per post
     __table_args__ = (
         UniqueConstraint('user_id', 'post_id', name='unique_user_post_empathy'),
+        # Covering index: per-post counts and "did I empathize" checks are index-only
+        Index('ix_empathies_post_covering', 'post_id', postgresql_include=['user_id']),
     )
     
     # Relationships
     # user = relationship("User", back_populates="empathies")
-    # post = relationship("Post", back_populates="empathies")
\ No newline at end of file
+    # post = relationship("Post", back_populates="empathies")
+
+
+# Keep posts.empathy_count in step with empathies rows inside the database
+event.listen(
+    Empathy.__table__,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION empathies_update_post_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE posts SET empathy_count = empathy_count + 1 WHERE id = NEW.post_id;
+            ELSE
+                UPDATE posts SET empathy_count = GREATEST(empathy_count - 1, 0) WHERE id = OLD.post_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER empathies_count_trg
+        AFTER INSERT OR DELETE ON empathies
+        FOR EACH ROW EXECUTE FUNCTION empathies_update_post_count();
+    """)
+)
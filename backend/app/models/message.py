@@ -1,24 +1,41 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Text, DateTime, ForeignKey, Index, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
+from app.db.enums import SENDER_TYPE
+from app.db.uuid7 import uuid7
 
 
 class Message(Base):
     __tablename__ = "messages"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     session_id = Column(UUID(as_uuid=True), ForeignKey("chat_sessions.id"), nullable=False)
     sender_id = Column(UUID(as_uuid=True), nullable=False)  # User or Counselor ID
-    sender_type = Column(String, nullable=False)  # 'user' or 'counselor'
+    sender_type = Column(SENDER_TYPE, nullable=False)  # 'user' or 'counselor'
     content = Column(Text, nullable=False)
     
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Timestamps (created_at is the partition key, so it is part of the PK)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Range-partitioned by month; partitions are created by SchedulerService
+    __table_args__ = (
+        Index('ix_messages_session_created', 'session_id', 'created_at'),
+        # Keyset pagination on the time-ordered uuid7 id
+        Index('ix_messages_session_id', 'session_id', 'id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    
     # Relationships
-    # session = relationship("ChatSession", back_populates="messages")
\ No newline at end of file
+    # session = relationship("ChatSession", back_populates="messages")
+
+
+# Catch-all partition so inserts never fail before the monthly partition exists
+event.listen(
+    Message.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS messages_default PARTITION OF messages DEFAULT")
+)
\ No newline at end of file
@@ -1,16 +1,16 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, JSON, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
+from app.db.uuid7 import uuid7
 
 
 class Notification(Base):
     __tablename__ = "notifications"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     type = Column(String, nullable=False)  # 'session_reminder', 'post_empathy', etc.
     title = Column(String, nullable=False)
@@ -18,9 +18,27 @@ class Notification(Base):
     data = Column(JSON, nullable=True)  # Additional data as JSON
     is_read = Column(Boolean, default=False)
     
-    # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Timestamps (created_at is the partition key, so it is part of the PK)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     read_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Unread notifications per user, newest first.
+    # Range-partitioned by month; partitions are created by SchedulerService
+    __table_args__ = (
+        Index(
+            'ix_notifications_user_unread', 'user_id', 'created_at',
+            postgresql_where=text('is_read = false')
+        ),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    
     # Relationships
-    # user = relationship("User", back_populates="notifications")
\ No newline at end of file
+    # user = relationship("User", back_populates="notifications")
+
+
+# Catch-all partition so inserts never fail before the monthly partition exists
+event.listen(
+    Notification.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS notifications_default PARTITION OF notifications DEFAULT")
+)
\ No newline at end of file
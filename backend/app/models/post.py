@@ -1,8 +1,7 @@
-from sqlalchemy import Column, String, Text, Boolean, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, Integer, DateTime, ForeignKey, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
 
@@ -10,7 +9,7 @@ from app.db.session import Base
 class Post(Base):
     __tablename__ = "posts"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
@@ -20,9 +19,28 @@ class Post(Base):
     empathy_count = Column(Integer, default=0)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Listing: public (or category) posts newest first, covering the list columns;
+    # trigram indexes: title/content ILIKE '%q%' search and similarity() ranking
+    __table_args__ = (
+        Index(
+            'ix_posts_listing', is_private, category, created_at.desc(), id.desc(),
+            postgresql_include=['title', 'empathy_count', 'user_id']
+        ),
+        Index('ix_posts_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        Index('ix_posts_content_trgm', 'content', postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'}),
+    )
+    
     # Relationships
     author = relationship("User", back_populates="posts")
-    reports = relationship("Report", back_populates="post")
\ No newline at end of file
+    reports = relationship("Report", back_populates="post")
+
+
+# pg_trgm provides the gin_trgm_ops operator class used by the search indexes
+event.listen(
+    Post.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, DDL, event
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+from app.models.emoji_reaction import EmojiReaction
+
+
+class PostEmojiCount(Base):
+    """
+    Running reaction count per (post, emoji), so reading a post's reactions
+    is a primary-key lookup instead of a GROUP BY over emoji_reactions.
+    Maintained by a trigger on emoji_reactions; never written by the app.
+    """
+    __tablename__ = "post_emoji_counts"
+
+    post_id = Column(UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    emoji = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# Move one count per reaction insert, delete, or emoji change
+event.listen(
+    EmojiReaction.__table__,
+    "after_create",
+    DDL("""
+        CREATE OR REPLACE FUNCTION emoji_reactions_update_counts() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO post_emoji_counts (post_id, emoji, count)
+                VALUES (NEW.post_id, NEW.emoji, 1)
+                ON CONFLICT (post_id, emoji) DO UPDATE SET count = post_emoji_counts.count + 1;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE post_emoji_counts SET count = count - 1
+                WHERE post_id = OLD.post_id AND emoji = OLD.emoji;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER emoji_reactions_counts_trg
+        AFTER INSERT OR DELETE OR UPDATE OF emoji ON emoji_reactions
+        FOR EACH ROW EXECUTE FUNCTION emoji_reactions_update_counts();
+    """)
+)
@@ -1,8 +1,7 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, LargeBinary, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
 
@@ -10,9 +9,9 @@ from app.db.session import Base
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    token_hash = Column(String, nullable=False, unique=True, index=True)
+    token_hash = Column(LargeBinary(32), nullable=False, unique=True)  # raw SHA-256 digest
     is_active = Column(Boolean, default=True)
     
     # Timestamps
@@ -24,5 +23,10 @@ class RefreshToken(Base):
     user_agent = Column(Text, nullable=True)
     ip_address = Column(String, nullable=True)
     
+    # Only active tokens are ever looked up per user
+    __table_args__ = (
+        Index('ix_refresh_tokens_active', 'user_id', postgresql_where=text('is_active')),
+    )
+    
     # Relationships
     # user = relationship("User", back_populates="refresh_tokens")
\ No newline at end of file
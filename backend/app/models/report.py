@@ -1,9 +1,9 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Boolean, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.db.session import Base
-import uuid
-from datetime import datetime
+from app.db.enums import REPORT_STATUS
 
 
 class Report(Base):
@@ -12,7 +12,7 @@ class Report(Base):
     """
     __tablename__ = "reports"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     
     # Reporter information
     reporter_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
@@ -27,14 +27,14 @@ class Report(Base):
     details = Column(Text, nullable=True)  # Additional details
     
     # Report status and resolution
-    status = Column(String(20), nullable=False, default='pending')  # 'pending', 'resolved', 'dismissed'
+    status = Column(REPORT_STATUS, nullable=False, default='pending')  # 'pending', 'resolved', 'dismissed'
     resolved_at = Column(DateTime, nullable=True)
     resolved_by = Column(UUID(as_uuid=True), ForeignKey('staff.id'), nullable=True)
     resolution = Column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=True, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=True, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     reporter = relationship("User", foreign_keys=[reporter_id])
@@ -1,21 +1,21 @@
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-import uuid
 
 from app.db.session import Base
+from app.db.enums import STAFF_ROLE
 
 
 class Staff(Base):
     __tablename__ = "staff"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     phone = Column(String, nullable=True)
-    role = Column(String, nullable=False)  # 'counselor', 'admin', 'moderator', 'support'
+    role = Column(STAFF_ROLE, nullable=False)  # 'counselor', 'admin', 'moderator', 'support'
     department = Column(String, nullable=True)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
@@ -26,6 +26,11 @@ class Staff(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Role lookups (e.g. active counselors) only ever target active staff
+    __table_args__ = (
+        Index('ix_staff_active_role', 'role', postgresql_where=text('is_active')),
+    )
+    
     # Relationships
     audit_logs = relationship("AuditLog", back_populates="staff")
     counselor_profile = relationship("CounselorProfile", back_populates="staff", uselist=False)
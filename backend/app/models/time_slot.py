@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Date, Time, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Date, Time, Integer, SmallInteger, Index, DDL, event, text
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
-import uuid
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
+from sqlalchemy.sql import func
 
 from app.db.session import Base
 
@@ -13,7 +13,7 @@ class TimeSlot(Base):
     """
     __tablename__ = "time_slots"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     counselor_id = Column(UUID(as_uuid=True), ForeignKey("staff.id"), nullable=False)
     date = Column(Date, nullable=False)
     start_time = Column(Time, nullable=False)
@@ -24,14 +24,43 @@ class TimeSlot(Base):
     # Auto-generated slots have this set to the schedule rule that created them
     generated_from_schedule_id = Column(UUID(as_uuid=True), ForeignKey("counselor_schedules.id"), nullable=True)
     
-    created_at = Column(DateTime, nullable=False)
-    updated_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=True, onupdate=func.now())
     
     # Relationships
     counselor = relationship("Staff", back_populates="time_slots")
     generated_from_schedule = relationship("CounselorSchedule", back_populates="generated_slots")
     chat_session = relationship("ChatSession", back_populates="time_slot", uselist=False)
 
+    __table_args__ = (
+        # Bookable slots per counselor and date, already in start_time order
+        Index(
+            'ix_time_slots_available', 'counselor_id', 'date', 'start_time',
+            postgresql_include=['end_time'],
+            postgresql_where=text('is_available AND NOT is_booked')
+        ),
+        # Date-range listing ordered by (date, start_time)
+        Index(
+            'ix_time_slots_counselor_date_start', 'counselor_id', 'date', 'start_time',
+            postgresql_include=['end_time', 'is_available', 'is_booked']
+        ),
+        # A counselor's slots never overlap; enforced by a GiST probe instead of a pre-insert SELECT
+        ExcludeConstraint(
+            (counselor_id, '='),
+            (func.tsrange(date + start_time, date + end_time), '&&'),
+            name='ex_time_slots_no_overlap',
+            using='gist'
+        ),
+    )
+
+
+# btree_gist provides the GiST `=` operator class for counselor_id in ex_time_slots_no_overlap
+event.listen(
+    TimeSlot.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist")
+)
+
 
 class CounselorSchedule(Base):
     """
@@ -40,15 +69,15 @@ class CounselorSchedule(Base):
     """
     __tablename__ = "counselor_schedules"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     counselor_id = Column(UUID(as_uuid=True), ForeignKey("staff.id"), nullable=False)
     
     # Schedule rule details
     name = Column(String(100), nullable=False)  # e.g., "Weekly Morning Sessions"
     description = Column(String(500), nullable=True)
     
-    # Days of week (0=Monday, 6=Sunday) - stored as comma-separated string
-    days_of_week = Column(String(20), nullable=False)  # e.g., "0,1,2,3,4" for weekdays
+    # Days of week as a bitmask, bit i set for weekday i (0=Monday, 6=Sunday)
+    days_of_week = Column(SmallInteger, nullable=False)  # e.g., 0b0011111 for weekdays
     
     # Time range for each day
     start_time = Column(Time, nullable=False)
@@ -68,8 +97,8 @@ class CounselorSchedule(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     
     # details
-    created_at = Column(DateTime, nullable=False)
-    updated_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=True, onupdate=func.now())
     created_by = Column(UUID(as_uuid=True), ForeignKey("staff.id"), nullable=False)
     
     # Relationships
@@ -78,6 +107,19 @@ class CounselorSchedule(Base):
     generated_slots = relationship("TimeSlot", back_populates="generated_from_schedule")
     unavailabilities = relationship("CounselorUnavailability", back_populates="schedule")
 
+    # "Which active schedules run on day N" is days_of_week & (1 << N) != 0
+    __table_args__ = (
+        Index(
+            'ix_schedules_active_days', 'counselor_id', 'days_of_week',
+            postgresql_where=text('is_active')
+        ),
+        # Daily slot generation: active schedules whose validity window covers a date
+        Index(
+            'ix_schedules_active_window', 'effective_from', 'effective_until',
+            postgresql_where=text('is_active')
+        ),
+    )
+
 
 class CounselorUnavailability(Base):
     """
@@ -86,7 +128,7 @@ class CounselorUnavailability(Base):
     """
     __tablename__ = "counselor_unavailabilities"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     counselor_id = Column(UUID(as_uuid=True), ForeignKey("staff.id"), nullable=False)
     schedule_id = Column(UUID(as_uuid=True), ForeignKey("counselor_schedules.id"), nullable=True)
     
@@ -101,8 +143,8 @@ class CounselorUnavailability(Base):
     notes = Column(String(500), nullable=True)
     
     # details
-    created_at = Column(DateTime, nullable=False)
-    updated_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=True, onupdate=func.now())
     created_by = Column(UUID(as_uuid=True), ForeignKey("staff.id"), nullable=False)
     
     # Relationships
@@ -1,21 +1,21 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
+from app.db.enums import GENDER
 
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     email = Column(String, unique=True, index=True, nullable=False)
     nickname = Column(String, unique=True, nullable=False)
     profile_image = Column(String, nullable=True)
     birth_year = Column(Integer, nullable=True)
-    gender = Column(String, nullable=True)  # 'male', 'female', 'other'
+    gender = Column(GENDER, nullable=True)  # 'male', 'female', 'other'
     is_active = Column(Boolean, default=True)
     
     # SNS OAuth fields
@@ -25,7 +25,7 @@ class User(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    last_login = Column(DateTime(timezone=True), nullable=True)
+    last_login = Column(DateTime(timezone=True), nullable=True, index=True)
     
     # Relationships
     posts = relationship("Post", back_populates="user")
@@ -1,8 +1,7 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, JSON, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, JSON, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
 
 from app.db.session import Base
 
@@ -10,7 +9,7 @@ from app.db.session import Base
 class UserConsent(Base):
     __tablename__ = "user_consents"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text('gen_random_uuid()'))
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     consent_type = Column(String, nullable=False)  # 'counselor_history_access'
     consent_granted = Column(Boolean, default=False)
@@ -1,8 +1,7 @@
 from .user import User, UserCreate, UserUpdate, UserInDB
 from .post import Post, PostCreate, PostUpdate, PostInDB
 from .diary import Diary, DiaryCreate, DiaryUpdate, DiaryInDB
-from .chat_session import ChatSession, ChatSessionCreate, ChatSessionUpdate
-from .message import Message, MessageCreate
+from .chat import ChatSession, ChatSessionCreate, ChatSessionUpdate, Message, MessageCreate
 from .counselor import Counselor, CounselorProfile
 from .notification import Notification, NotificationCreate
 from .auth import Token, TokenData, SNSLoginRequest, OnboardingRequest, AuthTokens, RefreshTokenRequest, AccountDeletionRequest
@@ -1,7 +1,10 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
+from datetime import datetime
 import uuid
 
+from app.schemas.base import ResponseBase
+
 
 class Token(BaseModel):
     access_token: str
@@ -36,9 +39,21 @@ class SNSProfile(BaseModel):
     profile_image: Optional[str] = None
 
 
-class LoginResponse(BaseModel):
+class UserSummary(BaseModel):
+    id: uuid.UUID
+    email: str
+    nickname: str
+    profile_image: Optional[str] = None
+    is_active: bool
+    created_at: datetime
+    last_login: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LoginResponse(ResponseBase):
     is_new_user: bool
-    user: Optional[dict] = None
+    user: Optional[UserSummary] = None
     tokens: Optional[Token] = None
     sns_profile: Optional[SNSProfile] = None
 
@@ -59,7 +74,7 @@ class AccountDeletionRequest(BaseModel):
     reason: Optional[str] = None
 
 
-class AccountDeletionResponse(BaseModel):
+class AccountDeletionResponse(ResponseBase):
     message: str
     deleted_at: str
     data_retention_info: dict
\ No newline at end of file
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class ResponseBase(BaseModel):
+    """
+    Base for read-side response models.
+    to_json() serializes straight to bytes (same output as FastAPI's own
+    response encoding, None fields included), so routes can hand the result
+    to Response without a second encode pass.
+    Instances are built from trusted ORM rows and never mutated, so they are
+    frozen and never revalidated when passed into another model.
+    """
+    model_config = ConfigDict(
+        from_attributes=True,
+        extra='ignore',
+        revalidate_instances='never',
+        frozen=True
+    )
+
+    def to_json(self) -> bytes:
+        return self.__pydantic_serializer__.to_json(self, by_alias=True)
@@ -1,8 +1,10 @@
-from pydantic import BaseModel
-from typing import Optional, List
-from datetime import date, time, datetime
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Optional, List, Literal
+from datetime import date, time, datetime, timezone
 import uuid
 
+from app.schemas.base import ResponseBase
+
 
 class ChatSessionBase(BaseModel):
     id: uuid.UUID
@@ -24,22 +26,21 @@ class ChatSessionBase(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class ChatSession(ChatSessionBase):
+class ChatSession(ChatSessionBase, ResponseBase):
     pass
 
 
 class ChatSessionCreate(BaseModel):
-    counselor_id: str
+    counselor_id: uuid.UUID
     scheduled_date: date
     start_time: time
     end_time: time
     concern_category: str
     description: str
-    time_slot_id: Optional[str] = None
+    time_slot_id: Optional[uuid.UUID] = None
 
 
 class ChatSessionUpdate(BaseModel):
@@ -49,12 +50,12 @@ class ChatSessionUpdate(BaseModel):
 
 
 class ChatSessionBookingResponse(BaseModel):
-    session_id: str
+    session_id: uuid.UUID
     status: str
     message: str
 
 
-class MessageBase(BaseModel):
+class Message(BaseModel):
     id: uuid.UUID
     session_id: uuid.UUID
     sender_id: uuid.UUID
@@ -63,12 +64,7 @@ class MessageBase(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
-
-
-class Message(MessageBase):
-    pass
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MessageCreate(BaseModel):
@@ -76,9 +72,9 @@ class MessageCreate(BaseModel):
 
 
 class MessageResponse(BaseModel):
-    id: str
-    session_id: str
-    sender_id: str
+    id: uuid.UUID
+    session_id: uuid.UUID
+    sender_id: uuid.UUID
     sender_type: str
     content: str
     created_at: datetime
@@ -86,25 +82,35 @@ class MessageResponse(BaseModel):
 
 class ChatSessionsList(BaseModel):
     items: List[ChatSession]
-    total: int
-    skip: int
+    next_cursor: Optional[str] = None
     limit: int
 
+# Built once at import; list endpoints serialize items straight to JSON with it
+chat_session_list_adapter = TypeAdapter(List[ChatSession])
+
+
+# Server -> client event tags
+WebSocketEventType = Literal[
+    "session_info", "new_message", "user_joined", "user_left",
+    "typing_indicator", "session_started", "session_ended", "error"
+]
+
 
 class WebSocketMessage(BaseModel):
-    type: str  # "message", "user_joined", "user_left", "session_started", "session_ended"
+    type: WebSocketEventType
     data: dict
-    timestamp: datetime = None
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
 
-    def __init__(self, **data):
-        if data.get('timestamp') is None:
-            data['timestamp'] = datetime.utcnow()
-        super().__init__(**data)
+class ParticipantInfo(BaseModel):
+    user_id: str
+    user_type: str  # "user" or "counselor"
+    connected_at: datetime
 
 
 class ChatRoomInfo(BaseModel):
     session_id: str
     status: str
-    participants: List[dict]
+    participants: List[ParticipantInfo]
     message_count: int
     started_at: Optional[datetime] = None
\ No newline at end of file
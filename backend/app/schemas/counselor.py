@@ -1,8 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, TypeAdapter
 from typing import Optional, List, Dict, Any
+from typing_extensions import Annotated, TypedDict
 from datetime import date, time, datetime
+from operator import attrgetter
 import uuid
 
+from app.schemas.base import ResponseBase
+from app.db.weekdays import mask_to_days
+
 # --- Staff 관련 스키마 ---
 class StaffBase(BaseModel):
     id: uuid.UUID
@@ -14,11 +19,10 @@ class StaffBase(BaseModel):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # --- CounselorProfile 관련 스키마 ---
-class CounselorProfile(BaseModel):
+class CounselorProfile(ResponseBase):
     id: uuid.UUID
     staff_id: uuid.UUID
     specialties: List[str]
@@ -28,6 +32,7 @@ class CounselorProfile(BaseModel):
     introduction: Optional[str] = None
     profile_image: Optional[str] = None
     rating: float
+    review_count: int = 0
     total_sessions: int
     is_available: bool
     working_hours: Optional[Dict[str, Any]] = None
@@ -36,8 +41,7 @@ class CounselorProfile(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class CounselorProfileCreate(BaseModel):
     specialties: List[str]
@@ -47,32 +51,93 @@ class CounselorProfileCreate(BaseModel):
     introduction: str
     working_hours: Optional[str] = None
 
+# ORM -> DTO: fetch every declared field with a single attrgetter call per row
+_STAFF_FIELDS = tuple(StaffBase.model_fields)
+_PROFILE_FIELDS = tuple(CounselorProfile.model_fields)
+_staff_get = attrgetter(*_STAFF_FIELDS)
+_profile_get = attrgetter(*_PROFILE_FIELDS)
+
 # --- Counselor 관련 스키마 ---
-class Counselor(BaseModel):
+class Counselor(ResponseBase):
     staff: StaffBase
     counselor_profile: CounselorProfile
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_orm(cls, obj):
+        # obj is a Staff row with counselor_profile loaded; ORM data is trusted,
+        # so build the nested models without re-running validation per item
+        return cls.model_construct(
+            staff=StaffBase.model_construct(
+                **dict(zip(_STAFF_FIELDS, _staff_get(obj)))
+            ),
+            counselor_profile=CounselorProfile.model_construct(
+                **dict(zip(_PROFILE_FIELDS, _profile_get(obj.counselor_profile)))
+            )
+        )
 
 class CounselorsList(BaseModel):
     items: List[Counselor]
-    total: int
+    has_more: bool
     skip: int
     limit: int
 
+# --- 목록 응답 전용 TypedDict (읽기 전용, BaseModel 생성 비용 없이 직렬화) ---
+class StaffTD(TypedDict):
+    id: uuid.UUID
+    name: str
+    email: str
+    phone: Optional[str]
+    role: str
+    department: Optional[str]
+    is_active: bool
+    created_at: datetime
+
+class CounselorProfileTD(TypedDict):
+    id: uuid.UUID
+    staff_id: uuid.UUID
+    specialties: List[str]
+    license_number: str
+    experience_years: int
+    education: str
+    introduction: Optional[str]
+    profile_image: Optional[str]
+    rating: float
+    review_count: int
+    total_sessions: int
+    is_available: bool
+    working_hours: Optional[Dict[str, Any]]
+    languages: Optional[List[str]]
+    session_types: Optional[List[str]]
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+class CounselorTD(TypedDict):
+    staff: StaffTD
+    counselor_profile: CounselorProfileTD
+
+def counselor_td(obj) -> CounselorTD:
+    """Build a list item from a Staff row with counselor_profile loaded."""
+    return {
+        "staff": dict(zip(_STAFF_FIELDS, _staff_get(obj))),
+        "counselor_profile": dict(zip(_PROFILE_FIELDS, _profile_get(obj.counselor_profile)))
+    }
+
+# Built once at import; the list endpoint serializes items straight to JSON with it
+counselor_list_adapter = TypeAdapter(List[CounselorTD])
+
 # --- [추가] 아래 클래스가 누락되었습니다 ---
 # API 응답을 위한 스키마입니다. staff 정보와 counselor_profile 정보를 포함합니다.
 class CounselorProfileResponse(BaseModel):
     staff: StaffBase
     counselor_profile: CounselorProfile
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- TimeSlot (상담 시간) 관련 스키마 ---
-class TimeSlotBase(BaseModel):
+class TimeSlot(BaseModel):
     id: uuid.UUID
     counselor_id: uuid.UUID
     date: date
@@ -82,11 +147,7 @@ class TimeSlotBase(BaseModel):
     is_booked: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
-class TimeSlot(TimeSlotBase):
-    pass
+    model_config = ConfigDict(from_attributes=True)
 
 class TimeSlotCreate(BaseModel):
     date: date
@@ -94,9 +155,12 @@ class TimeSlotCreate(BaseModel):
     end_time: time
     is_available: bool = True
 
+# "HH:MM", 24-hour clock; matched by pydantic-core's regex engine
+HHMM = Annotated[str, Field(pattern=r"^([01]\d|2[0-3]):[0-5]\d$")]
+
 class TimeRange(BaseModel):
-    start_time: str
-    end_time: str
+    start_time: HHMM
+    end_time: HHMM
 
 class TimeSlotBulkCreate(BaseModel):
     start_date: date
@@ -110,12 +174,17 @@ class CounselorAvailableSlots(BaseModel):
     available_slots: List[TimeSlot]
 
 # --- CounselorSchedule (상담사 스케줄) 관련 스키마 ---
-class CounselorScheduleBase(BaseModel):
+# Stored as a weekday bitmask, exposed as a list of weekday numbers
+WeekdayList = Annotated[
+    List[int], BeforeValidator(lambda v: mask_to_days(v) if isinstance(v, int) else v)
+]
+
+class CounselorSchedule(BaseModel):
     id: uuid.UUID
     counselor_id: uuid.UUID
     name: str
     description: Optional[str] = None
-    days_of_week: str
+    days_of_week: WeekdayList
     start_time: time
     end_time: time
     session_duration_minutes: int
@@ -125,11 +194,7 @@ class CounselorScheduleBase(BaseModel):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
-class CounselorSchedule(CounselorScheduleBase):
-    pass
+    model_config = ConfigDict(from_attributes=True)
 
 class CounselorScheduleCreate(BaseModel):
     name: str
@@ -143,7 +208,7 @@ class CounselorScheduleCreate(BaseModel):
     effective_until: Optional[date] = None
 
 # --- CounselorUnavailability (상담 불가 시간) 관련 스키마 ---
-class CounselorUnavailabilityBase(BaseModel):
+class CounselorUnavailability(BaseModel):
     id: uuid.UUID
     counselor_id: uuid.UUID
     start_date: date
@@ -154,11 +219,7 @@ class CounselorUnavailabilityBase(BaseModel):
     notes: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
-class CounselorUnavailability(CounselorUnavailabilityBase):
-    pass
+    model_config = ConfigDict(from_attributes=True)
 
 class CounselorUnavailabilityCreate(BaseModel):
     start_date: date
@@ -169,7 +230,7 @@ class CounselorUnavailabilityCreate(BaseModel):
     notes: Optional[str] = None
 
 # --- CounselorReview (상담사 리뷰) 관련 스키마 ---
-class CounselorReviewFields(BaseModel):
+class CounselorReviewCreate(BaseModel):
     rating: int
     review_text: Optional[str] = None
     communication_rating: Optional[int] = None
@@ -177,16 +238,18 @@ class CounselorReviewFields(BaseModel):
     professionalism_rating: Optional[int] = None
     is_anonymous: bool = False
 
-class CounselorReviewCreate(CounselorReviewFields):
-    pass
-
-class CounselorReview(CounselorReviewFields):
+class CounselorReview(BaseModel):
     id: uuid.UUID
     counselor_profile_id: uuid.UUID
     user_id: uuid.UUID
     session_id: uuid.UUID
+    rating: int
+    review_text: Optional[str] = None
+    communication_rating: Optional[int] = None
+    helpfulness_rating: Optional[int] = None
+    professionalism_rating: Optional[int] = None
+    is_anonymous: bool = False
     is_approved: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
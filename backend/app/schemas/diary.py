@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any
 from datetime import datetime
 import uuid
 
+from app.schemas.base import ResponseBase
+
 
 class DiaryBase(BaseModel):
     title: str
@@ -20,25 +22,23 @@ class DiaryUpdate(BaseModel):
     mood: Optional[str] = None
 
 
-class DiaryInDB(DiaryBase):
+class Diary(DiaryBase, ResponseBase):
     id: uuid.UUID
     user_id: uuid.UUID
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class Diary(DiaryInDB):
-    pass
+DiaryInDB = Diary
 
 
-class DiaryStatistics(BaseModel):
+class DiaryStatistics(ResponseBase):
     year: int
     month: int
     total_entries: int
     mood_distribution: Dict[str, int]
-    most_active_day: Optional[int] = None
+    most_active_day: Optional[str] = None  # YYYY-MM-DD
     writing_streak: int
     average_length: float
\ No newline at end of file
@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any
 from datetime import datetime
 import uuid
 
+from app.schemas.base import ResponseBase
+
 
 class NotificationBase(BaseModel):
     type: str
@@ -15,12 +17,13 @@ class NotificationCreate(NotificationBase):
     user_id: uuid.UUID
 
 
-class Notification(NotificationBase):
+class Notification(NotificationBase, ResponseBase):
+    # Read path: JSONB from the DB is trusted, skip the per-key dict validation
+    data: Optional[Any] = None
     id: uuid.UUID
     user_id: uuid.UUID
     is_read: bool
     created_at: datetime
     read_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
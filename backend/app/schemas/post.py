@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 import uuid
 
+from app.schemas.base import ResponseBase
+
 
 class PostBase(BaseModel):
     title: str
@@ -30,11 +32,10 @@ class PostInDB(PostBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class Post(PostInDB):
+class Post(PostInDB, ResponseBase):
     is_empathized: bool = False
     emoji_reactions: list = []
     author: dict = {}
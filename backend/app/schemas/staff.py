@@ -2,12 +2,20 @@
 Pydantic schemas for staff authentication and management
 """
 
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, EmailStr, StringConstraints, TypeAdapter
+from typing import Optional, List, Any
+from typing_extensions import Annotated
 from datetime import datetime
 from enum import Enum
 import uuid
 
+from app.schemas.base import ResponseBase
+
+
+# Constraints run inside pydantic-core, no Python validator callback per field
+StaffName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=2)]
+Password = Annotated[str, StringConstraints(min_length=8)]
+
 
 class StaffRole(str, Enum):
     ADMIN = "admin"
@@ -22,15 +30,6 @@ class StaffLogin(BaseModel):
     password: str
 
 
-class StaffLoginResponse(BaseModel):
-    """Schema for staff login response"""
-    access_token: str
-    refresh_token: str
-    token_type: str = "bearer"
-    expires_in: int
-    staff: 'StaffInfo'
-
-
 class StaffInfo(BaseModel):
     """Basic staff information"""
     id: uuid.UUID
@@ -43,45 +42,35 @@ class StaffInfo(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StaffLoginResponse(BaseModel):
+    """Schema for staff login response"""
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+    staff: StaffInfo
 
 
 class StaffCreate(BaseModel):
     """Schema for creating new staff"""
-    name: str
+    name: StaffName
     email: EmailStr
     phone: Optional[str]
     role: StaffRole
     department: Optional[str]
-    password: str
-    
-    @validator('name')
-    def validate_name(cls, v):
-        if len(v.strip()) < 2:
-            raise ValueError('Name must be at least 2 characters')
-        return v.strip()
-    
-    @validator('password')
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters')
-        return v
+    password: Password
 
 
 class StaffUpdate(BaseModel):
     """Schema for updating staff information"""
-    name: Optional[str]
+    name: Optional[StaffName]
     email: Optional[EmailStr]
     phone: Optional[str]
     department: Optional[str]
     is_active: Optional[bool]
-    
-    @validator('name')
-    def validate_name(cls, v):
-        if v and len(v.strip()) < 2:
-            raise ValueError('Name must be at least 2 characters')
-        return v.strip() if v else v
 
 
 class StaffRoleUpdate(BaseModel):
@@ -92,13 +81,7 @@ class StaffRoleUpdate(BaseModel):
 class StaffPasswordChange(BaseModel):
     """Schema for changing staff password"""
     current_password: str
-    new_password: str
-    
-    @validator('new_password')
-    def validate_new_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters')
-        return v
+    new_password: Password
 
 
 class StaffPasswordReset(BaseModel):
@@ -109,16 +92,10 @@ class StaffPasswordReset(BaseModel):
 class StaffPasswordResetConfirm(BaseModel):
     """Schema for password reset confirmation"""
     token: str
-    new_password: str
-    
-    @validator('new_password')
-    def validate_new_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters')
-        return v
+    new_password: Password
 
 
-class AuditLogResponse(BaseModel):
+class AuditLogResponse(ResponseBase):
     """Schema for audit log response"""
     id: uuid.UUID
     staff_id: uuid.UUID
@@ -130,7 +107,7 @@ class AuditLogResponse(BaseModel):
     target_type: Optional[str]
     target_id: Optional[str]
     target_name: Optional[str]
-    details: Optional[Dict[str, Any]]
+    details: Optional[Any]  # trusted JSONB from the DB, passed through unvalidated
     ip_address: Optional[str]
     user_agent: Optional[str]
     request_id: Optional[str]
@@ -138,8 +115,7 @@ class AuditLogResponse(BaseModel):
     error_message: Optional[str]
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DashboardStats(BaseModel):
@@ -186,7 +162,7 @@ class PostStatsResponse(BaseModel):
     average_empathy_count: float
 
 
-class ReportSummary(BaseModel):
+class ReportSummary(ResponseBase):
     """Schema for report summary"""
     id: uuid.UUID
     post_id: uuid.UUID
@@ -196,9 +172,8 @@ class ReportSummary(BaseModel):
     status: str
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-# Update forward references
-StaffLoginResponse.model_rebuild()
\ No newline at end of file
+# Built once at import; the admin audit log list serializes rows straight to JSON with it
+audit_log_list_adapter = TypeAdapter(List[AuditLogResponse])
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
 from datetime import datetime
 import uuid
@@ -23,7 +23,9 @@ class UserUpdate(BaseModel):
     gender: Optional[str] = None
 
 
-class UserInDB(UserBase):
+class User(UserBase):
+    # Read model: the stored address was validated on write, skip email-validator here
+    email: str
     id: uuid.UUID
     profile_image: Optional[str] = None
     is_active: bool
@@ -31,9 +33,7 @@ class UserInDB(UserBase):
     created_at: datetime
     last_login: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class User(UserInDB):
-    pass
\ No newline at end of file
+UserInDB = User
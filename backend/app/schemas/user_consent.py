@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, Dict, Any
 from datetime import datetime
 import uuid
@@ -15,13 +15,14 @@ class UserConsentCreate(UserConsentBase):
 
 
 class UserConsentResponse(UserConsentBase):
+    # Read path: JSONB from the DB is trusted, skip the per-key dict validation
+    consent_details: Optional[Any] = None
     consent_id: uuid.UUID
     granted_at: datetime
     expires_at: Optional[datetime] = None
     can_revoke: bool = True
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserConsentHistory(BaseModel):
@@ -33,8 +34,7 @@ class UserConsentHistory(BaseModel):
     last_accessed: Optional[datetime] = None
     access_count: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserConsentsResponse(BaseModel):
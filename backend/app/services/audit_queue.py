@@ -0,0 +1,67 @@
+"""
+Background writer for audit log rows
+
+Audit rows are queued on the DB session and written by a worker thread in
+one INSERT once the business transaction commits, so they never add a
+statement (or a commit) to the request's critical path.
+"""
+
+from sqlalchemy.orm import Session
+from typing import Dict, Any, List
+from datetime import datetime
+import uuid
+
+from app.db.after_commit import AfterCommitWriter
+from app.models.audit_log import AuditLog, AuditAction, AuditSeverity
+
+# A single worker keeps audit rows in commit order
+_audit_writer = AfterCommitWriter(AuditLog, "audit_logs", max_workers=1)
+
+
+def audit_log_row(
+    staff_id: uuid.UUID,
+    staff_name: str,
+    staff_role: str,
+    action: AuditAction,
+    action_description: str,
+    severity: AuditSeverity = AuditSeverity.MEDIUM,
+    target_type: str = None,
+    target_id: str = None,
+    target_name: str = None,
+    details: Dict[str, Any] = None,
+    ip_address: str = None,
+    user_agent: str = None,
+    request_id: str = None,
+    success: str = "success",
+    error_message: str = None,
+) -> Dict[str, Any]:
+    """Build an audit_logs row; created_at is the time of the action, not of the write"""
+    return {
+        "id": uuid.uuid4(),
+        "staff_id": staff_id,
+        "staff_name": staff_name,
+        "staff_role": staff_role,
+        "action": action,
+        "action_description": action_description,
+        "severity": severity,
+        "target_type": target_type,
+        "target_id": target_id,
+        "target_name": target_name,
+        "details": details,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "request_id": request_id,
+        "success": success,
+        "error_message": error_message,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def queue_audit_log(db: Session, row: Dict[str, Any]) -> None:
+    """Queue a row; it is written in the background once db's transaction commits"""
+    _audit_writer.queue(db, row)
+
+
+def submit_audit_logs(rows: List[Dict[str, Any]]) -> None:
+    """Write rows in the background regardless of any transaction outcome"""
+    _audit_writer.submit(rows)
@@ -1,89 +1,112 @@
 from typing import List, Optional, Tuple
 from datetime import date, time, datetime, timedelta
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy.orm import Session, joinedload, raiseload, load_only
+from sqlalchemy import DateTime, Integer, literal, and_, or_, func, desc, cast, select, update
+from uuid import UUID
 
 from app.models.chat_session import ChatSession
 from app.models.message import Message
 from app.models.user import User
 from app.models.staff import Staff
+from app.models.counselor_profile import CounselorProfile
 from app.models.time_slot import TimeSlot
 from app.schemas.chat import ChatSessionCreate, MessageCreate
 from app.services.counselor_service import CounselorService
 from app.services.notification_service import NotificationService
+from app.services.scheduler_service import scheduler_service
+from app.core.pagination import keyset_page
+
+# Keyset for session listings: (scheduled_date, scheduled_start_time, id)
+SessionCursor = Tuple[date, time, UUID]
+_SESSION_KEY = (ChatSession.scheduled_date, ChatSession.scheduled_start_time, ChatSession.id)
+
+# Columns read by the list item schema (ChatSessionBase); list pages load no
+# relationships, the detail path eager-loads participants and the time slot
+_SESSION_LIST_COLUMNS = (
+    ChatSession.id,
+    ChatSession.user_id,
+    ChatSession.counselor_id,
+    ChatSession.time_slot_id,
+    ChatSession.status,
+    ChatSession.scheduled_date,
+    ChatSession.scheduled_start_time,
+    ChatSession.scheduled_end_time,
+    ChatSession.actual_start_time,
+    ChatSession.actual_end_time,
+    ChatSession.duration,
+    ChatSession.category,
+    ChatSession.description,
+    ChatSession.counselor_notes,
+    ChatSession.user_feedback,
+    ChatSession.rating,
+    ChatSession.created_at,
+    ChatSession.updated_at,
+)
 
 
 class ChatService:
     def __init__(self, db: Session):
         self.db = db
         self.counselor_service = CounselorService(db)
-        self.notification_service = NotificationService(db)
 
     def get_user_chat_sessions(
         self,
         user_id: str,
-        skip: int = 0,
+        cursor: Optional[SessionCursor] = None,
         limit: int = 10,
         status: Optional[str] = None
-    ) -> Tuple[List[ChatSession], int]:
+    ) -> Tuple[List[ChatSession], Optional[SessionCursor]]:
         """
         Get chat sessions for a user with optional status filter.
+        Keyset-paginated: pass the returned next_cursor to fetch the following page.
         """
         query = (
             self.db.query(ChatSession)
             .filter(ChatSession.user_id == user_id)
-            .options(
-                joinedload(ChatSession.counselor).joinedload(Staff.counselor_profile),
-                joinedload(ChatSession.time_slot)
-            )
+            .options(load_only(*_SESSION_LIST_COLUMNS), raiseload('*'))
         )
 
         if status:
             query = query.filter(ChatSession.status == status)
 
-        # Order by scheduled date/time desc
-        query = query.order_by(
-            desc(ChatSession.scheduled_date),
-            desc(ChatSession.scheduled_start_time)
-        )
-
-        total = query.count()
-        sessions = query.offset(skip).limit(limit).all()
-
-        return sessions, total
+        return keyset_page(query, _SESSION_KEY, cursor, limit)
 
     def get_counselor_chat_sessions(
         self,
         counselor_id: str,
-        skip: int = 0,
+        cursor: Optional[SessionCursor] = None,
         limit: int = 10,
         status: Optional[str] = None
-    ) -> Tuple[List[ChatSession], int]:
+    ) -> Tuple[List[ChatSession], Optional[SessionCursor]]:
         """
         Get chat sessions for a counselor with optional status filter.
+        Keyset-paginated: pass the returned next_cursor to fetch the following page.
         """
         query = (
             self.db.query(ChatSession)
             .filter(ChatSession.counselor_id == counselor_id)
-            .options(
-                joinedload(ChatSession.user),
-                joinedload(ChatSession.time_slot)
-            )
+            .options(load_only(*_SESSION_LIST_COLUMNS), raiseload('*'))
         )
 
         if status:
             query = query.filter(ChatSession.status == status)
 
-        # Order by scheduled date/time desc
-        query = query.order_by(
-            desc(ChatSession.scheduled_date),
-            desc(ChatSession.scheduled_start_time)
-        )
+        return keyset_page(query, _SESSION_KEY, cursor, limit)
 
-        total = query.count()
-        sessions = query.offset(skip).limit(limit).all()
+    def count_user_chat_sessions(
+        self,
+        user_id: str,
+        status: Optional[str] = None
+    ) -> int:
+        """
+        Count a user's chat sessions. Kept off the list path; callers fetch it lazily.
+        """
+        query = self.db.query(func.count(ChatSession.id)).filter(ChatSession.user_id == user_id)
 
-        return sessions, total
+        if status:
+            query = query.filter(ChatSession.status == status)
+
+        return query.scalar()
 
     def book_chat_session(
         self,
@@ -134,46 +157,53 @@ class ChatService:
             scheduled_start_time=session_data.start_time,
             scheduled_end_time=session_data.end_time,
             category=session_data.concern_category,
-            description=session_data.description,
-            created_at=datetime.utcnow()
+            description=session_data.description
         )
 
         self.db.add(chat_session)
         self.db.flush()  # Get the ID without committing
 
-        # Book the time slot if provided
+        # Session, slot booking and notification share one transaction; nothing
+        # below commits until the single commit at the end
         if time_slot:
             try:
                 self.counselor_service.book_time_slot(
                     slot_id=str(time_slot.id),
-                    session_id=str(chat_session.id)
+                    session_id=str(chat_session.id),
+                    commit=False
                 )
             except Exception as e:
                 self.db.rollback()
                 raise ValueError(f"Failed to book time slot: {e}")
 
-        # Create booking confirmation notifications
-        try:
-            # Notification to user
-            self.notification_service.create_session_booking_notification(
-                user_id=user_id,
-                session_id=str(chat_session.id),
-                counselor_name=counselor.name,
-                scheduled_datetime=datetime.combine(
-                    session_data.scheduled_date,
-                    session_data.start_time
-                )
+        # Booking confirmation for the user; queued and written after commit,
+        # off the request path
+        NotificationService.create_session_booking_notification(
+            db=self.db,
+            user_id=user_id,
+            session_id=str(chat_session.id),
+            counselor_name=counselor.name,
+            scheduled_datetime=datetime.combine(
+                session_data.scheduled_date,
+                session_data.start_time
             )
+        )
 
-            # Notification to counselor (if they have user account)
-            # This would typically be handled by a separate staff notification system
-            
-        except Exception as e:
-            # Don't fail the booking if notification fails
-            print(f"Failed to create booking notifications: {e}")
+        # Notification to counselor (if they have user account)
+        # This would typically be handled by a separate staff notification system
 
         self.db.commit()
-        self.db.refresh(chat_session)
+
+        # One-shot reminder job 10 minutes before the start
+        scheduler_service.schedule_one_time_reminder(
+            session_id=str(chat_session.id),
+            user_id=str(user_id),
+            counselor_name=counselor.name,
+            scheduled_datetime=datetime.combine(
+                session_data.scheduled_date,
+                session_data.start_time
+            )
+        )
 
         return chat_session
 
@@ -215,6 +245,65 @@ class ChatService:
 
         return session
 
+    def _authorize_session(
+        self,
+        session_id: str,
+        user_id: Optional[str] = None,
+        counselor_id: Optional[str] = None
+    ) -> Optional[ChatSession]:
+        """
+        Access check for mutation paths: load only the columns they read,
+        with no eager joins. Participants are loaded lazily if a caller needs them.
+        """
+        # If neither user_id nor counselor_id provided, deny access
+        if not user_id and not counselor_id:
+            return None
+
+        query = (
+            self.db.query(ChatSession)
+            .filter(ChatSession.id == session_id)
+            .options(
+                load_only(
+                    ChatSession.id,
+                    ChatSession.user_id,
+                    ChatSession.counselor_id,
+                    ChatSession.status,
+                    ChatSession.time_slot_id,
+                    ChatSession.actual_start_time,
+                    ChatSession.counselor_notes
+                )
+            )
+        )
+
+        if user_id:
+            query = query.filter(ChatSession.user_id == user_id)
+
+        if counselor_id:
+            query = query.filter(ChatSession.counselor_id == counselor_id)
+
+        return query.first()
+
+    def get_session_for_principal(
+        self,
+        session_id: str,
+        principal_id: str
+    ) -> Optional[ChatSession]:
+        """
+        Get a chat session if the principal is either its user or its counselor.
+        Resolves both participant roles in a single query.
+        """
+        return (
+            self.db.query(ChatSession)
+            .filter(
+                ChatSession.id == session_id,
+                or_(
+                    ChatSession.user_id == principal_id,
+                    ChatSession.counselor_id == principal_id
+                )
+            )
+            .first()
+        )
+
     def cancel_chat_session(
         self,
         session_id: str,
@@ -225,7 +314,7 @@ class ChatService:
         """
         Cancel a chat session.
         """
-        session = self.get_chat_session_details(
+        session = self._authorize_session(
             session_id=session_id,
             user_id=user_id,
             counselor_id=counselor_id
@@ -239,7 +328,6 @@ class ChatService:
 
         # Update session status
         session.status = "cancelled"
-        session.updated_at = datetime.utcnow()
 
         # Add cancellation note if reason provided
         if cancel_reason:
@@ -255,19 +343,18 @@ class ChatService:
             except Exception as e:
                 print(f"Failed to unbook time slot: {e}")
 
-        # Create cancellation notifications
-        try:
-            cancelled_by = "user" if user_id else "counselor"
-            self.notification_service.create_session_cancellation_notification(
-                session=session,
-                cancelled_by=cancelled_by,
-                reason=cancel_reason
-            )
-        except Exception as e:
-            print(f"Failed to create cancellation notifications: {e}")
+        # Create cancellation notification (queued until commit)
+        NotificationService.create_session_cancellation_notification(
+            db=self.db,
+            user_id=str(session.user_id),
+            session_id=session_id,
+            cancelled_by="user" if user_id else "counselor",
+            reason=cancel_reason
+        )
 
         self.db.commit()
-        self.db.refresh(session)
+
+        scheduler_service.cancel_session_reminder(session_id)
 
         return session
 
@@ -280,7 +367,7 @@ class ChatService:
         Mark a chat session as started (active).
         Only counselors can start sessions.
         """
-        session = self.get_chat_session_details(
+        session = self._authorize_session(
             session_id=session_id,
             counselor_id=counselor_id
         )
@@ -293,21 +380,19 @@ class ChatService:
 
         # Update session
         session.status = "active"
+        # Python-side value: a SQL expression would be expired by the commit and
+        # reloaded on first access, after the caller's session may have closed
         session.actual_start_time = datetime.utcnow()
-        session.updated_at = datetime.utcnow()
 
-        # Create session start notification for user
-        try:
-            self.notification_service.create_session_start_notification(
-                user_id=str(session.user_id),
-                session_id=session_id,
-                counselor_name=session.counselor.name
-            )
-        except Exception as e:
-            print(f"Failed to create session start notification: {e}")
+        # Create session start notification for user (queued until commit)
+        NotificationService.create_session_start_notification(
+            db=self.db,
+            user_id=str(session.user_id),
+            session_id=session_id,
+            counselor_name=session.counselor.name
+        )
 
         self.db.commit()
-        self.db.refresh(session)
 
         return session
 
@@ -320,47 +405,65 @@ class ChatService:
         """
         Mark a chat session as completed.
         Only counselors can complete sessions.
+        Access check, duration and the status change happen in one UPDATE ... RETURNING.
         """
-        session = self.get_chat_session_details(
-            session_id=session_id,
-            counselor_id=counselor_id
-        )
-
-        if not session:
-            raise ValueError("Session not found or access denied")
+        # Bound as a parameter so the end time is a plain value on the returned row
+        utc_now = datetime.utcnow()
+        values = {
+            "status": "completed",
+            "actual_end_time": utc_now,
+            # in minutes; stays NULL if the session never recorded a start time
+            "duration": cast(
+                func.floor(func.extract('epoch', literal(utc_now, DateTime) - ChatSession.actual_start_time) / 60),
+                Integer
+            )
+        }
+        if counselor_notes:
+            values["counselor_notes"] = counselor_notes
+
+        row = self.db.execute(
+            update(ChatSession)
+            .where(
+                ChatSession.id == session_id,
+                ChatSession.counselor_id == counselor_id,
+                ChatSession.status == "active"
+            )
+            .values(**values)
+            .returning(
+                ChatSession,
+                select(Staff.name).where(Staff.id == ChatSession.counselor_id).scalar_subquery()
+            )
+        ).first()
 
-        if session.status != "active":
+        if row is None:
+            # Slow path only: work out why nothing was updated
+            session = self._authorize_session(
+                session_id=session_id,
+                counselor_id=counselor_id
+            )
+            if not session:
+                raise ValueError("Session not found or access denied")
             raise ValueError(f"Cannot complete session with status: {session.status}")
 
-        # Calculate duration
-        if session.actual_start_time:
-            duration = datetime.utcnow() - session.actual_start_time
-            session.duration = int(duration.total_seconds() / 60)  # in minutes
-
-        # Update session
-        session.status = "completed"
-        session.actual_end_time = datetime.utcnow()
-        session.updated_at = datetime.utcnow()
-
-        if counselor_notes:
-            session.counselor_notes = counselor_notes
+        session, counselor_name = row
 
         # Update counselor session count
-        counselor_profile = session.counselor.counselor_profile
-        counselor_profile.total_sessions += 1
+        self.db.execute(
+            update(CounselorProfile)
+            .where(CounselorProfile.staff_id == counselor_id)
+            .values(total_sessions=CounselorProfile.total_sessions + 1)
+        )
+        self.counselor_service.invalidate_counselor(counselor_id)
 
-        # Create session completion notification for user
-        try:
-            self.notification_service.create_session_completion_notification(
-                user_id=str(session.user_id),
-                session_id=session_id,
-                counselor_name=session.counselor.name
-            )
-        except Exception as e:
-            print(f"Failed to create session completion notification: {e}")
+        # Create session completion notification for user (queued until commit)
+        NotificationService.create_session_completion_notification(
+            db=self.db,
+            user_id=str(session.user_id),
+            session_id=session_id,
+            counselor_name=counselor_name
+        )
 
         self.db.commit()
-        self.db.refresh(session)
 
         return session
 
@@ -369,15 +472,18 @@ class ChatService:
         session_id: str,
         user_id: Optional[str] = None,
         counselor_id: Optional[str] = None,
-        skip: int = 0,
+        after_id: Optional[UUID] = None,
+        before_id: Optional[UUID] = None,
         limit: int = 50
     ) -> List[Message]:
         """
-        Get messages for a chat session.
+        Get messages for a chat session, oldest first.
+        Keyset-paginated on the time-ordered (uuid7) message id: after_id pages
+        forward, before_id pages back to older history.
         Only accessible by session participants.
         """
         # Verify access to session
-        session = self.get_chat_session_details(
+        session = self._authorize_session(
             session_id=session_id,
             user_id=user_id,
             counselor_id=counselor_id
@@ -386,16 +492,23 @@ class ChatService:
         if not session:
             raise ValueError("Session not found or access denied")
 
-        messages = (
-            self.db.query(Message)
-            .filter(Message.session_id == session_id)
-            .order_by(Message.created_at)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = self.db.query(Message).filter(Message.session_id == session_id)
+
+        if before_id:
+            # Walk backwards from before_id, then restore chronological order
+            messages = (
+                query.filter(Message.id < before_id)
+                .order_by(desc(Message.id))
+                .limit(limit)
+                .all()
+            )
+            messages.reverse()
+            return messages
+
+        if after_id:
+            query = query.filter(Message.id > after_id)
 
-        return messages
+        return query.order_by(Message.id).limit(limit).all()
 
     def send_message(
         self,
@@ -409,12 +522,12 @@ class ChatService:
         """
         # Verify session exists and sender has access
         if sender_type == "user":
-            session = self.get_chat_session_details(
+            session = self._authorize_session(
                 session_id=session_id,
                 user_id=sender_id
             )
         else:  # counselor
-            session = self.get_chat_session_details(
+            session = self._authorize_session(
                 session_id=session_id,
                 counselor_id=sender_id
             )
@@ -430,12 +543,10 @@ class ChatService:
             session_id=session_id,
             sender_id=sender_id,
             sender_type=sender_type,
-            content=message_data.content,
-            created_at=datetime.utcnow()
+            content=message_data.content
         )
 
         self.db.add(message)
         self.db.commit()
-        self.db.refresh(message)
 
         return message
\ No newline at end of file
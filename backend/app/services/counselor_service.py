@@ -1,18 +1,28 @@
 from typing import List, Optional, Tuple
-from datetime import date, time, datetime, timedelta
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func, desc
+from datetime import date, time, timedelta
+import logging
+from sqlalchemy.orm import Session, raiseload, contains_eager
+from sqlalchemy import func, desc, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.models.staff import Staff
 from app.models.counselor_profile import CounselorProfile
+from app.models.counselor_specialty import CounselorSpecialty
 from app.models.time_slot import TimeSlot, CounselorSchedule, CounselorUnavailability
+from app.db.weekdays import days_to_mask
 from app.models.chat_session import ChatSession
 from app.models.counselor_review import CounselorReview
+from app.schemas.counselor import CounselorScheduleCreate
+
+logger = logging.getLogger(__name__)
 
 
 class CounselorService:
     def __init__(self, db: Session):
         self.db = db
+        # Per-request memo for get_counselor_by_id; lives as long as this service
+        # (one request / one DB session), so staleness is bounded to that scope
+        self._counselor_cache = {}
 
     def get_available_counselors(
         self, 
@@ -20,9 +30,10 @@ class CounselorService:
         limit: int = 10,
         specialties: Optional[List[str]] = None,
         min_rating: Optional[float] = None
-    ) -> Tuple[List[Staff], int]:
+    ) -> Tuple[List[Staff], bool]:
         """
         Get list of available counselors with their profiles.
+        Returns (counselors, has_more); one extra row is fetched instead of a COUNT(*).
         """
         query = (
             self.db.query(Staff)
@@ -32,13 +43,20 @@ class CounselorService:
                 Staff.is_active == True,
                 CounselorProfile.is_available == True
             )
-            .options(joinedload(Staff.counselor_profile))
+            # The list DTO reads only staff + profile columns; nothing else may load
+            .options(contains_eager(Staff.counselor_profile).raiseload('*'), raiseload('*'))
         )
 
-        # Filter by specialties if provided
+        # Filter by specialties if provided (all of them), via the normalized lookup table
         if specialties:
-            for specialty in specialties:
-                query = query.filter(CounselorProfile.specialties.contains([specialty]))
+            wanted = set(specialties)
+            matching = (
+                select(CounselorSpecialty.counselor_id)
+                .where(CounselorSpecialty.specialty.in_(wanted))
+                .group_by(CounselorSpecialty.counselor_id)
+                .having(func.count() == len(wanted))
+            )
+            query = query.filter(Staff.id.in_(matching))
 
         # Filter by minimum rating if provided
         if min_rating:
@@ -50,16 +68,20 @@ class CounselorService:
             desc(CounselorProfile.total_sessions)
         )
 
-        total = query.count()
-        counselors = query.offset(skip).limit(limit).all()
+        counselors = query.offset(skip).limit(limit + 1).all()
 
-        return counselors, total
+        return counselors[:limit], len(counselors) > limit
 
     def get_counselor_by_id(self, counselor_id: str) -> Optional[Staff]:
         """
         Get counselor details by ID.
+        Repeated lookups for the same counselor within this service reuse the first result.
         """
-        return (
+        counselor_id = str(counselor_id)
+        if counselor_id in self._counselor_cache:
+            return self._counselor_cache[counselor_id]
+
+        counselor = (
             self.db.query(Staff)
             .join(CounselorProfile, Staff.id == CounselorProfile.staff_id)
             .filter(
@@ -68,12 +90,21 @@ class CounselorService:
                 Staff.is_active == True
             )
             .options(
-                joinedload(Staff.counselor_profile),
-                joinedload(Staff.counselor_profile).joinedload(CounselorProfile.reviews)
+                # Populate the profile from the explicit JOIN above instead of a second one
+                contains_eager(Staff.counselor_profile)
             )
             .first()
         )
 
+        if counselor:
+            self._counselor_cache[counselor_id] = counselor
+
+        return counselor
+
+    def invalidate_counselor(self, counselor_id: str) -> None:
+        """Drop a memoized counselor after its profile changes."""
+        self._counselor_cache.pop(str(counselor_id), None)
+
     def get_counselor_available_slots(
         self,
         counselor_id: str,
@@ -118,6 +149,78 @@ class CounselorService:
 
         return query.order_by(TimeSlot.date, TimeSlot.start_time).all()
 
+    def create_counselor_schedule(
+        self,
+        counselor_id: str,
+        schedule_data: CounselorScheduleCreate,
+        created_by: Optional[str] = None
+    ) -> CounselorSchedule:
+        """
+        Create a recurring schedule rule for a counselor.
+        Weekdays are stored as a bitmask (see app.db.weekdays).
+        """
+        schedule = CounselorSchedule(
+            counselor_id=counselor_id,
+            name=schedule_data.name,
+            description=schedule_data.description,
+            days_of_week=days_to_mask(schedule_data.days_of_week),
+            start_time=schedule_data.start_time,
+            end_time=schedule_data.end_time,
+            session_duration_minutes=schedule_data.session_duration_minutes,
+            break_duration_minutes=schedule_data.break_duration_minutes,
+            effective_from=schedule_data.effective_from,
+            effective_until=schedule_data.effective_until,
+            created_by=created_by or counselor_id
+        )
+
+        self.db.add(schedule)
+        self.db.commit()
+
+        return schedule
+
+    def generate_slots_for_date(self, target_date: date) -> int:
+        """
+        Generate target_date's slots for every active schedule in one
+        INSERT ... SELECT: generate_series expands each schedule's day into
+        slot starts server-side. Counselors unavailable that day are skipped;
+        slots overlapping existing ones are dropped by the exclusion constraint.
+        Returns the number of slots created.
+        """
+        result = self.db.execute(
+            text("""
+                INSERT INTO time_slots (
+                    counselor_id, date, start_time, end_time,
+                    is_available, is_booked, generated_from_schedule_id
+                )
+                SELECT
+                    s.counselor_id, CAST(:target_date AS date), slot_start::time,
+                    (slot_start + make_interval(mins => s.session_duration_minutes))::time,
+                    true, false, s.id
+                FROM counselor_schedules s
+                CROSS JOIN LATERAL generate_series(
+                    CAST(:target_date AS date) + s.start_time,
+                    CAST(:target_date AS date) + s.end_time
+                        - make_interval(mins => s.session_duration_minutes),
+                    make_interval(mins => s.session_duration_minutes + s.break_duration_minutes)
+                ) AS slot_start
+                WHERE s.is_active
+                  AND s.days_of_week & :weekday_bit <> 0
+                  AND s.effective_from <= :target_date
+                  AND (s.effective_until IS NULL OR s.effective_until >= :target_date)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM counselor_unavailabilities u
+                      WHERE u.counselor_id = s.counselor_id
+                        AND u.start_date <= :target_date
+                        AND u.end_date >= :target_date
+                  )
+                ON CONFLICT ON CONSTRAINT ex_time_slots_no_overlap DO NOTHING
+            """),
+            {"target_date": target_date, "weekday_bit": 1 << target_date.weekday()}
+        )
+        self.db.commit()
+
+        return result.rowcount
+
     def create_time_slot(
         self,
         counselor_id: str,
@@ -128,25 +231,8 @@ class CounselorService:
     ) -> TimeSlot:
         """
         Create a single time slot for a counselor.
+        Overlaps are rejected by the ex_time_slots_no_overlap exclusion constraint.
         """
-        # Check for conflicts
-        existing_slot = (
-            self.db.query(TimeSlot)
-            .filter(
-                TimeSlot.counselor_id == counselor_id,
-                TimeSlot.date == target_date,
-                or_(
-                    and_(TimeSlot.start_time <= start_time, TimeSlot.end_time > start_time),
-                    and_(TimeSlot.start_time < end_time, TimeSlot.end_time >= end_time),
-                    and_(TimeSlot.start_time >= start_time, TimeSlot.end_time <= end_time)
-                )
-            )
-            .first()
-        )
-
-        if existing_slot:
-            raise ValueError(f"Time slot conflicts with existing slot from {existing_slot.start_time} to {existing_slot.end_time}")
-
         # Check if counselor is unavailable during this time
         unavailability = (
             self.db.query(CounselorUnavailability)
@@ -166,18 +252,24 @@ class CounselorService:
             elif not unavailability.start_time and not unavailability.end_time:
                 raise ValueError(f"Counselor is unavailable all day: {unavailability.reason}")
 
-        time_slot = TimeSlot(
-            counselor_id=counselor_id,
-            date=target_date,
-            start_time=start_time,
-            end_time=end_time,
-            is_available=is_available,
-            created_at=datetime.utcnow()
-        )
+        # Check-and-insert in one statement: no race between a SELECT and the INSERT
+        time_slot = self.db.scalars(
+            pg_insert(TimeSlot)
+            .values(
+                counselor_id=counselor_id,
+                date=target_date,
+                start_time=start_time,
+                end_time=end_time,
+                is_available=is_available
+            )
+            .on_conflict_do_nothing(constraint="ex_time_slots_no_overlap")
+            .returning(TimeSlot)
+        ).first()
+
+        if time_slot is None:
+            raise ValueError("Time slot conflicts with an existing slot")
 
-        self.db.add(time_slot)
         self.db.commit()
-        self.db.refresh(time_slot)
 
         return time_slot
 
@@ -191,36 +283,88 @@ class CounselorService:
     ) -> List[TimeSlot]:
         """
         Bulk create time slots for multiple days.
+        Existing slots and unavailability for the whole range are loaded once,
+        conflicts are checked in memory, and all new slots go in one INSERT.
         """
-        if exclude_dates is None:
-            exclude_dates = []
+        excluded = set(exclude_dates or [])
+
+        # (start_time, end_time) intervals already taken, per date
+        taken = {}
+        for slot_date, slot_start, slot_end in self.db.query(
+            TimeSlot.date, TimeSlot.start_time, TimeSlot.end_time
+        ).filter(
+            TimeSlot.counselor_id == counselor_id,
+            TimeSlot.date >= start_date,
+            TimeSlot.date <= end_date
+        ):
+            taken.setdefault(slot_date, []).append((slot_start, slot_end))
+
+        unavailabilities = (
+            self.db.query(CounselorUnavailability)
+            .filter(
+                CounselorUnavailability.counselor_id == counselor_id,
+                CounselorUnavailability.start_date <= end_date,
+                CounselorUnavailability.end_date >= start_date
+            )
+            .all()
+        )
 
-        created_slots = []
+        rows = []
         current_date = start_date
 
         while current_date <= end_date:
-            if current_date not in exclude_dates:
+            if current_date not in excluded:
+                day_taken = taken.setdefault(current_date, [])
+                day_unavailable = [
+                    u for u in unavailabilities
+                    if u.start_date <= current_date <= u.end_date
+                ]
+
                 for start_time, end_time in time_ranges:
-                    try:
-                        slot = self.create_time_slot(
-                            counselor_id=counselor_id,
-                            target_date=current_date,
-                            start_time=start_time,
-                            end_time=end_time
-                        )
-                        created_slots.append(slot)
-                    except ValueError as e:
-                        # Skip conflicting slots but continue with others
-                        print(f"Skipping slot on {current_date} {start_time}-{end_time}: {e}")
+                    # Skip conflicting slots but continue with others
+                    if any(start_time < taken_end and end_time > taken_start
+                           for taken_start, taken_end in day_taken):
+                        logger.warning(f"Skipping slot on {current_date} {start_time}-{end_time}: conflicts with existing slot")
                         continue
 
+                    blocked = next((
+                        u for u in day_unavailable
+                        if (not u.start_time and not u.end_time) or
+                           (u.start_time and u.end_time and
+                            start_time < u.end_time and end_time > u.start_time)
+                    ), None)
+                    if blocked:
+                        logger.info(f"Skipping slot on {current_date} {start_time}-{end_time}: counselor unavailable: {blocked.reason}")
+                        continue
+
+                    rows.append({
+                        "counselor_id": counselor_id,
+                        "date": current_date,
+                        "start_time": start_time,
+                        "end_time": end_time,
+                        "is_available": True
+                    })
+                    # Later ranges in the same request must not overlap this one either
+                    day_taken.append((start_time, end_time))
+
             current_date += timedelta(days=1)
 
+        if not rows:
+            return []
+
+        created_slots = list(self.db.scalars(
+            pg_insert(TimeSlot).on_conflict_do_nothing(constraint="ex_time_slots_no_overlap").returning(TimeSlot),
+            rows
+        ))
+        self.db.commit()
+
         return created_slots
 
-    def book_time_slot(self, slot_id: str, session_id: str) -> TimeSlot:
+    def book_time_slot(self, slot_id: str, session_id: str, commit: bool = True) -> TimeSlot:
         """
         Mark a time slot as booked when a session is created.
+        With commit=False the change is only flushed, leaving the caller's
+        transaction open.
         """
         time_slot = self.db.query(TimeSlot).filter(TimeSlot.id == slot_id).first()
 
@@ -234,10 +378,12 @@ class CounselorService:
             raise ValueError("Time slot is not available")
 
         time_slot.is_booked = True
-        time_slot.updated_at = datetime.utcnow()
+
+        if not commit:
+            self.db.flush()
+            return time_slot
 
         self.db.commit()
-        self.db.refresh(time_slot)
 
         return time_slot
 
@@ -251,137 +397,7 @@ class CounselorService:
             raise ValueError("Time slot not found")
 
         time_slot.is_booked = False
-        time_slot.updated_at = datetime.utcnow()
 
         self.db.commit()
-        self.db.refresh(time_slot)
 
         return time_slot
-
-def create_counselor_schedule(
-        self,
-        counselor_id: str,
-        name: str,
-        days_of_week: List[int],
-        start_time: time,
-        end_time: time,
-        effective_from: date,              # <- 위치 이동
-        session_duration_minutes: int = 50, 
-        break_duration_minutes: int = 10,
-        effective_until: Optional[date] = None,
-        created_by: str = None,
-        description: Optional[str] = None
-    ) -> CounselorSchedule:
-
-        """
-        Create a recurring schedule rule for a counselor.
-        """
-        schedule = CounselorSchedule(
-            counselor_id=counselor_id,
-            name=name,
-            description=description,
-            days_of_week=",".join(map(str, days_of_week)),
-            start_time=start_time,
-            end_time=end_time,
-            session_duration_minutes=session_duration_minutes,
-            break_duration_minutes=break_duration_minutes,
-            effective_from=effective_from,
-            effective_until=effective_until,
-            created_by=created_by,
-            created_at=datetime.utcnow()
-        )
-
-        self.db.add(schedule)
-        self.db.commit()
-        self.db.refresh(schedule)
-
-        return schedule
-
-def generate_slots_from_schedule(
-        self,
-        schedule: CounselorSchedule,
-        target_date: date
-    ) -> List[TimeSlot]:
-        """
-        Generate time slots for a specific date based on a schedule rule.
-        """
-        # Check if the date is within the schedule's effective period
-        if target_date < schedule.effective_from:
-            return []
-        
-        if schedule.effective_until and target_date > schedule.effective_until:
-            return []
-
-        # Check if the date's weekday is in the schedule
-        weekday = target_date.weekday()  # 0=Monday, 6=Sunday
-        allowed_days = [int(d) for d in schedule.days_of_week.split(",")]
-        
-        if weekday not in allowed_days:
-            return []
-
-        # Check for unavailability
-        unavailability = (
-            self.db.query(CounselorUnavailability)
-            .filter(
-                CounselorUnavailability.counselor_id == schedule.counselor_id,
-                CounselorUnavailability.start_date <= target_date,
-                CounselorUnavailability.end_date >= target_date
-            )
-            .first()
-        )
-
-        if unavailability:
-            return []  # Skip this date entirely if unavailable
-
-        # Generate time slots
-        slots = []
-        current_time = schedule.start_time
-        end_time = schedule.end_time
-
-        while current_time < end_time:
-            # Calculate slot end time
-            slot_end_datetime = datetime.combine(target_date, current_time) + timedelta(minutes=schedule.session_duration_minutes)
-            slot_end_time = slot_end_datetime.time()
-
-            # Check if the slot would exceed the day's end time
-            if slot_end_time > end_time:
-                break
-
-            # Check for conflicts
-            existing_slot = (
-                self.db.query(TimeSlot)
-                .filter(
-                    TimeSlot.counselor_id == schedule.counselor_id,
-                    TimeSlot.date == target_date,
-                    TimeSlot.start_time == current_time
-                )
-                .first()
-            )
-
-            if not existing_slot:
-                slot = TimeSlot(
-                    counselor_id=schedule.counselor_id,
-                    date=target_date,
-                    start_time=current_time,
-                    end_time=slot_end_time,
-                    is_available=True,
-                    is_booked=False,
-                    generated_from_schedule_id=schedule.id,
-                    created_at=datetime.utcnow()
-                )
-                
-                self.db.add(slot)
-                slots.append(slot)
-
-            # Move to next slot time
-            next_slot_datetime = datetime.combine(target_date, current_time) + timedelta(
-                minutes=schedule.session_duration_minutes + schedule.break_duration_minutes
-            )
-            current_time = next_slot_datetime.time()
-
-        if slots:
-            self.db.commit()
-            for slot in slots:
-                self.db.refresh(slot)
-
-        return slots
\ No newline at end of file
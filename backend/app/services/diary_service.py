@@ -1,12 +1,23 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, extract, desc
-from typing import List, Optional, Dict, Any
-from datetime import datetime, date
+from sqlalchemy import Integer, func, and_, desc, cast, select
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, date, timedelta
 from collections import Counter
+from uuid import UUID
+from statistics import mean
 
 from app.models.diary import Diary
 from app.models.user import User
 from app.schemas.diary import DiaryCreate, DiaryUpdate
+from app.core.pagination import keyset_page
+
+DiaryCursor = Tuple[datetime, UUID]
+
+# Monthly statistics keyed by (user_id, year, month); each entry remembers the
+# fingerprint of the user's diaries it was computed from and is reused only
+# while that fingerprint is unchanged (any create/update/delete changes it)
+_STATS_CACHE_MAX = 4096
+_stats_cache: Dict[Tuple[str, int, int], Tuple[Tuple[Any, ...], Dict[str, Any]]] = {}
 
 
 class DiaryService:
@@ -36,22 +47,43 @@ class DiaryService:
     def get_user_diaries(
         db: Session,
         user_id: str,
-        skip: int = 0,
+        cursor: Optional[DiaryCursor] = None,
         limit: int = 10,
-        mood: Optional[str] = None
-    ) -> List[Diary]:
-        """Get user's diary entries with filtering"""
+        mood: Optional[str] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None
+    ) -> Tuple[List[Diary], Optional[DiaryCursor]]:
+        """
+        Get user's diary entries with filtering, newest first.
+        Keyset-paginated on (created_at, id): pass the returned next cursor
+        to fetch the following page.
+        """
         query = db.query(Diary).filter(Diary.user_id == user_id)
         
         if mood:
             query = query.filter(Diary.mood == mood)
         
-        diaries = query.order_by(desc(Diary.created_at))\
-                      .offset(skip)\
-                      .limit(limit)\
-                      .all()
+        if year:
+            # created_at range, so the (user_id, created_at, id) index still serves the page
+            if month:
+                start, end = DiaryService._month_bounds(year, month)
+            else:
+                start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+            query = query.filter(Diary.created_at >= start, Diary.created_at < end)
         
-        return diaries
+        return keyset_page(query, (Diary.created_at, Diary.id), cursor, limit)
+    
+    @staticmethod
+    def get_diary_by_id(
+        db: Session,
+        diary_id: UUID,
+        user_id: str
+    ) -> Optional[Diary]:
+        """Get a diary entry owned by the user"""
+        return db.query(Diary).filter(
+            Diary.id == diary_id,
+            Diary.user_id == user_id
+        ).first()
     
     @staticmethod
     def update_diary(
@@ -60,7 +92,7 @@ class DiaryService:
         diary_data: DiaryUpdate
     ) -> Diary:
         """Update diary entry"""
-        update_data = diary_data.dict(exclude_unset=True)
+        update_data = diary_data.model_dump(exclude_unset=True)
         
         for field, value in update_data.items():
             setattr(diary, field, value)
@@ -70,6 +102,12 @@ class DiaryService:
         
         return diary
     
+    @staticmethod
+    def delete_diary(db: Session, diary: Diary) -> None:
+        """Delete diary entry"""
+        db.delete(diary)
+        db.commit()
+    
     @staticmethod
     def get_diary_statistics(
         db: Session,
@@ -78,70 +116,63 @@ class DiaryService:
         month: int
     ) -> Dict[str, Any]:
         """Get diary statistics for a specific month"""
-        # Base query for the month
-        month_query = db.query(Diary).filter(
-            and_(
-                Diary.user_id == user_id,
-                extract('year', Diary.created_at) == year,
-                extract('month', Diary.created_at) == month
-            )
-        )
+        # The streak spans all months, so fingerprint all of the user's diaries
+        fingerprint = tuple(db.query(
+            func.count(Diary.id),
+            func.max(func.coalesce(Diary.updated_at, Diary.created_at))
+        ).filter(Diary.user_id == user_id).one())
         
-        # Total entries
-        total_entries = month_query.count()
+        cache_key = (str(user_id), year, month)
+        cached = _stats_cache.get(cache_key)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
         
-        # Mood distribution
-        mood_data = db.query(
-            Diary.mood,
-            func.count(Diary.id).label('count')
-        ).filter(
-            and_(
-                Diary.user_id == user_id,
-                extract('year', Diary.created_at) == year,
-                extract('month', Diary.created_at) == month,
-                Diary.mood.isnot(None)
-            )
-        ).group_by(Diary.mood).all()
+        statistics = DiaryService._compute_diary_statistics(db, user_id, year, month)
         
-        mood_distribution = {
-            mood_item.mood: mood_item.count 
-            for mood_item in mood_data
-        }
+        if cache_key not in _stats_cache and len(_stats_cache) >= _STATS_CACHE_MAX:
+            del _stats_cache[next(iter(_stats_cache))]
+        _stats_cache[cache_key] = (fingerprint, statistics)
         
-        # Most active day
-        day_data = db.query(
-            func.date(Diary.created_at).label('date'),
-            func.count(Diary.id).label('count')
+        return statistics
+    
+    @staticmethod
+    def _compute_diary_statistics(
+        db: Session,
+        user_id: str,
+        year: int,
+        month: int
+    ) -> Dict[str, Any]:
+        start, end = DiaryService._month_bounds(year, month)
+
+        # One round trip: a (day, mood, length) row per entry, folded in Python
+        rows = db.query(
+            func.date(Diary.created_at).label('d'),
+            Diary.mood,
+            func.length(Diary.content).label('l')
         ).filter(
-            and_(
-                Diary.user_id == user_id,
-                extract('year', Diary.created_at) == year,
-                extract('month', Diary.created_at) == month
-            )
-        ).group_by(func.date(Diary.created_at))\
-         .order_by(desc(func.count(Diary.id)))\
-         .first()
-        
-        most_active_day = day_data.date.strftime('%Y-%m-%d') if day_data else None
-        
-        # Writing streak (consecutive days with entries)
-        writing_streak = DiaryService._calculate_writing_streak(
-            db, user_id, year, month
+            Diary.user_id == user_id,
+            Diary.created_at >= start,
+            Diary.created_at < end
+        ).all()
+
+        # Total entries
+        total_entries = len(rows)
+
+        # Mood distribution
+        mood_distribution = dict(Counter(row.mood for row in rows if row.mood))
+
+        # Most active day
+        day_counts = Counter(row.d for row in rows)
+        most_active_day = (
+            day_counts.most_common(1)[0][0].strftime('%Y-%m-%d') if day_counts else None
         )
-        
+
+        # Writing streak (consecutive days with entries)
+        writing_streak = DiaryService._calculate_writing_streak(db, user_id)
+
         # Average length
-        avg_length_result = db.query(
-            func.avg(func.length(Diary.content)).label('avg_length')
-        ).filter(
-            and_(
-                Diary.user_id == user_id,
-                extract('year', Diary.created_at) == year,
-                extract('month', Diary.created_at) == month
-            )
-        ).scalar()
-        
-        average_length = int(avg_length_result) if avg_length_result else 0
-        
+        average_length = int(mean(row.l for row in rows)) if rows else 0
+
         return {
             "year": year,
             "month": month,
@@ -153,43 +184,35 @@ class DiaryService:
         }
     
     @staticmethod
-    def _calculate_writing_streak(
-        db: Session,
-        user_id: str,
-        year: int,
-        month: int
-    ) -> int:
-        """Calculate the longest writing streak in days"""
-        # Get all dates with diary entries for the month
-        dates_with_entries = db.query(
-            func.date(Diary.created_at).label('entry_date')
-        ).filter(
-            and_(
-                Diary.user_id == user_id,
-                extract('year', Diary.created_at) == year,
-                extract('month', Diary.created_at) == month
-            )
-        ).distinct().all()
-        
-        if not dates_with_entries:
-            return 0
-        
-        # Convert to date objects and sort
-        entry_dates = sorted([entry.entry_date for entry in dates_with_entries])
+    def _month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+        """[first of month, first of next month) as a half-open created_at range"""
+        return (
+            datetime(year, month, 1),
+            datetime(year + (month == 12), month % 12 + 1, 1)
+        )
+    
+    @staticmethod
+    def _calculate_writing_streak(db: Session, user_id: str) -> int:
+        """
+        Calculate the longest writing streak in days, across month boundaries.
+        Consecutive days share the same (day - row_number) value, so the
+        longest streak is the size of the largest such group.
+        """
+        days = select(func.date(Diary.created_at).label('day'))\
+            .where(Diary.user_id == user_id)\
+            .distinct()\
+            .subquery()
         
-        # Calculate longest consecutive streak
-        max_streak = 1
-        current_streak = 1
+        islands = select(
+            (days.c.day - cast(func.row_number().over(order_by=days.c.day), Integer)).label('grp')
+        ).subquery()
         
-        for i in range(1, len(entry_dates)):
-            # Check if dates are consecutive
-            if (entry_dates[i] - entry_dates[i-1]).days == 1:
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 1
+        streaks = select(func.count().label('length'))\
+            .select_from(islands)\
+            .group_by(islands.c.grp)\
+            .subquery()
         
-        return max_streak
+        return db.execute(select(func.max(streaks.c.length))).scalar() or 0
     
     @staticmethod
     def get_similar_mood_diaries(
@@ -241,7 +264,8 @@ class DiaryService:
         diary = db.query(Diary).filter(
             and_(
                 Diary.user_id == user_id,
-                func.date(Diary.created_at) == target_date
+                Diary.created_at >= target_date,
+                Diary.created_at < target_date + timedelta(days=1)
             )
         ).first()
         
@@ -1,7 +1,29 @@
+import asyncio
+import logging
 import httpx
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+# Shared across logins so TCP/TLS connections to Naver stay pooled;
+# closed by the app's shutdown handler
+_client = httpx.AsyncClient(
+    timeout=5.0,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+)
+
+
+async def close_client() -> None:
+    await _client.aclose()
+
+
+# Concurrent duplicate callbacks (same code, state) share one in-flight
+# verification; the entry is dropped as soon as it resolves, so a code that
+# was already redeemed is never answered from memory
+_verify_inflight: Dict[Tuple[str, str], "asyncio.Task[Optional[Dict[str, Any]]]"] = {}
+
 
 class NaverOAuthService:
     """Naver OAuth service for handling OAuth authentication"""
@@ -13,24 +35,23 @@ class NaverOAuthService:
     async def get_access_token(cls, code: str, state: str) -> Optional[str]:
         """Get access token from Naver OAuth"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    cls.NAVER_TOKEN_URL,
-                    data={
-                        "grant_type": "authorization_code",
-                        "client_id": settings.NAVER_CLIENT_ID,
-                        "client_secret": settings.NAVER_CLIENT_SECRET,
-                        "code": code,
-                        "state": state,
-                    }
-                )
-                
-                if response.status_code == 200:
-                    token_data = response.json()
-                    return token_data.get("access_token")
+            response = await _client.post(
+                cls.NAVER_TOKEN_URL,
+                data={
+                    "grant_type": "authorization_code",
+                    "client_id": settings.NAVER_CLIENT_ID,
+                    "client_secret": settings.NAVER_CLIENT_SECRET,
+                    "code": code,
+                    "state": state,
+                }
+            )
+            
+            if response.status_code == 200:
+                token_data = response.json()
+                return token_data.get("access_token")
                     
-        except Exception as e:
-            print(f"Error getting Naver access token: {e}")
+        except Exception:
+            logger.exception("Error getting Naver access token")
             
         return None
     
@@ -38,27 +59,38 @@ class NaverOAuthService:
     async def get_user_info(cls, access_token: str) -> Optional[Dict[str, Any]]:
         """Get user information from Naver API"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    cls.NAVER_USER_INFO_URL,
-                    headers={
-                        "Authorization": f"Bearer {access_token}"
-                    }
-                )
-                
-                if response.status_code == 200:
-                    user_data = response.json()
-                    if user_data.get("resultcode") == "00":
-                        return user_data.get("response")
-                        
-        except Exception as e:
-            print(f"Error getting Naver user info: {e}")
+            response = await _client.get(
+                cls.NAVER_USER_INFO_URL,
+                headers={
+                    "Authorization": f"Bearer {access_token}"
+                }
+            )
+            
+            if response.status_code == 200:
+                user_data = response.json()
+                if user_data.get("resultcode") == "00":
+                    return user_data.get("response")
+                    
+        except Exception:
+            logger.exception("Error getting Naver user info")
             
         return None
     
     @classmethod
     async def verify_user(cls, code: str, state: str) -> Optional[Dict[str, Any]]:
         """Complete OAuth flow - get token and user info"""
+        key = (code, state)
+        task = _verify_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(cls._verify_user(code, state))
+            _verify_inflight[key] = task
+            task.add_done_callback(lambda _: _verify_inflight.pop(key, None))
+        
+        # Shielded so one caller disconnecting doesn't cancel the others' result
+        return await asyncio.shield(task)
+    
+    @classmethod
+    async def _verify_user(cls, code: str, state: str) -> Optional[Dict[str, Any]]:
         access_token = await cls.get_access_token(code, state)
         if not access_token:
             return None
@@ -1,10 +1,16 @@
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from app.db.after_commit import AfterCommitWriter
 from app.models.notification import Notification
 from app.models.user import User
 
+# Queued notifications are written off the request path by this pool, in one
+# INSERT per committed transaction, using their own DB session
+_notification_writer = AfterCommitWriter(Notification, "notifications", max_workers=2)
+
 
 class NotificationService:
     """Service for creating and managing notifications"""
@@ -16,9 +22,10 @@ class NotificationService:
         notification_type: str,
         title: str,
         message: str,
-        data: Optional[Dict[str, Any]] = None
+        data: Optional[Dict[str, Any]] = None,
+        commit: bool = True
     ) -> Notification:
-        """Create a new notification"""
+        """Create a new notification (commit=False only flushes, for callers owning the transaction)"""
         notification = Notification(
             user_id=user_id,
             type=notification_type,
@@ -28,11 +35,38 @@ class NotificationService:
         )
         
         db.add(notification)
+        if not commit:
+            db.flush()
+            return notification
+        
         db.commit()
         db.refresh(notification)
         
         return notification
     
+    @staticmethod
+    def create_notifications_bulk(
+        db: Session,
+        rows: List[Dict[str, Any]],
+        commit: bool = True
+    ) -> List[Any]:
+        """
+        Create many notifications (fan-out) in a single INSERT ... RETURNING id.
+        rows are dicts with user_id, type, title, message and optional data.
+        """
+        if not rows:
+            return []
+        
+        ids = db.scalars(
+            insert(Notification).returning(Notification.id),
+            [{"data": None, **row} for row in rows]
+        ).all()
+        
+        if commit:
+            db.commit()
+        
+        return ids
+    
     @staticmethod
     def create_empathy_notification(
         db: Session,
@@ -100,4 +134,128 @@ class NotificationService:
                 "reactor": reactor_nickname,
                 "emoji": emoji
             }
-        )
\ No newline at end of file
+        )
+    
+    @staticmethod
+    def enqueue_notification(
+        db: Session,
+        user_id: str,
+        notification_type: str,
+        title: str,
+        message: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Queue a notification; it is written in the background once db's transaction commits"""
+        _notification_writer.queue(db, {
+            "user_id": user_id,
+            "type": notification_type,
+            "title": title,
+            "message": message,
+            "data": data
+        })
+    
+    @staticmethod
+    def create_session_booking_notification(
+        db: Session,
+        user_id: str,
+        session_id: str,
+        counselor_name: str,
+        scheduled_datetime: datetime
+    ) -> None:
+        """Queue notification for a booked counseling session"""
+        NotificationService.enqueue_notification(
+            db=db,
+            user_id=user_id,
+            notification_type="session_booked",
+            title="상담 예약 완료",
+            message=f"{counselor_name} 상담사와 {scheduled_datetime:%Y-%m-%d %H:%M} 상담이 예약되었습니다.",
+            data={
+                "session_id": session_id,
+                "counselor_name": counselor_name,
+                "scheduled_at": scheduled_datetime.isoformat()
+            }
+        )
+    
+    @staticmethod
+    def create_session_cancellation_notification(
+        db: Session,
+        user_id: str,
+        session_id: str,
+        cancelled_by: str,
+        reason: Optional[str] = None
+    ) -> None:
+        """Queue notification for a cancelled counseling session"""
+        NotificationService.enqueue_notification(
+            db=db,
+            user_id=user_id,
+            notification_type="session_cancelled",
+            title="상담 예약 취소",
+            message="상담 예약이 취소되었습니다.",
+            data={
+                "session_id": session_id,
+                "cancelled_by": cancelled_by,
+                "reason": reason
+            }
+        )
+    
+    @staticmethod
+    def create_session_start_notification(
+        db: Session,
+        user_id: str,
+        session_id: str,
+        counselor_name: str
+    ) -> None:
+        """Queue notification for a started counseling session"""
+        NotificationService.enqueue_notification(
+            db=db,
+            user_id=user_id,
+            notification_type="session_started",
+            title="상담 시작",
+            message=f"{counselor_name} 상담사가 상담을 시작했습니다.",
+            data={
+                "session_id": session_id,
+                "counselor_name": counselor_name
+            }
+        )
+    
+    @staticmethod
+    def create_session_completion_notification(
+        db: Session,
+        user_id: str,
+        session_id: str,
+        counselor_name: str
+    ) -> None:
+        """Queue notification for a completed counseling session"""
+        NotificationService.enqueue_notification(
+            db=db,
+            user_id=user_id,
+            notification_type="session_completed",
+            title="상담 완료",
+            message=f"{counselor_name} 상담사와의 상담이 완료되었습니다.",
+            data={
+                "session_id": session_id,
+                "counselor_name": counselor_name
+            }
+        )
+    
+    @staticmethod
+    def create_session_reminder_notification(
+        db: Session,
+        user_id: str,
+        session_id: str,
+        counselor_name: str,
+        scheduled_datetime: datetime
+    ) -> None:
+        """Queue a reminder for a counseling session starting soon"""
+        NotificationService.enqueue_notification(
+            db=db,
+            user_id=user_id,
+            notification_type="session_reminder",
+            title="상담 시작 알림",
+            message=f"{counselor_name} 상담사와의 상담이 {scheduled_datetime:%H:%M}에 시작됩니다.",
+            data={
+                "session_id": session_id,
+                "counselor_name": counselor_name,
+                "scheduled_at": scheduled_datetime.isoformat()
+            }
+        )
@@ -1,14 +1,21 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_, desc, asc, text
-from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, selectinload, raiseload
+from sqlalchemy import func, or_, and_, desc, asc, text, update, delete, exists, select, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
+from collections import defaultdict
+from uuid import UUID
 
 from app.models.post import Post
 from app.models.user import User
 from app.models.empathy import Empathy
 from app.models.emoji_reaction import EmojiReaction
+from app.models.post_emoji_count import PostEmojiCount
 from app.schemas.post import PostCreate, PostUpdate
 from app.services.notification_service import NotificationService
+from app.core.pagination import keyset_page
+
+PostCursor = Tuple[datetime, UUID]
 
 
 class PostService:
@@ -38,14 +45,22 @@ class PostService:
     @staticmethod
     def get_posts_with_pagination(
         db: Session,
-        skip: int = 0,
+        cursor: Optional[PostCursor] = None,
         limit: int = 10,
         category: Optional[str] = None,
         user_id: Optional[str] = None,
-        include_private: bool = False
-    ) -> Tuple[List[Post], int]:
-        """Get posts with pagination and filters"""
-        query = db.query(Post)
+        include_private: bool = False,
+        author_id: Optional[str] = None
+    ) -> Tuple[List[Post], Optional[PostCursor]]:
+        """
+        Get posts with pagination and filters, newest first.
+        Keyset-paginated on (created_at, id): pass the returned next cursor
+        to fetch the following page.
+        """
+        query = db.query(Post).options(
+            selectinload(Post.author),
+            raiseload('*')
+        )
         
         # Filter conditions
         conditions = []
@@ -54,6 +69,10 @@ class PostService:
         if category:
             conditions.append(Post.category == category)
         
+        # Author filter
+        if author_id:
+            conditions.append(Post.user_id == author_id)
+        
         # Privacy filter
         if include_private and user_id:
             # Show public posts + user's private posts
@@ -70,16 +89,8 @@ class PostService:
         if conditions:
             query = query.filter(and_(*conditions))
         
-        # Get total count
-        total = query.count()
-        
         # Apply pagination and ordering
-        posts = query.order_by(desc(Post.created_at))\
-                     .offset(skip)\
-                     .limit(limit)\
-                     .all()
-        
-        return posts, total
+        return keyset_page(query, (Post.created_at, Post.id), cursor, limit)
     
     @staticmethod
     def search_posts(
@@ -106,7 +117,7 @@ class PostService:
         else:
             conditions.append(Post.is_private == False)
         
-        # Text search conditions
+        # Text search conditions (served by the pg_trgm GIN indexes)
         search_conditions = or_(
             Post.title.ilike(f"%{search_query}%"),
             Post.content.ilike(f"%{search_query}%")
@@ -114,7 +125,11 @@ class PostService:
         
         conditions.append(search_conditions)
         
-        query = db.query(Post).filter(and_(*conditions))
+        query = (
+            db.query(Post)
+            .filter(and_(*conditions))
+            .options(selectinload(Post.author), raiseload('*'))
+        )
         
         # Apply sorting
         if sort_by == "latest":
@@ -122,24 +137,44 @@ class PostService:
         elif sort_by == "empathy_count":
             query = query.order_by(desc(Post.empathy_count))
         else:  # relevance (default)
-            # Simple relevance: prioritize title matches, then by creation date
-            query = query.order_by(
-                desc(Post.title.ilike(f"%{search_query}%")),
-                desc(Post.created_at)
-            )
-        
-        # Get total count
-        total = query.count()
+            # One trigram rank per row, title weighted over content, then by creation date
+            rank = (
+                func.similarity(Post.title, search_query)
+                + 0.5 * func.similarity(Post.content, search_query)
+            ).label('rank')
+            query = query.order_by(desc(rank), desc(Post.created_at))
         
         # Apply pagination
-        posts = query.offset(skip).limit(limit).all()
+        return PostService._paginate_with_total(query, skip, limit)
+    
+    @staticmethod
+    def _paginate_with_total(query, skip: int, limit: int) -> Tuple[List[Post], int]:
+        """
+        Fetch one page together with the total match count.
+        COUNT(*) OVER () is evaluated before OFFSET/LIMIT, so every page row
+        carries the full total and no separate count query is needed.
+        """
+        rows = query.add_columns(func.count().over().label('total'))\
+                    .offset(skip)\
+                    .limit(limit)\
+                    .all()
+        
+        if rows:
+            return [row[0] for row in rows], rows[0].total
         
-        return posts, total
+        # Empty page: only past-the-end pages can still have matches
+        return [], query.order_by(None).count() if skip else 0
     
     @staticmethod
     def increment_view_count(db: Session, post: Post) -> Post:
         """Increment post view count"""
-        post.view_count += 1
+        # Single UPDATE evaluated in SQL: no lost increments under concurrent views;
+        # the loaded post's view_count is synchronized from the same expression
+        db.execute(
+            update(Post)
+            .where(Post.id == post.id)
+            .values(view_count=Post.view_count + 1)
+        )
         db.commit()
         return post
     
@@ -149,36 +184,44 @@ class PostService:
         post: Post, 
         user: User
     ) -> Tuple[bool, Post]:
-        """Toggle empathy for a post"""
-        existing_empathy = db.query(Empathy).filter(
-            Empathy.post_id == post.id,
-            Empathy.user_id == user.id
-        ).first()
+        """
+        Toggle empathy for a post in one statement: insert the empathy, or
+        delete it if it already existed. posts.empathy_count is maintained
+        by the empathies_count_trg trigger.
+        """
+        empathies = Empathy.__table__
         
-        if existing_empathy:
-            # Remove empathy
-            db.delete(existing_empathy)
-            post.empathy_count = max(0, post.empathy_count - 1)
-            empathized = False
-        else:
-            # Add empathy
-            new_empathy = Empathy(
-                post_id=post.id,
-                user_id=user.id
+        inserted = pg_insert(empathies)\
+            .values(post_id=post.id, user_id=user.id)\
+            .on_conflict_do_nothing(constraint='unique_user_post_empathy')\
+            .returning(empathies.c.id)\
+            .cte('inserted')
+        
+        # Runs only when the insert hit the existing row
+        deleted = delete(empathies)\
+            .where(
+                empathies.c.post_id == post.id,
+                empathies.c.user_id == user.id,
+                ~exists(select(inserted.c.id))
+            )\
+            .returning(empathies.c.id)\
+            .cte('deleted')
+        
+        empathized = db.execute(
+            select(exists(select(inserted.c.id))).add_cte(deleted)
+        ).scalar()
+        # Updated by the trigger; reloaded on next access
+        db.expire(post, ['empathy_count'])
+        
+        # Create notification for post author (if not self-empathy)
+        if empathized and str(post.user_id) != str(user.id):
+            NotificationService.create_empathy_notification(
+                db=db,
+                post_author_id=str(post.user_id),
+                empathizer_nickname=user.nickname,
+                post_title=post.title,
+                post_id=str(post.id)
             )
-            db.add(new_empathy)
-            post.empathy_count += 1
-            empathized = True
-            
-            # Create notification for post author (if not self-empathy)
-            if str(post.user_id) != str(user.id):
-                NotificationService.create_empathy_notification(
-                    db=db,
-                    post_author_id=str(post.user_id),
-                    empathizer_nickname=user.nickname,
-                    post_title=post.title,
-                    post_id=str(post.id)
-                )
         
         db.commit()
         return empathized, post
@@ -190,38 +233,45 @@ class PostService:
         user: User,
         emoji: str
     ) -> EmojiReaction:
-        """Add or update emoji reaction"""
-        existing_reaction = db.query(EmojiReaction).filter(
-            EmojiReaction.post_id == post.id,
-            EmojiReaction.user_id == user.id
+        """
+        Add or update emoji reaction with one upsert.
+        Re-sending the same emoji writes nothing; xmax = 0 marks a fresh insert.
+        """
+        upsert = pg_insert(EmojiReaction).values(
+            post_id=post.id,
+            user_id=user.id,
+            emoji=emoji
+        )
+        upsert = upsert.on_conflict_do_update(
+            constraint='unique_user_post_emoji',
+            set_={'emoji': upsert.excluded.emoji},
+            where=EmojiReaction.emoji != upsert.excluded.emoji
+        ).returning(EmojiReaction, literal_column('xmax = 0').label('inserted'))
+        
+        row = db.execute(
+            upsert, execution_options={"populate_existing": True}
         ).first()
         
-        if existing_reaction:
-            # Update existing reaction
-            existing_reaction.emoji = emoji
-            db.commit()
-            reaction = existing_reaction
-        else:
-            # Create new reaction
-            reaction = EmojiReaction(
-                post_id=post.id,
-                user_id=user.id,
+        if row is None:
+            # Same emoji as before: nothing was written
+            return db.query(EmojiReaction).filter(
+                EmojiReaction.post_id == post.id,
+                EmojiReaction.user_id == user.id
+            ).one()
+        
+        reaction, inserted = row
+        db.commit()
+        
+        # Create notification for post author (if not self-reaction)
+        if inserted and str(post.user_id) != str(user.id):
+            NotificationService.create_emoji_reaction_notification(
+                db=db,
+                post_author_id=str(post.user_id),
+                reactor_nickname=user.nickname,
+                post_title=post.title,
+                post_id=str(post.id),
                 emoji=emoji
             )
-            db.add(reaction)
-            db.commit()
-            db.refresh(reaction)
-            
-            # Create notification for post author (if not self-reaction)
-            if str(post.user_id) != str(user.id):
-                NotificationService.create_emoji_reaction_notification(
-                    db=db,
-                    post_author_id=str(post.user_id),
-                    reactor_nickname=user.nickname,
-                    post_title=post.title,
-                    post_id=str(post.id),
-                    emoji=emoji
-                )
         
         return reaction
     
@@ -248,11 +298,12 @@ class PostService:
     def get_post_emoji_reactions(db: Session, post_id: str) -> List[dict]:
         """Get aggregated emoji reactions for a post"""
         reactions = db.query(
-            EmojiReaction.emoji,
-            func.count(EmojiReaction.id).label('count')
+            PostEmojiCount.emoji,
+            PostEmojiCount.count
         ).filter(
-            EmojiReaction.post_id == post_id
-        ).group_by(EmojiReaction.emoji).all()
+            PostEmojiCount.post_id == post_id,
+            PostEmojiCount.count > 0
+        ).all()
         
         return [
             {"emoji": reaction.emoji, "count": reaction.count}
@@ -262,9 +313,45 @@ class PostService:
     @staticmethod
     def check_user_empathy(db: Session, post_id: str, user_id: str) -> bool:
         """Check if user has empathized with post"""
-        empathy = db.query(Empathy).filter(
-            Empathy.post_id == post_id,
-            Empathy.user_id == user_id
-        ).first()
+        return db.query(
+            db.query(Empathy).filter(
+                Empathy.post_id == post_id,
+                Empathy.user_id == user_id
+            ).exists()
+        ).scalar()
+    
+    @staticmethod
+    def get_post_emoji_reactions_bulk(db: Session, post_ids: List) -> Dict[Any, List[dict]]:
+        """Get aggregated emoji reactions for a page of posts in one query"""
+        if not post_ids:
+            return {}
+        
+        reactions = db.query(
+            PostEmojiCount.post_id,
+            PostEmojiCount.emoji,
+            PostEmojiCount.count
+        ).filter(
+            PostEmojiCount.post_id.in_(post_ids),
+            PostEmojiCount.count > 0
+        ).all()
+        
+        by_post = defaultdict(list)
+        for reaction in reactions:
+            by_post[reaction.post_id].append(
+                {"emoji": reaction.emoji, "count": reaction.count}
+            )
+        
+        return dict(by_post)
+    
+    @staticmethod
+    def check_user_empathy_bulk(db: Session, post_ids: List, user_id: str) -> Set:
+        """Ids of the posts in post_ids that the user has empathized with, in one query"""
+        if not post_ids:
+            return set()
+        
+        rows = db.query(Empathy.post_id).filter(
+            Empathy.user_id == user_id,
+            Empathy.post_id.in_(post_ids)
+        ).all()
         
-        return empathy is not None
\ No newline at end of file
+        return {row.post_id for row in rows}
@@ -1,276 +1,337 @@
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 from datetime import datetime, date, timedelta
 from typing import List, Optional
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
+from sqlalchemy import Integer, and_, case, cast, func, or_, select, text, update
+import asyncio
 import logging
 
-from app.db.session import SessionLocal
-from app.models.time_slot import CounselorSchedule, TimeSlot
+from app.db.session import SessionLocal, engine
+from app.models.time_slot import TimeSlot
 from app.models.chat_session import ChatSession
 from app.services.counselor_service import CounselorService
 from app.services.notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
 
+# Tables range-partitioned by month on created_at
+PARTITIONED_TABLES = ("messages", "notifications")
+
+# Session-level advisory lock held by the one process that executes jobs
+SCHEDULER_LEADER_LOCK = 0x6F6E6D61756D  # "onmaum"
+# How often a standby process retries for the lock
+LEADER_RETRY_SECONDS = 60
+
+# A reminder is still worth sending up to the session start
+REMINDER_MISFIRE_GRACE_SECONDS = 10 * 60
+
+# Persisted jobs store a textual reference to their callable; bound methods
+# can't be pickled, so jobs point at the module-level scheduler_service instance
+def _job_ref(method_name: str) -> str:
+    return f"{__name__}:scheduler_service.{method_name}"
+
 
 class SchedulerService:
+    # Jobs are plain (sync) functions: AsyncIOScheduler runs them in the event
+    # loop's thread pool, so their blocking DB work never stalls the loop.
+    # Each opens its session in a with-block: an exception rolls back and
+    # returns the connection to the pool instead of leaking it.
+    #
+    # APScheduler 3 can't share a job store between running schedulers, so
+    # only the process holding SCHEDULER_LEADER_LOCK runs one. Every other
+    # uvicorn worker/replica keeps its scheduler paused: reminders it adds or
+    # cancels go to the shared store and are executed by the leader, and it
+    # takes over the lock if the leader goes away.
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
+        # Jobs persist across restarts; a run missed while the app was down
+        # fires once (coalesced) if it is less than a minute late
+        self.scheduler = AsyncIOScheduler(
+            jobstores={
+                'default': SQLAlchemyJobStore(engine=engine, tablename='apscheduler_jobs')
+            },
+            job_defaults={
+                'coalesce': True,
+                'max_instances': 1,
+                'misfire_grace_time': 60
+            }
+        )
         self.is_running = False
+        self._leader_conn: Optional[Connection] = None
+        self._standby_task: Optional[asyncio.Task] = None
 
     def start(self):
-        """Start the scheduler with all jobs"""
+        """
+        Start the scheduler. Must be called from the running event loop.
+        Jobs only execute in the process that wins the leader lock.
+        """
         if not self.is_running:
-            # Schedule daily time slot generation at midnight
-            self.scheduler.add_job(
-                func=self.generate_daily_time_slots,
-                trigger=CronTrigger(hour=0, minute=0),  # Every day at midnight
-                id='generate_daily_time_slots',
-                name='Generate daily time slots from recurring schedules',
-                replace_existing=True
-            )
+            # Paused until leadership: add/remove still reach the shared store
+            self.scheduler.start(paused=True)
+            self.is_running = True
 
-            # Schedule reminder notifications check every minute
-            self.scheduler.add_job(
-                func=self.check_session_reminders,
-                trigger=CronTrigger(minute='*'),  # Every minute
-                id='check_session_reminders',
-                name='Check for session reminder notifications',
-                replace_existing=True
-            )
+            try:
+                is_leader = self._try_become_leader()
+            except Exception as e:
+                logger.error(f"Failed to acquire scheduler leader lock: {e}")
+                is_leader = False
 
-            # Schedule automatic session status updates
-            self.scheduler.add_job(
-                func=self.update_session_statuses,
-                trigger=CronTrigger(minute='*/5'),  # Every 5 minutes
-                id='update_session_statuses',
-                name='Update overdue session statuses',
-                replace_existing=True
-            )
+            if not is_leader:
+                logger.info("Scheduler on standby; another process holds the leader lock")
+                self._standby_task = asyncio.get_running_loop().create_task(
+                    self._await_leadership()
+                )
 
-            self.scheduler.start()
-            self.is_running = True
-            logger.info("Scheduler service started")
+    def _try_become_leader(self) -> bool:
+        """Take the leader lock if free, then register the recurring jobs and run them."""
+        # Autocommit so holding the lock doesn't leave a transaction open
+        conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            acquired = conn.execute(
+                select(func.pg_try_advisory_lock(SCHEDULER_LEADER_LOCK))
+            ).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+
+        self._leader_conn = conn
+        self._add_recurring_jobs()
+        self.scheduler.resume()
+        logger.info("Scheduler service started (leader)")
+        return True
+
+    async def _await_leadership(self):
+        while True:
+            await asyncio.sleep(LEADER_RETRY_SECONDS)
+            try:
+                if await asyncio.to_thread(self._try_become_leader):
+                    return
+            except Exception as e:
+                logger.error(f"Failed to acquire scheduler leader lock: {e}")
+
+    def _add_recurring_jobs(self):
+        """Register (or refresh) the recurring jobs in the shared store"""
+        # Schedule daily time slot generation at midnight
+        self.scheduler.add_job(
+            func=_job_ref('generate_daily_time_slots'),
+            trigger=CronTrigger(hour=0, minute=0),  # Every day at midnight
+            id='generate_daily_time_slots',
+            name='Generate daily time slots from recurring schedules',
+            replace_existing=True
+        )
+
+        # Schedule automatic session status updates
+        self.scheduler.add_job(
+            func=_job_ref('update_session_statuses'),
+            trigger=CronTrigger(minute='*/5'),  # Every 5 minutes
+            id='update_session_statuses',
+            name='Update overdue session statuses',
+            replace_existing=True
+        )
+
+        # Keep monthly partitions created ahead of time (also runs once at startup)
+        self.scheduler.add_job(
+            func=_job_ref('ensure_monthly_partitions'),
+            trigger=CronTrigger(hour=0, minute=5),  # Every day at 00:05
+            id='ensure_monthly_partitions',
+            name='Create upcoming monthly table partitions',
+            replace_existing=True,
+            next_run_time=datetime.now()
+        )
 
     def stop(self):
-        """Stop the scheduler"""
+        """Stop the scheduler and release the leader lock"""
         if self.is_running:
+            if self._standby_task:
+                self._standby_task.cancel()
+                self._standby_task = None
             self.scheduler.shutdown()
             self.is_running = False
+            if self._leader_conn is not None:
+                # Closing the session releases the advisory lock
+                self._leader_conn.close()
+                self._leader_conn = None
             logger.info("Scheduler service stopped")
 
-    async def generate_daily_time_slots(self):
+    def generate_daily_time_slots(self):
         """
         Generate time slots for tomorrow based on active recurring schedules.
         Runs daily at midnight.
         """
         try:
-            db = SessionLocal()
-            counselor_service = CounselorService(db)
+            with SessionLocal() as db:
+                counselor_service = CounselorService(db)
             
-            # Target date is tomorrow
-            target_date = date.today() + timedelta(days=1)
+                # Target date is tomorrow
+                target_date = date.today() + timedelta(days=1)
             
-            logger.info(f"Generating time slots for {target_date}")
-
-            # Get all active counselor schedules
-            active_schedules = (
-                db.query(CounselorSchedule)
-                .filter(
-                    CounselorSchedule.is_active == True,
-                    CounselorSchedule.effective_from <= target_date,
-                    (CounselorSchedule.effective_until.is_(None)) |
-                    (CounselorSchedule.effective_until >= target_date)
-                )
-                .all()
-            )
+                logger.info(f"Generating time slots for {target_date}")
 
-            total_generated = 0
-            for schedule in active_schedules:
-                try:
-                    generated_slots = counselor_service.generate_slots_from_schedule(
-                        schedule=schedule,
-                        target_date=target_date
-                    )
-                    total_generated += len(generated_slots)
-                    
-                    if generated_slots:
-                        logger.info(
-                            f"Generated {len(generated_slots)} slots for counselor "
-                            f"{schedule.counselor_id} on {target_date}"
-                        )
-                        
-                except Exception as e:
-                    logger.error(
-                        f"Failed to generate slots for schedule {schedule.id}: {e}"
-                    )
-                    continue
-
-            db.close()
+                # Every active schedule's slots in a single INSERT ... SELECT
+                total_generated = counselor_service.generate_slots_for_date(target_date)
             logger.info(f"Generated {total_generated} total time slots for {target_date}")
 
         except Exception as e:
             logger.error(f"Failed to generate daily time slots: {e}")
 
-    async def check_session_reminders(self):
+    def update_session_statuses(self):
         """
-        Check for upcoming sessions and send reminder notifications.
-        Runs every minute.
+        Update statuses of overdue sessions.
+        Runs every 5 minutes.
         """
         try:
-            db = SessionLocal()
-            notification_service = NotificationService(db)
-            
-            # Find sessions starting in 10 minutes
-            reminder_time = datetime.now() + timedelta(minutes=10)
+            with SessionLocal() as db:
+                now = datetime.now()
             
-            upcoming_sessions = (
-                db.query(ChatSession)
-                .filter(
-                    ChatSession.status == "pending",
-                    ChatSession.scheduled_date == reminder_time.date(),
-                    # Check if scheduled time is within the next minute window
-                    # (since we run every minute, we need to catch sessions in this window)
+                # One sweep over open sessions:
+                # - pending sessions 15+ minutes past their start are auto-cancelled
+                # - active sessions 30+ minutes past their scheduled end are auto-completed
+                pending = ChatSession.status == "pending"
+                auto_end_time = (
+                    ChatSession.scheduled_date + ChatSession.scheduled_end_time
+                    + timedelta(minutes=30)
                 )
-                .all()
-            )
+                cancel_note = "Auto-cancelled: Session was not started within 15 minutes of scheduled time"
+                complete_note = "Auto-completed: Session exceeded scheduled end time by 30+ minutes"
 
-            for session in upcoming_sessions:
-                try:
-                    # Combine date and time for comparison
-                    session_datetime = datetime.combine(
-                        session.scheduled_date,
-                        session.scheduled_start_time
-                    )
-                    
-                    # Check if session starts in approximately 10 minutes (±30 seconds)
-                    time_diff = session_datetime - datetime.now()
-                    if timedelta(minutes=9, seconds=30) <= time_diff <= timedelta(minutes=10, seconds=30):
-                        
-                        # Check if reminder already sent
-                        existing_reminder = notification_service.has_session_reminder(
-                            session_id=str(session.id),
-                            user_id=str(session.user_id)
+                # Claim the overdue rows first; rows another instance is already
+                # sweeping are skipped instead of waited on
+                claimed = (
+                    select(ChatSession.id)
+                    .where(
+                        ChatSession.status.in_(("pending", "active")),
+                        # Plain column bound so the scan is an index range
+                        ChatSession.scheduled_date <= now.date(),
+                        or_(
+                            and_(
+                                pending,
+                                ChatSession.scheduled_date + ChatSession.scheduled_start_time
+                                < now - timedelta(minutes=15)
+                            ),
+                            and_(ChatSession.status == "active", auto_end_time < now)
                         )
-                        
-                        if not existing_reminder:
-                            notification_service.create_session_reminder_notification(
-                                user_id=str(session.user_id),
-                                session_id=str(session.id),
-                                counselor_name=session.counselor.name,
-                                scheduled_datetime=session_datetime
-                            )
-                            
-                            logger.info(
-                                f"Sent reminder notification for session {session.id}"
+                    )
+                    .with_for_update(skip_locked=True)
+                )
+
+                swept = db.execute(
+                    update(ChatSession)
+                    .where(ChatSession.id.in_(claimed))
+                    .values(
+                        status=case((pending, "cancelled"), else_="completed"),
+                        counselor_notes=case(
+                            (pending, cancel_note),
+                            (func.coalesce(ChatSession.counselor_notes, "") == "", complete_note),
+                            else_=ChatSession.counselor_notes + "\n\n" + complete_note
+                        ),
+                        actual_end_time=case((pending, ChatSession.actual_end_time), else_=auto_end_time),
+                        # Completed: NULL when the session never recorded a start time
+                        duration=case(
+                            (pending, ChatSession.duration),
+                            else_=cast(
+                                func.floor(func.extract('epoch', auto_end_time - ChatSession.actual_start_time) / 60),
+                                Integer
                             )
-                            
-                except Exception as e:
-                    logger.error(
-                        f"Failed to send reminder for session {session.id}: {e}"
+                        ),
+                        updated_at=now
+                    )
+                    .returning(ChatSession.id, ChatSession.status, ChatSession.time_slot_id)
+                    .execution_options(synchronize_session=False)
+                ).all()
+
+                # Free up the time slots the cancelled sessions had booked
+                freed_slot_ids = [
+                    row.time_slot_id for row in swept
+                    if row.status == "cancelled" and row.time_slot_id
+                ]
+                if freed_slot_ids:
+                    db.execute(
+                        update(TimeSlot)
+                        .where(TimeSlot.id.in_(freed_slot_ids))
+                        .values(is_booked=False)
+                        .execution_options(synchronize_session=False)
                     )
-                    continue
 
-            db.close()
+                db.commit()
+            
+            for row in swept:
+                if row.status == "cancelled":
+                    logger.info(f"Auto-cancelled overdue session {row.id}")
+                else:
+                    logger.info(f"Auto-completed overdue session {row.id}")
 
         except Exception as e:
-            logger.error(f"Failed to check session reminders: {e}")
+            logger.error(f"Failed to update session statuses: {e}")
 
-    async def update_session_statuses(self):
+    def ensure_monthly_partitions(self):
         """
-        Update statuses of overdue sessions.
-        Runs every 5 minutes.
+        Create this month's and next month's partitions for time-partitioned tables.
+        Idempotent; runs daily so a missed run never leaves inserts without a partition.
+        Each partition is created in its own transaction, so one failure doesn't
+        hold back the others.
         """
-        try:
-            db = SessionLocal()
-            now = datetime.now()
-            
-            # Find sessions that should have started but are still pending
-            overdue_sessions = (
-                db.query(ChatSession)
-                .filter(
-                    ChatSession.status == "pending"
-                )
-                .all()
-            )
+        month_start = date.today().replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        month_after = (next_month + timedelta(days=32)).replace(day=1)
 
-            for session in overdue_sessions:
+        for start, end in ((month_start, next_month), (next_month, month_after)):
+            for table in PARTITIONED_TABLES:
                 try:
-                    # Check if session was supposed to start more than 15 minutes ago
-                    session_datetime = datetime.combine(
-                        session.scheduled_date,
-                        session.scheduled_start_time
-                    )
-                    
-                    if now > session_datetime + timedelta(minutes=15):
-                        # Auto-cancel sessions that are 15+ minutes overdue
-                        session.status = "cancelled"
-                        session.counselor_notes = "Auto-cancelled: Session was not started within 15 minutes of scheduled time"
-                        session.updated_at = now
-                        
-                        # Free up the time slot if it was booked
-                        if session.time_slot_id:
-                            time_slot = db.query(TimeSlot).filter(
-                                TimeSlot.id == session.time_slot_id
-                            ).first()
-                            if time_slot:
-                                time_slot.is_booked = False
-                                time_slot.updated_at = now
-                        
-                        logger.info(f"Auto-cancelled overdue session {session.id}")
-                        
+                    with SessionLocal() as db:
+                        self._create_month_partition(db, table, start, end)
+                        db.commit()
                 except Exception as e:
-                    logger.error(
-                        f"Failed to update session {session.id}: {e}"
-                    )
-                    continue
+                    logger.error(f"Failed to create partition of {table} for {start:%Y-%m}: {e}")
 
-            # Find active sessions that should have ended
-            active_sessions = (
-                db.query(ChatSession)
-                .filter(
-                    ChatSession.status == "active"
-                )
-                .all()
-            )
+    @staticmethod
+    def _create_month_partition(db: Session, table: str, start: date, end: date):
+        """
+        Create table's partition for [start, end). PostgreSQL refuses to create it
+        while the DEFAULT partition holds rows in that range (e.g. written before
+        the first run, or after a missed one), so those rows are moved: detach the
+        default, create the partition, re-insert the rows through the parent so
+        they land in it, and reattach the default.
+        """
+        partition = f"{table}_y{start.year}m{start.month:02d}"
+        default_partition = f"{table}_default"
+        bounds = {"start": start, "end": end}
 
-            for session in active_sessions:
-                try:
-                    session_end_datetime = datetime.combine(
-                        session.scheduled_date,
-                        session.scheduled_end_time
-                    )
-                    
-                    # If session was supposed to end more than 30 minutes ago, auto-complete it
-                    if now > session_end_datetime + timedelta(minutes=30):
-                        session.status = "completed"
-                        session.actual_end_time = session_end_datetime + timedelta(minutes=30)
-                        session.counselor_notes = (
-                            f"{session.counselor_notes or ''}\n\n"
-                            "Auto-completed: Session exceeded scheduled end time by 30+ minutes"
-                        ).strip()
-                        session.updated_at = now
-                        
-                        # Calculate duration
-                        if session.actual_start_time:
-                            duration = session.actual_end_time - session.actual_start_time
-                            session.duration = int(duration.total_seconds() / 60)
-                        
-                        logger.info(f"Auto-completed overdue session {session.id}")
-                        
-                except Exception as e:
-                    logger.error(
-                        f"Failed to complete session {session.id}: {e}"
-                    )
-                    continue
+        if db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": partition}).scalar():
+            return
 
-            db.commit()
-            db.close()
+        create = text(
+            f"CREATE TABLE {partition} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
 
-        except Exception as e:
-            logger.error(f"Failed to update session statuses: {e}")
+        stranded = db.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {default_partition} "
+            f"WHERE created_at >= :start AND created_at < :end)"
+        ), bounds).scalar()
+        if not stranded:
+            db.execute(create)
+            return
+
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default_partition}"))
+        db.execute(create)
+        moved = db.execute(text(
+            f"WITH moved AS ("
+            f"DELETE FROM {default_partition} "
+            f"WHERE created_at >= :start AND created_at < :end RETURNING *"
+            f") INSERT INTO {table} SELECT * FROM moved"
+        ), bounds).rowcount
+        db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default_partition} DEFAULT"))
+
+        logger.warning(
+            f"Moved {moved} rows of {table} for {start:%Y-%m} out of {default_partition} "
+            f"into {partition}"
+        )
 
     def schedule_one_time_reminder(
         self,
@@ -287,19 +348,22 @@ class SchedulerService:
         # Only schedule if the reminder time is in the future
         if reminder_datetime > datetime.now():
             self.scheduler.add_job(
-                func=self._send_session_reminder,
+                func=_job_ref('_send_session_reminder'),
                 trigger=DateTrigger(run_date=reminder_datetime),
                 args=[session_id, user_id, counselor_name, scheduled_datetime],
                 id=f'reminder_{session_id}',
                 name=f'Session reminder for {session_id}',
-                replace_existing=True
+                replace_existing=True,
+                # The leader may only see a job added by another process on its next
+                # wakeup, so allow a late run rather than dropping the reminder
+                misfire_grace_time=REMINDER_MISFIRE_GRACE_SECONDS
             )
             
             logger.info(
                 f"Scheduled reminder for session {session_id} at {reminder_datetime}"
             )
 
-    async def _send_session_reminder(
+    def _send_session_reminder(
         self,
         session_id: str,
         user_id: str,
@@ -310,17 +374,25 @@ class SchedulerService:
         Send a session reminder notification.
         """
         try:
-            db = SessionLocal()
-            notification_service = NotificationService(db)
-            
-            notification_service.create_session_reminder_notification(
-                user_id=user_id,
-                session_id=session_id,
-                counselor_name=counselor_name,
-                scheduled_datetime=scheduled_datetime
-            )
+            with SessionLocal() as db:
+                # The session may have been cancelled or started since booking
+                still_pending = db.query(
+                    db.query(ChatSession).filter(
+                        ChatSession.id == session_id,
+                        ChatSession.status == "pending"
+                    ).exists()
+                ).scalar()
             
-            db.close()
+                if still_pending:
+                    # Queued on the session and written once it commits
+                    NotificationService.create_session_reminder_notification(
+                        db=db,
+                        user_id=user_id,
+                        session_id=session_id,
+                        counselor_name=counselor_name,
+                        scheduled_datetime=scheduled_datetime
+                    )
+                    db.commit()
             logger.info(f"Sent scheduled reminder for session {session_id}")
             
         except Exception as e:
@@ -5,9 +5,11 @@ Handles staff CRUD operations, authentication, and role management
 
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, select
 from passlib.context import CryptContext
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import os
 import uuid
 
 from app.models.staff import Staff
@@ -19,10 +21,23 @@ from app.models.report import Report
 from app.schemas.staff import StaffCreate, StaffUpdate, StaffRoleUpdate
 from app.core.security import create_access_token, create_refresh_token
 from app.core.rbac import StaffRole
+from app.services.audit_queue import audit_log_row, queue_audit_log
 
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Cost 10 for new hashes; older hashes inside [10, 14] still verify without rehash
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=10,
+    bcrypt__min_rounds=10,
+    bcrypt__max_rounds=14,
+)
+# Load the bcrypt backend now rather than on the first login
+pwd_context.hash("warmup")
+
+# Parallel hashing for bulk staff creation
+_hash_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="password-hash")
 
 
 class StaffService:
@@ -69,7 +84,7 @@ class StaffService:
     @staticmethod
     def get_staff_by_id(db: Session, staff_id: uuid.UUID) -> Optional[Staff]:
         """Get staff by ID"""
-        return db.query(Staff).filter(Staff.id == staff_id).first()
+        return db.get(Staff, staff_id)
 
     @staticmethod
     def get_staff_by_email(db: Session, email: str) -> Optional[Staff]:
@@ -148,6 +163,68 @@ class StaffService:
         db.refresh(db_staff)
         return db_staff
 
+    @staticmethod
+    def bulk_create_staff(
+        db: Session,
+        staff_list: List[StaffCreate],
+        creator_staff: Staff
+    ) -> List[Staff]:
+        """
+        Create many staff members (e.g. an import) in one transaction:
+        one INSERT for the staff rows, one for their audit logs, one commit.
+        """
+        emails = [staff_data.email for staff_data in staff_list]
+        if len(set(emails)) != len(emails):
+            raise ValueError("Duplicate emails in request")
+        
+        existing_emails = db.scalars(
+            select(Staff.email).where(Staff.email.in_(emails))
+        ).all()
+        if existing_emails:
+            raise ValueError(f"Email already registered: {', '.join(existing_emails)}")
+        
+        # bcrypt releases the GIL, so hashes are computed in parallel
+        hashed_passwords = list(_hash_executor.map(
+            pwd_context.hash, [staff_data.password for staff_data in staff_list]
+        ))
+        
+        db_staff_list = [
+            Staff(
+                name=staff_data.name,
+                email=staff_data.email,
+                phone=staff_data.phone,
+                role=staff_data.role.value,
+                department=staff_data.department,
+                hashed_password=hashed_password,
+                is_active=True,
+            )
+            for staff_data, hashed_password in zip(staff_list, hashed_passwords)
+        ]
+        
+        db.add_all(db_staff_list)
+        db.flush()  # One batched INSERT ... RETURNING for all ids
+        
+        for staff_data, db_staff in zip(staff_list, db_staff_list):
+            AuditLogService.create_log(
+                db=db,
+                staff_id=creator_staff.id,
+                staff_name=creator_staff.name,
+                staff_role=creator_staff.role,
+                action=AuditAction.STAFF_CREATE,
+                action_description=f"Created new staff member: {staff_data.name} ({staff_data.email})",
+                severity=AuditSeverity.HIGH,
+                target_type="staff",
+                target_id=str(db_staff.id),
+                target_name=staff_data.name,
+                details={
+                    "role": staff_data.role.value,
+                    "department": staff_data.department,
+                }
+            )
+        
+        db.commit()
+        return db_staff_list
+
     @staticmethod
     def update_staff(
         db: Session, 
@@ -330,11 +407,11 @@ class AuditLogService:
         request_id: str = None,
         success: str = "success",
         error_message: str = None,
-    ) -> AuditLog:
+    ) -> None:
         """
-        Create audit log entry
+        Queue an audit log entry; it is written in the background once db commits
         """
-        log_entry = AuditLog.create_log(
+        queue_audit_log(db, audit_log_row(
             staff_id=staff_id,
             staff_name=staff_name,
             staff_role=staff_role,
@@ -350,10 +427,7 @@ class AuditLogService:
             request_id=request_id,
             success=success,
             error_message=error_message,
-        )
-        
-        db.add(log_entry)
-        return log_entry
+        ))
 
     @staticmethod
     def get_audit_logs(
@@ -388,45 +462,56 @@ class AuditLogService:
         return query.order_by(desc(AuditLog.created_at)).offset(skip).limit(limit).all()
 
 
+# Dashboard counters are shared by every staff member and tolerate a little
+# staleness; recomputed at most once per TTL (and whenever the day rolls over)
+DASHBOARD_STATS_TTL = timedelta(seconds=30)
+_dashboard_stats_cache: Dict[Any, Any] = {}
+
+
 class DashboardService:
     """Service for dashboard statistics"""
     
     @staticmethod
     def get_dashboard_stats(db: Session) -> Dict[str, Any]:
         """
-        Get overall dashboard statistics
+        Get overall dashboard statistics (cached for DASHBOARD_STATS_TTL)
         """
-        today = datetime.utcnow().date()
-        
-        # User stats
-        total_users = db.query(User).count()
-        active_users_today = db.query(User).filter(
-            func.date(User.last_login) == today
-        ).count()
-        
-        # Post stats
-        total_posts = db.query(Post).count()
-        posts_today = db.query(Post).filter(
-            func.date(Post.created_at) == today
-        ).count()
-        
-        # Session stats
-        total_sessions = db.query(ChatSession).count()
-        sessions_today = db.query(ChatSession).filter(
-            func.date(ChatSession.created_at) == today
-        ).count()
-        
-        # Report stats
-        pending_reports = db.query(Report).filter(
-            Report.status == 'pending'
-        ).count()
+        now = datetime.utcnow()
+        cached = _dashboard_stats_cache.get(now.date())
+        if cached and cached[0] > now:
+            return cached[1]
         
-        return {
-            "total_users": total_users,
-            "active_users_today": active_users_today,
-            "total_posts": total_posts,
-            "posts_today": posts_today,
-            "total_sessions": total_sessions,
-            "sessions_today": sessions_today,
-            "pending_reports": pending_reports,
-        }
\ No newline at end of file
+        stats = DashboardService._compute_dashboard_stats(db, now.date())
+        
+        _dashboard_stats_cache.clear()
+        _dashboard_stats_cache[now.date()] = (now + DASHBOARD_STATS_TTL, stats)
+        
+        return stats
+    
+    @staticmethod
+    def _compute_dashboard_stats(db: Session, today) -> Dict[str, Any]:
+        today_start = datetime.combine(today, time.min)
+        tomorrow_start = today_start + timedelta(days=1)
+        
+        def today_only(column):
+            # Half-open [today, tomorrow) range: an index range scan on column
+            return and_(column >= today_start, column < tomorrow_start)
+        
+        def count(model, *conditions):
+            return select(func.count()).select_from(model).where(*conditions).scalar_subquery()
+        
+        # One scalar subquery per counter, all in one round trip; the today
+        # counters filter in WHERE so they use the created_at/last_login indexes
+        stats = db.execute(
+            select(
+                count(User).label('total_users'),
+                count(User, today_only(User.last_login)).label('active_users_today'),
+                count(Post).label('total_posts'),
+                count(Post, today_only(Post.created_at)).label('posts_today'),
+                count(ChatSession).label('total_sessions'),
+                count(ChatSession, today_only(ChatSession.created_at)).label('sessions_today'),
+                count(Report, Report.status == 'pending').label('pending_reports'),
+            )
+        ).one()
+        
+        return dict(stats._mapping)
@@ -1,6 +1,7 @@
 import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 from fastapi import Request
 
@@ -10,14 +11,21 @@ from app.models.user import User
 from app.models.refresh_token import RefreshToken
 from app.schemas.auth import AuthTokens
 
+# Rows removed per transaction by cleanup_expired_tokens
+CLEANUP_BATCH_SIZE = 10_000
+
+# Token lifetimes are fixed for the life of the process
+REFRESH_TOKEN_TTL = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+ACCESS_TOKEN_TTL_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
 
 class TokenService:
     """Service for managing JWT and refresh tokens"""
     
     @staticmethod
-    def _hash_token(token: str) -> str:
+    def _hash_token(token: str) -> bytes:
         """Hash token for secure storage"""
-        return hashlib.sha256(token.encode()).hexdigest()
+        return hashlib.sha256(token.encode()).digest()
     
     @classmethod
     def create_tokens_for_user(
@@ -34,7 +42,7 @@ class TokenService:
         
         # Store refresh token in database
         refresh_token_hash = cls._hash_token(refresh_token)
-        expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expires_at = datetime.now(timezone.utc) + REFRESH_TOKEN_TTL
         
         # Extract request info if available
         user_agent = None
@@ -58,7 +66,7 @@ class TokenService:
             access_token=access_token,
             refresh_token=refresh_token,
             token_type="bearer",
-            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            expires_in=ACCESS_TOKEN_TTL_SECONDS
         )
     
     @classmethod
@@ -75,33 +83,36 @@ class TokenService:
         if not token_data:
             return None
         
-        # Check if refresh token exists and is valid
+        # Check if refresh token exists and is valid, and lock it together
+        # with its user in one query: a concurrent refresh with the same token
+        # waits here and then no longer finds it active
+        now = datetime.now(timezone.utc)
         refresh_token_hash = cls._hash_token(refresh_token)
-        db_refresh_token = db.query(RefreshToken).filter(
-            RefreshToken.token_hash == refresh_token_hash,
-            RefreshToken.is_active == True,
-            RefreshToken.expires_at > datetime.utcnow()
+        row = db.execute(
+            select(RefreshToken, User)
+            .join(User, User.id == RefreshToken.user_id)
+            .where(
+                RefreshToken.token_hash == refresh_token_hash,
+                RefreshToken.is_active == True,
+                RefreshToken.expires_at > now
+            )
+            .with_for_update(of=RefreshToken)
         ).first()
         
-        if not db_refresh_token:
+        if not row:
             return None
         
-        # Get user
-        user = db.query(User).filter(User.id == token_data.user_id).first()
-        if not user or not user.is_active:
+        db_refresh_token, user = row
+        if not user.is_active:
+            db.rollback()  # Release the row lock
             return None
         
-        # Update last used timestamp
-        db_refresh_token.last_used = datetime.utcnow()
-        
-        # Create new tokens
-        new_tokens = cls.create_tokens_for_user(user, db, request)
-        
         # Deactivate old refresh token
+        db_refresh_token.last_used = now
         db_refresh_token.is_active = False
-        db.commit()
         
-        return new_tokens
+        # Issue new tokens; its commit also persists the deactivation
+        return cls.create_tokens_for_user(user, db, request)
     
     @classmethod
     def revoke_refresh_token(cls, refresh_token: str, db: Session) -> bool:
@@ -132,10 +143,27 @@ class TokenService:
     
     @classmethod
     def cleanup_expired_tokens(cls, db: Session) -> int:
-        """Clean up expired refresh tokens"""
-        result = db.query(RefreshToken).filter(
-            RefreshToken.expires_at < datetime.utcnow()
-        ).delete()
-        
-        db.commit()
-        return result
\ No newline at end of file
+        """
+        Clean up expired refresh tokens.
+        Deletes in batches, committing each one, so no single transaction
+        holds locks on (or writes WAL for) the whole expired backlog.
+        """
+        now = datetime.now(timezone.utc)
+        total_deleted = 0
+        
+        while True:
+            expired_batch = (
+                select(RefreshToken.id)
+                .where(RefreshToken.expires_at < now)
+                .limit(CLEANUP_BATCH_SIZE)
+            )
+            deleted = db.execute(
+                delete(RefreshToken)
+                .where(RefreshToken.id.in_(expired_batch))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            
+            total_deleted += deleted
+            if deleted < CLEANUP_BATCH_SIZE:
+                return total_deleted
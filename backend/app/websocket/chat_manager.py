@@ -1,22 +1,56 @@
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Tuple
 from fastapi import WebSocket, WebSocketDisconnect
-from datetime import datetime
-import json
+from starlette.websockets import WebSocketState
+from fastapi.concurrency import run_in_threadpool
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import asyncio
 import logging
+import time
+import orjson
 
-from app.schemas.chat import WebSocketMessage, MessageCreate
+from app.schemas.chat import MessageCreate
 from app.services.chat_service import ChatService
 from app.db.session import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# A client that can't take a frame within this long is treated as dead
+SEND_TIMEOUT_SECONDS = 5.0
+
+
+def pack_message(message_type: str, data: dict) -> str:
+    """
+    Serialize an outgoing frame; same shape as the WebSocketMessage schema.
+    Server-built frames need no validation, so they go straight to orjson.
+    """
+    return orjson.dumps(
+        {"type": message_type, "data": data, "timestamp": datetime.now(timezone.utc)},
+        option=orjson.OPT_UTC_Z
+    ).decode()
+
+
+@dataclass(slots=True)
+class ConnectionInfo:
+    session_id: str
+    user_id: str
+    user_type: str  # "user" or "counselor"
+    connected_at: float  # epoch seconds; formatted only when listed
+
 
 class ConnectionManager:
     def __init__(self):
         # session_id -> set of websockets
         self.active_connections: Dict[str, Set[WebSocket]] = {}
         # websocket -> connection info
-        self.connection_info: Dict[WebSocket, dict] = {}
+        self.connection_info: Dict[WebSocket, ConnectionInfo] = {}
+        # (session_id, user_id) -> that user's websockets in the session
+        self.user_connections: Dict[Tuple[str, str], Set[WebSocket]] = {}
+        # session_id -> participants list, rebuilt after the next connect/disconnect
+        self._participants_cache: Dict[str, List[dict]] = {}
+        # (session_id, user_id, user_type) of closed sockets, announced by the janitor
+        self._departures: asyncio.Queue = asyncio.Queue()
+        self._janitor_task: Optional[asyncio.Task] = None
 
     async def connect(
         self, 
@@ -33,21 +67,23 @@ class ConnectionManager:
             self.active_connections[session_id] = set()
         
         self.active_connections[session_id].add(websocket)
+        self.user_connections.setdefault((session_id, user_id), set()).add(websocket)
+        self._participants_cache.pop(session_id, None)
         
         # Store connection info
-        self.connection_info[websocket] = {
-            "session_id": session_id,
-            "user_id": user_id,
-            "user_type": user_type,
-            "connected_at": datetime.utcnow()
-        }
+        self.connection_info[websocket] = ConnectionInfo(
+            session_id=session_id,
+            user_id=user_id,
+            user_type=user_type,
+            connected_at=time.time()
+        )
         
         # Notify others in the session about new connection
         await self.broadcast_to_session(
             session_id,
-            WebSocketMessage(
-                type="user_joined",
-                data={
+            pack_message(
+                "user_joined",
+                {
                     "user_id": user_id,
                     "user_type": user_type,
                     "message": f"{user_type.title()} joined the session"
@@ -64,11 +100,12 @@ class ConnectionManager:
             return
             
         connection_info = self.connection_info[websocket]
-        session_id = connection_info["session_id"]
-        user_id = connection_info["user_id"]
-        user_type = connection_info["user_type"]
+        session_id = connection_info.session_id
+        user_id = connection_info.user_id
+        user_type = connection_info.user_type
         
         # Remove from session room
+        self._participants_cache.pop(session_id, None)
         if session_id in self.active_connections:
             self.active_connections[session_id].discard(websocket)
             
@@ -76,91 +113,144 @@ class ConnectionManager:
             if not self.active_connections[session_id]:
                 del self.active_connections[session_id]
         
+        user_key = (session_id, user_id)
+        if user_key in self.user_connections:
+            self.user_connections[user_key].discard(websocket)
+            if not self.user_connections[user_key]:
+                del self.user_connections[user_key]
+        
         # Remove connection info
         del self.connection_info[websocket]
         
         # Notify others about disconnection (in background)
-        if session_id in self.active_connections:
-            import asyncio
-            asyncio.create_task(
-                self.broadcast_to_session(
-                    session_id,
-                    WebSocketMessage(
-                        type="user_left",
-                        data={
-                            "user_id": user_id,
-                            "user_type": user_type,
-                            "message": f"{user_type.title()} left the session"
-                        }
-                    )
-                )
-            )
+        self._departures.put_nowait((session_id, user_id, user_type))
+        if self._janitor_task is None or self._janitor_task.done():
+            self._janitor_task = asyncio.create_task(self._janitor())
         
         logger.info(f"WebSocket disconnected: {user_type} {user_id} from session {session_id}")
 
-    async def send_personal_message(self, message: WebSocketMessage, websocket: WebSocket):
+    async def _janitor(self):
+        """
+        Announce departures in batches. When many sockets drop together (or die
+        mid-broadcast), each user gets at most one "user_left", and only once
+        their last socket in the session is gone.
+        """
+        while True:
+            departures = [await self._departures.get()]
+            while not self._departures.empty():
+                departures.append(self._departures.get_nowait())
+            
+            announced = set()
+            for session_id, user_id, user_type in departures:
+                user_key = (session_id, user_id)
+                if (
+                    user_key in announced
+                    or user_key in self.user_connections
+                    or session_id not in self.active_connections
+                ):
+                    continue
+                announced.add(user_key)
+                
+                try:
+                    await self.broadcast_to_session(
+                        session_id,
+                        pack_message(
+                            "user_left",
+                            {
+                                "user_id": user_id,
+                                "user_type": user_type,
+                                "message": f"{user_type.title()} left the session"
+                            }
+                        )
+                    )
+                except Exception as e:
+                    logger.error(f"Error announcing departure from session {session_id}: {e}")
+
+    async def send_personal_message(self, payload: str, websocket: WebSocket):
         """Send a message to a specific WebSocket"""
         try:
-            await websocket.send_text(message.json())
+            await websocket.send_text(payload)
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
 
     async def broadcast_to_session(
         self, 
         session_id: str, 
-        message: WebSocketMessage,
+        payload: str,
         exclude_websocket: Optional[WebSocket] = None
     ):
         """Broadcast a message to all connections in a session"""
         if session_id not in self.active_connections:
             return
         
-        # Create a copy of the set to avoid modification during iteration
-        connections = self.active_connections[session_id].copy()
-        
-        for websocket in connections:
-            if websocket == exclude_websocket:
-                continue
-                
+        # Snapshot the set (minus the sender); it may change while sends are in flight
+        targets = list(self.active_connections[session_id] - {exclude_websocket})
+        await self._fan_out(session_id, targets, payload)
+
+    async def _fan_out(self, session_id: str, targets: List[WebSocket], payload: str):
+        """
+        Send payload to all targets concurrently, so one slow client doesn't
+        hold up the rest; sockets that fail or time out are closed afterwards.
+        """
+        async def safe_send(websocket: WebSocket) -> bool:
             try:
-                await websocket.send_text(message.json())
+                await asyncio.wait_for(websocket.send_text(payload), timeout=SEND_TIMEOUT_SECONDS)
+                return True
             except Exception as e:
                 logger.error(f"Error broadcasting to session {session_id}: {e}")
-                # Connection might be dead, remove it
+                return False
+        
+        results = await asyncio.gather(*(safe_send(websocket) for websocket in targets))
+        
+        for websocket, ok in zip(targets, results):
+            if not ok:
+                # A timed-out send may have been cut off mid-frame, so the stream
+                # can't be trusted: close the socket, which also ends its
+                # handle_websocket loop, rather than leave it half-connected
                 self.disconnect(websocket)
+                await self._close_quietly(websocket)
+
+    async def _close_quietly(self, websocket: WebSocket):
+        """Close a broken socket, ignoring errors from the close itself"""
+        try:
+            await asyncio.wait_for(websocket.close(code=1011), timeout=SEND_TIMEOUT_SECONDS)
+        except Exception:
+            pass
 
     async def send_to_user_in_session(
         self,
         session_id: str,
         target_user_id: str,
-        message: WebSocketMessage
+        payload: str
     ):
         """Send a message to a specific user in a session"""
-        if session_id not in self.active_connections:
-            return
-        
-        connections = self.active_connections[session_id].copy()
-        
-        for websocket in connections:
-            connection_info = self.connection_info.get(websocket)
-            if connection_info and connection_info["user_id"] == target_user_id:
-                await self.send_personal_message(message, websocket)
+        # The user may be connected from several devices
+        targets = list(self.user_connections.get((session_id, target_user_id), ()))
+        if targets:
+            await self._fan_out(session_id, targets, payload)
 
     def get_session_participants(self, session_id: str) -> List[dict]:
         """Get list of active participants in a session"""
         if session_id not in self.active_connections:
             return []
         
+        cached = self._participants_cache.get(session_id)
+        if cached is not None:
+            return cached
+        
         participants = []
         for websocket in self.active_connections[session_id]:
             connection_info = self.connection_info.get(websocket)
             if connection_info:
                 participants.append({
-                    "user_id": connection_info["user_id"],
-                    "user_type": connection_info["user_type"],
-                    "connected_at": connection_info["connected_at"].isoformat()
+                    "user_id": connection_info.user_id,
+                    "user_type": connection_info.user_type,
+                    "connected_at": datetime.fromtimestamp(
+                        connection_info.connected_at, timezone.utc
+                    ).isoformat()
                 })
         
+        self._participants_cache[session_id] = participants
         return participants
 
     def is_session_active(self, session_id: str) -> bool:
@@ -181,22 +271,26 @@ class ChatWebSocketManager:
     ):
         """Main WebSocket handler"""
         
-        # Verify session access
-        db = SessionLocal()
-        chat_service = ChatService(db)
-        
+        # ChatService is synchronous; its calls run in the threadpool so DB I/O
+        # does not block the event loop shared by every open socket.
+        # A DB session is opened per operation, so an idle socket holds no
+        # pooled connection.
         try:
             # Verify user has access to this session
-            if user_type == "user":
-                session = chat_service.get_chat_session_details(
-                    session_id=session_id,
-                    user_id=user_id
-                )
-            else:  # counselor
-                session = chat_service.get_chat_session_details(
-                    session_id=session_id,
-                    counselor_id=user_id
-                )
+            with SessionLocal(expire_on_commit=False) as db:
+                chat_service = ChatService(db)
+                if user_type == "user":
+                    session = await run_in_threadpool(
+                        chat_service.get_chat_session_details,
+                        session_id=session_id,
+                        user_id=user_id
+                    )
+                else:  # counselor
+                    session = await run_in_threadpool(
+                        chat_service.get_chat_session_details,
+                        session_id=session_id,
+                        counselor_id=user_id
+                    )
             
             if not session:
                 await websocket.close(code=4003, reason="Access denied to session")
@@ -207,9 +301,9 @@ class ChatWebSocketManager:
             
             # Send welcome message with session info
             await self.manager.send_personal_message(
-                WebSocketMessage(
-                    type="session_info",
-                    data={
+                pack_message(
+                    "session_info",
+                    {
                         "session_id": session_id,
                         "status": session.status,
                         "participants": self.manager.get_session_participants(session_id),
@@ -222,41 +316,44 @@ class ChatWebSocketManager:
             # Handle incoming messages
             while True:
                 try:
+                    # Client frames are flat {"type": ..., ...} dicts, not WebSocketMessage
+                    # envelopes, so decode straight to a dict with orjson
                     data = await websocket.receive_text()
-                    message_data = json.loads(data)
+                    message_data = orjson.loads(data)
                     
                     await self.handle_message(
                         websocket=websocket,
                         session_id=session_id,
                         user_id=user_id,
                         user_type=user_type,
-                        message_data=message_data,
-                        chat_service=chat_service
+                        message_data=message_data
                     )
                     
                 except WebSocketDisconnect:
                     break
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     await self.manager.send_personal_message(
-                        WebSocketMessage(
-                            type="error",
-                            data={"message": "Invalid JSON format"}
+                        pack_message(
+                            "error",
+                            {"message": "Invalid JSON format"}
                         ),
                         websocket
                     )
                 except Exception as e:
+                    # Closed by the server (e.g. after a failed broadcast send)
+                    if websocket.application_state == WebSocketState.DISCONNECTED:
+                        break
                     logger.error(f"Error handling WebSocket message: {e}")
                     await self.manager.send_personal_message(
-                        WebSocketMessage(
-                            type="error",
-                            data={"message": "Server error processing message"}
+                        pack_message(
+                            "error",
+                            {"message": "Server error processing message"}
                         ),
                         websocket
                     )
         
         finally:
             self.manager.disconnect(websocket)
-            db.close()
 
     async def handle_message(
         self,
@@ -264,8 +361,7 @@ class ChatWebSocketManager:
         session_id: str,
         user_id: str,
         user_type: str,
-        message_data: dict,
-        chat_service: ChatService
+        message_data: dict
     ):
         """Handle different types of WebSocket messages"""
         
@@ -273,8 +369,7 @@ class ChatWebSocketManager:
         
         if message_type == "chat_message":
             await self.handle_chat_message(
-                websocket, session_id, user_id, user_type,
-                message_data, chat_service
+                websocket, session_id, user_id, user_type, message_data
             )
         elif message_type == "typing":
             await self.handle_typing_indicator(
@@ -282,14 +377,13 @@ class ChatWebSocketManager:
             )
         elif message_type == "session_action":
             await self.handle_session_action(
-                websocket, session_id, user_id, user_type,
-                message_data, chat_service
+                websocket, session_id, user_id, user_type, message_data
             )
         else:
             await self.manager.send_personal_message(
-                WebSocketMessage(
-                    type="error",
-                    data={"message": f"Unknown message type: {message_type}"}
+                pack_message(
+                    "error",
+                    {"message": f"Unknown message type: {message_type}"}
                 ),
                 websocket
             )
@@ -300,17 +394,16 @@ class ChatWebSocketManager:
         session_id: str,
         user_id: str,
         user_type: str,
-        message_data: dict,
-        chat_service: ChatService
+        message_data: dict
     ):
         """Handle chat message sending"""
         
         content = message_data.get("content", "").strip()
         if not content:
             await self.manager.send_personal_message(
-                WebSocketMessage(
-                    type="error",
-                    data={"message": "Message content cannot be empty"}
+                pack_message(
+                    "error",
+                    {"message": "Message content cannot be empty"}
                 ),
                 websocket
             )
@@ -318,19 +411,17 @@ class ChatWebSocketManager:
         
         try:
             # Save message to database
-            message = chat_service.send_message(
-                session_id=session_id,
-                sender_id=user_id,
-                sender_type=user_type,
-                message_data=MessageCreate(content=content)
-            )
-            
-            # Broadcast message to all participants
-            await self.manager.broadcast_to_session(
-                session_id,
-                WebSocketMessage(
-                    type="new_message",
-                    data={
+            with SessionLocal(expire_on_commit=False) as db:
+                message = await run_in_threadpool(
+                    ChatService(db).send_message,
+                    session_id=session_id,
+                    sender_id=user_id,
+                    sender_type=user_type,
+                    message_data=MessageCreate(content=content)
+                )
+                payload = pack_message(
+                    "new_message",
+                    {
                         "id": str(message.id),
                         "session_id": str(message.session_id),
                         "sender_id": str(message.sender_id),
@@ -339,13 +430,15 @@ class ChatWebSocketManager:
                         "created_at": message.created_at.isoformat()
                     }
                 )
-            )
+            
+            # Broadcast message to all participants
+            await self.manager.broadcast_to_session(session_id, payload)
             
         except Exception as e:
             await self.manager.send_personal_message(
-                WebSocketMessage(
-                    type="error",
-                    data={"message": f"Failed to send message: {str(e)}"}
+                pack_message(
+                    "error",
+                    {"message": f"Failed to send message: {str(e)}"}
                 ),
                 websocket
             )
@@ -365,9 +458,9 @@ class ChatWebSocketManager:
         # Broadcast typing status to others in the session
         await self.manager.broadcast_to_session(
             session_id,
-            WebSocketMessage(
-                type="typing_indicator",
-                data={
+            pack_message(
+                "typing_indicator",
+                {
                     "user_id": user_id,
                     "user_type": user_type,
                     "is_typing": is_typing
@@ -382,8 +475,7 @@ class ChatWebSocketManager:
         session_id: str,
         user_id: str,
         user_type: str,
-        message_data: dict,
-        chat_service: ChatService
+        message_data: dict
     ):
         """Handle session control actions (start, end, etc.)"""
         
@@ -391,40 +483,38 @@ class ChatWebSocketManager:
         
         try:
             if action == "start_session" and user_type == "counselor":
-                session = chat_service.start_chat_session(
-                    session_id=session_id,
-                    counselor_id=user_id
-                )
-                
-                # Broadcast session start to all participants
-                await self.manager.broadcast_to_session(
-                    session_id,
-                    WebSocketMessage(
-                        type="session_started",
-                        data={
+                with SessionLocal(expire_on_commit=False) as db:
+                    session = await run_in_threadpool(
+                        ChatService(db).start_chat_session,
+                        session_id=session_id,
+                        counselor_id=user_id
+                    )
+                    payload = pack_message(
+                        "session_started",
+                        {
                             "session_id": session_id,
                             "started_by": user_id,
                             "started_at": session.actual_start_time.isoformat(),
                             "message": "Session has been started by the counselor"
                         }
                     )
-                )
+                
+                # Broadcast session start to all participants
+                await self.manager.broadcast_to_session(session_id, payload)
                 
             elif action == "end_session" and user_type == "counselor":
                 counselor_notes = message_data.get("counselor_notes", "")
                 
-                session = chat_service.complete_chat_session(
-                    session_id=session_id,
-                    counselor_id=user_id,
-                    counselor_notes=counselor_notes
-                )
-                
-                # Broadcast session end to all participants
-                await self.manager.broadcast_to_session(
-                    session_id,
-                    WebSocketMessage(
-                        type="session_ended",
-                        data={
+                with SessionLocal(expire_on_commit=False) as db:
+                    session = await run_in_threadpool(
+                        ChatService(db).complete_chat_session,
+                        session_id=session_id,
+                        counselor_id=user_id,
+                        counselor_notes=counselor_notes
+                    )
+                    payload = pack_message(
+                        "session_ended",
+                        {
                             "session_id": session_id,
                             "ended_by": user_id,
                             "ended_at": session.actual_end_time.isoformat(),
@@ -432,22 +522,24 @@ class ChatWebSocketManager:
                             "message": "Session has been completed by the counselor"
                         }
                     )
-                )
+                
+                # Broadcast session end to all participants
+                await self.manager.broadcast_to_session(session_id, payload)
                 
             else:
                 await self.manager.send_personal_message(
-                    WebSocketMessage(
-                        type="error",
-                        data={"message": f"Invalid or unauthorized action: {action}"}
+                    pack_message(
+                        "error",
+                        {"message": f"Invalid or unauthorized action: {action}"}
                     ),
                     websocket
                 )
                 
         except Exception as e:
             await self.manager.send_personal_message(
-                WebSocketMessage(
-                    type="error",
-                    data={"message": f"Failed to perform action: {str(e)}"}
+                pack_message(
+                    "error",
+                    {"message": f"Failed to perform action: {str(e)}"}
                 ),
                 websocket
             )
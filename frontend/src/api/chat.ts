@@ -2,7 +2,7 @@ import apiClient from './client';
 import { ChatSession, Message } from '@/types';
 
 export interface ChatSessionsQuery {
-  skip?: number;
+  cursor?: string;
   limit?: number;
   status?: 'pending' | 'active' | 'completed' | 'cancelled';
 }
@@ -1,8 +1,8 @@
 import apiClient from './client';
-import { Diary, DiaryCreate, PaginatedResponse } from '@/types';
+import { Diary, DiaryCreate, CursorPaginatedResponse } from '@/types';
 
 export interface DiariesQuery {
-  skip?: number;
+  cursor?: string;
   limit?: number;
   mood?: string;
 }
@@ -20,7 +20,7 @@ export interface DiaryStatistics {
 // Diaries API calls
 export const diariesApi = {
   // Get diary entries
-  getDiaries: async (params: DiariesQuery & { year?: number; month?: number } = {}): Promise<PaginatedResponse<Diary>> => {
+  getDiaries: async (params: DiariesQuery & { year?: number; month?: number } = {}): Promise<CursorPaginatedResponse<Diary>> => {
     const response = await apiClient.get('/diaries', { params });
     return response.data;
   },
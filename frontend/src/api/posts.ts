@@ -1,8 +1,8 @@
 import apiClient from './client';
-import { Post, PostCreate, PaginatedResponse } from '@/types';
+import { Post, PostCreate, PaginatedResponse, CursorPaginatedResponse } from '@/types';
 
 export interface PostsQuery {
-  skip?: number;
+  cursor?: string;
   limit?: number;
   category?: string;
 }
@@ -17,7 +17,7 @@ export interface SearchPostsQuery {
 // Posts API calls
 export const postsApi = {
   // Get posts list
-  getPosts: async (params: PostsQuery = {}): Promise<PaginatedResponse<Post>> => {
+  getPosts: async (params: PostsQuery = {}): Promise<CursorPaginatedResponse<Post>> => {
     const response = await apiClient.get('/posts', { params });
     return response.data;
   },
@@ -29,7 +29,7 @@ export const postsApi = {
   },
 
   // Get user's posts
-  getMyPosts: async (params: Omit<PostsQuery, 'category'> = {}): Promise<PaginatedResponse<Post>> => {
+  getMyPosts: async (params: Omit<PostsQuery, 'category'> = {}): Promise<CursorPaginatedResponse<Post>> => {
     const response = await apiClient.get('/posts/my', { params });
     return response.data;
   },
@@ -32,24 +32,22 @@ export const PostListPage: React.FC<PostListPageProps> = ({ showMyPosts = false
     refetch
   } = useInfiniteQuery({
     queryKey: ['posts', showMyPosts, selectedCategory],
-    queryFn: async ({ pageParam = 0 }) => {
+    queryFn: async ({ pageParam }) => {
       if (showMyPosts) {
         return await postsApi.getMyPosts({
-          skip: pageParam,
+          cursor: pageParam,
           limit: 10
         });
       } else {
         return await postsApi.getPosts({
-          skip: pageParam,
+          cursor: pageParam,
           limit: 10,
           category: selectedCategory || undefined
         });
       }
     },
-    getNextPageParam: (lastPage, allPages) => {
-      const totalFetched = allPages.reduce((sum, page) => sum + page.items.length, 0);
-      return lastPage.items.length === 10 ? totalFetched : undefined;
-    },
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
     staleTime: 5 * 60 * 1000, // 5 minutes
   });
 
@@ -249,4 +249,11 @@ export interface PaginatedResponse<T> {
   total: number;
   skip?: number;
   limit?: number;
-}
\ No newline at end of file
+}
+
+// Keyset-paginated list: pass next_cursor back as `cursor` for the next page
+export interface CursorPaginatedResponse<T> {
+  items: T[];
+  next_cursor: string | null;
+  limit?: number;
+}